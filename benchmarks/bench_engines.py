@@ -0,0 +1,51 @@
+# benchmarks/bench_engines.py
+"""
+requests (blocking session + thread pools) versus asyncio (jira_async, one event loop)
+against the local stand-in: a large get_issues (id paging + parallel bulk fetch), the
+changelog stage over the same issues, and a burst of count queries.
+
+    python -m benchmarks.bench_engines [n_issues] [latency_seconds] [async_concurrency]
+"""
+from __future__ import annotations
+import sys
+import time
+
+from benchmarks.standin import StandinJira
+from jira import JiraClient
+from jira_async import AsyncBackedJiraClient
+
+
+def _run(label: str, jc: JiraClient, n_counts: int) -> None:
+    t0 = time.perf_counter()
+    issues = jc.get_issues("project = SUP")
+    t1 = time.perf_counter()
+    jc.get_changelogs(issues)
+    t2 = time.perf_counter()
+    jc.get_counts({f"q{i}": "project = SUP" for i in range(n_counts)})
+    t3 = time.perf_counter()
+    s = jc.http_stats.summary()
+    print(f"{label:<34} issues={len(issues):>6} requests={s['requests']:>5} "
+          f"get_issues={t1 - t0:6.2f}s changelogs={t2 - t1:6.2f}s {n_counts} counts={t3 - t2:6.2f}s "
+          f"total={t3 - t0:6.2f}s")
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 20000
+    latency = float(argv[1]) if len(argv) > 1 else 0.05
+    concurrency = int(argv[2]) if len(argv) > 2 else 64
+    n_counts = 200
+    with StandinJira(n_issues=n, latency=latency) as base:
+        print(f"stand-in: {n} issues, {latency * 1000:.0f}ms simulated latency per request")
+        _run("requests engine (8 threads)", JiraClient(base, "bench@example.com", "token"), n_counts)
+        _run(f"requests engine ({concurrency} threads)",
+             JiraClient(base, "bench@example.com", "token", fetch_concurrency=concurrency), n_counts)
+        jc = AsyncBackedJiraClient(base, "bench@example.com", "token", fetch_concurrency=concurrency)
+        try:
+            _run(f"asyncio engine ({concurrency} in flight)", jc, n_counts)
+        finally:
+            jc.close()
+
+
+if __name__ == "__main__":
+    main()
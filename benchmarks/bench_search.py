@@ -0,0 +1,42 @@
+# benchmarks/bench_search.py
+"""
+Round trips, wire bytes and JSON decode time for JiraClient.get_issues against the
+local stand-in: the old fixed 100-issue pages with stdlib JSON and no compression,
+versus adaptive page sizing, gzip and the fastest available decoder.
+
+    python -m benchmarks.bench_search [n_issues] [latency_seconds]
+"""
+from __future__ import annotations
+import sys
+import time
+
+from benchmarks.standin import StandinJira
+from jira import JiraClient
+
+
+def _run(base: str, label: str, **client_kw) -> None:
+    jc = JiraClient(base, "bench@example.com", "token", **client_kw.pop("client", {}))
+    if client_kw.get("identity"):
+        jc.sess.headers["Accept-Encoding"] = "identity"
+    t0 = time.perf_counter()
+    issues = jc.get_issues("project = SUP")
+    wall = time.perf_counter() - t0
+    s = jc.http_stats.summary()
+    print(f"{label:<34} issues={len(issues):>6} round_trips={jc.pages:>4} "
+          f"wire_bytes={s['wire_bytes']:>10} decode={s['decode_seconds'] * 1000:8.1f}ms wall={wall:6.2f}s")
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 20000
+    latency = float(argv[1]) if len(argv) > 1 else 0.02
+    with StandinJira(n_issues=n, latency=latency) as base:
+        print(f"stand-in: {n} issues, {latency * 1000:.0f}ms simulated latency per request")
+        _run(base, "baseline (100/page, json, identity)", client={"page_size": 100, "json_decoder_name": "json"},
+             identity=True)
+        _run(base, "adaptive pages, json, gzip", client={"json_decoder_name": "json"})
+        _run(base, "adaptive pages, auto decoder, gzip", client={})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/standin.py
+"""
+Local stand-in for the Jira Cloud search API, used by the benchmarks and tests.
+
+Serves deterministic synthetic issues on 127.0.0.1 with the same paging contract as
+/rest/api/3/search/jql (maxResults + nextPageToken), plus search/approximate-count,
+issue/bulkfetch and changelog/bulkfetch, gzip when the client asks for it, and a
+per-request latency to emulate a network round trip.
+"""
+from __future__ import annotations
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def synthetic_issue(i: int, project: str = "SUP") -> Dict[str, Any]:
+    day = 1 + i % 28
+    resolved = i % 3 == 0
+    return {
+        "id": str(10000 + i),
+        "key": f"{project}-{i}",
+        "fields": {
+            "summary": f"Synthetic issue {i}: investigate intermittent failure in component {i % 17}",
+            "issuetype": {"name": ("Bug", "Task", "Story")[i % 3], "subtask": False},
+            "status": {"name": "Done" if resolved else ("To Do", "In Progress")[i % 2],
+                       "statusCategory": {"key": "done" if resolved else "indeterminate"}},
+            "assignee": {"accountId": f"acc-{i % 25}", "displayName": f"User {i % 25}",
+                         "emailAddress": f"user{i % 25}@example.com", "active": True},
+            "created": f"2025-10-{day:02d}T09:{i % 60:02d}:00.000+0000",
+            "updated": f"2025-11-{day:02d}T10:00:00.000+0000",
+            "resolutiondate": f"2025-11-{day:02d}T12:00:00.000+0000" if resolved else None,
+            "resolution": {"name": "Done"} if resolved else None,
+        },
+    }
+
+
+def synthetic_changelog(issue: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Status/resolution history consistent with synthetic_issue; every 6th issue was reopened once."""
+    f = issue["fields"]
+    i = int(issue["id"]) - 10000
+    day = f["created"][:10]
+
+    def change(ts: str, *items: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": f"{issue['id']}-{ts}", "created": ts, "items": list(items)}
+
+    def status(a: str, b: str) -> Dict[str, Any]:
+        return {"field": "status", "fieldId": "status", "fromString": a, "toString": b}
+
+    def resolution(a: Optional[str], b: Optional[str]) -> Dict[str, Any]:
+        return {"field": "resolution", "fieldId": "resolution", "from": a and "1", "fromString": a,
+                "to": b and "1", "toString": b}
+
+    out: List[Dict[str, Any]] = []
+    if f["status"]["name"] != "To Do":
+        out.append(change(f"{day}T10:00:00.000+0000", status("To Do", "In Progress")))
+    if i % 6 == 0:
+        out.append(change(f"{day}T15:00:00.000+0000", status("In Progress", "Done"), resolution(None, "Done")))
+        out.append(change(f"{day}T16:00:00.000+0000", status("Done", "In Progress"), resolution("Done", None)))
+    if f["resolutiondate"]:
+        out.append(change(f["resolutiondate"], status("In Progress", "Done"), resolution(None, "Done")))
+    return out
+
+
+class StandinJira:
+    def __init__(self, n_issues: int = 1000, latency: float = 0.005, rich_cap: int = 1000, project: str = "SUP"):
+        self.n_issues = n_issues
+        self.latency = latency
+        self.rich_cap = rich_cap
+        self.project = project
+        self.requests = 0
+        self.bytes_sent = 0
+        self._issues: List[Dict[str, Any]] = [synthetic_issue(i, project) for i in range(n_issues)]
+        self._by_id = {it["id"]: it for it in self._issues}
+        self._by_id.update({it["key"]: it for it in self._issues})
+        self.paths: List[str] = []
+        self._lock = threading.Lock()
+        self._srv: Optional[ThreadingHTTPServer] = None
+
+    def page_cap(self, fields: str) -> int:
+        names = {f.strip() for f in fields.split(",") if f.strip()}
+        if names and names <= {"id", "key"}:
+            return 5000
+        if not names or any(n.startswith("*") for n in names) or len(names) > 12:
+            return 100
+        return self.rich_cap
+
+    def _project_fields(self, issue: Dict[str, Any], fields: str) -> Dict[str, Any]:
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        if not names or any(n.startswith("*") for n in names):
+            return issue
+        out = {"id": issue["id"], "key": issue["key"]}
+        picked = {n: issue["fields"][n] for n in names if n in issue["fields"]}
+        if picked:
+            out["fields"] = picked
+        return out
+
+    # ------------------------ request handling ------------------------
+    def handle_search(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        fields = (query.get("fields") or ["*navigable"])[0]
+        want = int((query.get("maxResults") or ["50"])[0])
+        offset = int((query.get("nextPageToken") or ["0"])[0])
+        size = max(1, min(want, self.page_cap(fields)))
+        page = self._issues[offset: offset + size]
+        nxt = offset + len(page)
+        body: Dict[str, Any] = {"issues": [self._project_fields(i, fields) for i in page], "isLast": nxt >= self.n_issues}
+        if nxt < self.n_issues:
+            body["nextPageToken"] = str(nxt)
+        return body
+
+    def handle_count(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {"count": self.n_issues}
+
+    def handle_bulkfetch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        fields = ",".join(payload.get("fields") or [])
+        found = [self._by_id[i] for i in payload.get("issueIdsOrKeys", []) if i in self._by_id]
+        return {"issues": [self._project_fields(i, fields) for i in found[:100]], "issueErrors": []}
+
+    def handle_changelog(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Pages by issue (250 per page) to exercise nextPageToken handling."""
+        found = [self._by_id[i] for i in payload.get("issueIdsOrKeys", []) if i in self._by_id]
+        offset = int(payload.get("nextPageToken") or 0)
+        page = found[offset: offset + 250]
+        logs = [{"issueId": it["id"], "changeHistories": h} for it in page if (h := synthetic_changelog(it))]
+        body: Dict[str, Any] = {"issueChangeLogs": logs}
+        if offset + 250 < len(found):
+            body["nextPageToken"] = str(offset + 250)
+        return body
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload: Dict[str, Any], status: int = 200):
+                raw = json.dumps(payload).encode("utf-8")
+                gz = "gzip" in (self.headers.get("Accept-Encoding") or "")
+                if gz:
+                    raw = gzip.compress(raw, compresslevel=5)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if gz:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+                with standin._lock:
+                    standin.bytes_sent += len(raw)
+
+            def _begin(self):
+                u = urlparse(self.path)
+                with standin._lock:
+                    standin.requests += 1
+                    standin.paths.append(u.path)
+                if standin.latency:
+                    time.sleep(standin.latency)
+                return u
+
+            def do_POST(self):
+                u = self._begin()
+                n = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(n) or b"{}")
+                if u.path.endswith("/search/approximate-count"):
+                    self._reply(standin.handle_count(payload))
+                elif u.path.endswith("/issue/bulkfetch"):
+                    self._reply(standin.handle_bulkfetch(payload))
+                elif u.path.endswith("/changelog/bulkfetch"):
+                    self._reply(standin.handle_changelog(payload))
+                else:
+                    self._reply({"errorMessages": [f"not found: {u.path}"]}, 404)
+
+            def do_GET(self):
+                u = self._begin()
+                if u.path.endswith("/search/jql"):
+                    self._reply(standin.handle_search(parse_qs(u.query)))
+                else:
+                    self._reply({"errorMessages": [f"not found: {u.path}"]}, 404)
+
+        return Handler
+
+    def start(self) -> str:
+        self._srv = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._srv.daemon_threads = True
+        threading.Thread(target=self._srv.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._srv.server_address[1]}"
+
+    def stop(self) -> None:
+        if self._srv is not None:
+            self._srv.shutdown()
+            self._srv.server_close()
+            self._srv = None
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
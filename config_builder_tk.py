@@ -1,13 +1,38 @@
 import json
+import os
+import queue
+import re
+import threading
+import time
 import tkinter as tk
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox, filedialog
 import requests
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from jira import JiraClient
+from windows import window_from_spec
+
+# How often the Tk main loop drains results from background jobs (ms).
+POLL_MS = 50
+# project/search page size (Jira caps it at 100) and parallel page fetches once the total is known.
+PROJECT_PAGE_SIZE = int(os.getenv("CONFIG_BUILDER_PAGE_SIZE", "100"))
+PROJECT_PAGE_WORKERS = int(os.getenv("CONFIG_BUILDER_PAGE_WORKERS", "6"))
+# Site metadata cache; reopening the builder shows cached lists instantly.
+METADATA_CACHE_PATH = os.getenv("CONFIG_BUILDER_CACHE", os.path.join(os.path.expanduser("~"), ".jira_report_builder_cache.json"))
+METADATA_CACHE_TTL = float(os.getenv("CONFIG_BUILDER_CACHE_TTL", str(24 * 3600)))
+# Quiet period after the last filter edit before the count preview queries Jira (ms).
+PREVIEW_DEBOUNCE_MS = int(os.getenv("CONFIG_BUILDER_PREVIEW_DEBOUNCE_MS", "400"))
+TIMEZONE_LABEL = "Europe/Berlin"
 
 # ---------------------------
 # HTTP / Jira helpers
 # ---------------------------
 
+
 def make_auth_headers(email: str, api_token: str) -> Dict[str, str]:
     import base64
     token = base64.b64encode(f"{email}:{api_token}".encode("utf-8")).decode("utf-8")
@@ -17,39 +42,101 @@ def make_auth_headers(email: str, api_token: str) -> Dict[str, str]:
         "Content-Type": "application/json",
     }
 
+
+_session_lock = threading.Lock()
+_session_obj: Optional[requests.Session] = None
+
+
+def _session() -> requests.Session:
+    """Shared keep-alive session sized for the parallel page fetches."""
+    global _session_obj
+    with _session_lock:
+        if _session_obj is None:
+            sess = requests.Session()
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=PROJECT_PAGE_WORKERS + 4, max_retries=retry)
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            sess.headers.update({"Accept-Encoding": "gzip, deflate"})
+            _session_obj = sess
+        return _session_obj
+
+
 def jira_get(base_url: str, path: str, headers: Dict[str, str],
              params: Dict[str, Any] = None, timeout: int = 30):
     url = base_url.rstrip("/") + path
-    resp = requests.get(url, headers=headers, params=params or {}, timeout=timeout)
+    resp = _session().get(url, headers=headers, params=params or {}, timeout=timeout)
     if resp.status_code != 200:
         raise RuntimeError(f"GET {path} failed [{resp.status_code}]: {resp.text[:400]}")
     return resp.json()
 
-def fetch_projects(base_url: str, headers: Dict[str, str]) -> List[Dict[str, Any]]:
-    projects = []
-    start_at = 0
-    max_results = 50
-    while True:
-        data = jira_get(base_url, "/rest/api/3/project/search", headers, params={"startAt": start_at, "maxResults": max_results})
-        values = data.get("values", [])
-        projects.extend(values)
-        if len(values) < max_results:
-            break
-        start_at += max_results
-    out = [{"key": p.get("key"), "name": p.get("name")} for p in projects if p.get("key")]
-    out.sort(key=lambda x: x["key"])
-    return out
+
+def jira_post(base_url: str, path: str, headers: Dict[str, str], body: Dict[str, Any], timeout: int = 30):
+    url = base_url.rstrip("/") + path
+    resp = _session().post(url, headers=headers, json=body, timeout=timeout)
+    if resp.status_code != 200:
+        raise RuntimeError(f"POST {path} failed [{resp.status_code}]: {resp.text[:400]}")
+    return resp.json()
+
+
+class Cancelled(Exception):
+    """Raised inside a background fetch once the user pressed Cancel."""
+
+
+def fetch_projects(base_url: str, headers: Dict[str, str],
+                   progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                   cancel: Optional[threading.Event] = None,
+                   page_size: int = PROJECT_PAGE_SIZE, workers: int = PROJECT_PAGE_WORKERS) -> List[Dict[str, Any]]:
+    """
+    ``progress(fetched, total)`` is called after every page; ``cancel`` aborts between pages.
+    The first page reports the total, the remaining pages are then fetched in parallel.
+    """
+    fetched = [0]
+    lock = threading.Lock()
+
+    def page(start_at: int) -> Dict[str, Any]:
+        if cancel is not None and cancel.is_set():
+            raise Cancelled()
+        data = jira_get(base_url, "/rest/api/3/project/search", headers,
+                        params={"startAt": start_at, "maxResults": page_size})
+        with lock:
+            fetched[0] += len(data.get("values", []))
+            if progress is not None:
+                progress(fetched[0], data.get("total"))
+        return data
+
+    first = page(0)
+    projects = list(first.get("values", []))
+    size = len(projects)  # the server may cap maxResults below what we asked for
+    total = first.get("total")
+    if total is not None and total > size > 0:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="jira-projects") as pool:
+            for data in pool.map(page, range(size, total, size)):
+                projects.extend(data.get("values", []))
+    elif total is None and size and not first.get("isLast"):
+        start_at = size
+        while True:
+            values = page(start_at).get("values", [])
+            projects.extend(values)
+            if len(values) < size:
+                break
+            start_at += size
+    out = {p.get("key"): {"key": p.get("key"), "name": p.get("name")} for p in projects if p.get("key")}
+    return sorted(out.values(), key=lambda x: x["key"])
+
 
 def fetch_issue_types(base_url: str, headers: Dict[str, str]) -> List[str]:
     data = jira_get(base_url, "/rest/api/3/issuetype", headers)
     names = [it.get("name") for it in data if it.get("name")]
     return sorted(set(names))
 
+
 def fetch_priorities(base_url: str, headers: Dict[str, str]) -> List[str]:
     data = jira_get(base_url, "/rest/api/3/priority", headers)
     names = [p.get("name") for p in data if p.get("name")]
     return sorted(set(names))
 
+
 def jql_quote_list(values: List[str]) -> str:
         """
         Convert list of values to JQL IN clause format.
@@ -59,6 +146,7 @@ def jql_quote_list(values: List[str]) -> str:
         safe = ['"{}"'.format(v) for v in values]
         return ", ".join(safe)
 
+
 def build_global_jql(issue_types: List[str], priorities: List[str], extra_freeform: str) -> str:
     parts = []
     if issue_types:
@@ -72,6 +160,212 @@ def build_global_jql(issue_types: List[str], priorities: List[str], extra_freefo
         parts.append(s)
     return " ".join(parts)
 
+
+def preview_jql(project_key: str, window_cfg: Dict[str, Any], global_jql: str,
+                tz_label: str = TIMEZONE_LABEL) -> str:
+    """The union JQL a run would send for this project, window and global filter (mirrors main._project_jql)."""
+    mode, start, end, interval, _ = window_from_spec(window_cfg, tz_label)
+    if mode == "rolling_days":
+        return JiraClient.build_jql_union_window(project_key, interval=interval, end=end, extra_filters=global_jql)
+    return JiraClient.build_jql_union_window(project_key, start=start, end=end, extra_filters=global_jql,
+                                             simplified=True)
+
+# ---------------------------
+# Background jobs
+# ---------------------------
+
+
+class BackgroundJobs:
+    """
+    Runs blocking Jira calls on worker threads. Results and progress come back through a
+    queue that the Tk main loop drains with after() polling, so widgets are only ever
+    touched from the main thread.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jira-meta")
+        self._queue: "queue.Queue[Tuple[str, str, Any]]" = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.pending = 0
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> None:
+        def run():
+            try:
+                self._queue.put((name, "done", fn(*args, **kwargs)))
+            except Exception as e:
+                self._queue.put((name, "error", e))
+
+        self.pending += 1
+        self._pool.submit(run)
+
+    def progress(self, name: str) -> Callable[..., None]:
+        """Callback for a job to report progress; delivered to poll() as (name, "progress", args)."""
+        return lambda *args: self._queue.put((name, "progress", args))
+
+    def poll(self) -> List[Tuple[str, str, Any]]:
+        """Drain queued messages without blocking (main thread only)."""
+        out = []
+        while True:
+            try:
+                msg = self._queue.get_nowait()
+            except queue.Empty:
+                return out
+            if msg[1] != "progress":
+                self.pending -= 1
+            out.append(msg)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        # Never block the UI on a request that is still in flight.
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------------
+# Metadata cache
+# ---------------------------
+
+class MetadataCache:
+    """
+    Projects, issue types and priorities per Jira site (base URL + account), persisted
+    as JSON. Entries older than ``ttl`` are ignored until the next fetch replaces them.
+    The API token is never written.
+    """
+
+    KINDS = ("projects", "issue_types", "priorities")
+
+    def __init__(self, path: str = METADATA_CACHE_PATH, ttl: float = METADATA_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._data: Dict[str, Any] = {"last": None, "sites": {}}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                pass  # a corrupt cache is just a cold cache
+
+    @staticmethod
+    def key(base_url: str, email: str) -> str:
+        return f"{base_url.strip().rstrip('/').lower()}|{email.strip().lower()}"
+
+    def get(self, base_url: str, email: str) -> Optional[Dict[str, Any]]:
+        entry = self._data["sites"].get(self.key(base_url, email))
+        if entry is None or time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return None
+        return entry
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        """Most recently stored site (fresh or not), used to prefill the connection form."""
+        return self._data["sites"].get(self._data.get("last") or "")
+
+    def put(self, base_url: str, email: str, **metadata: Any) -> None:
+        k = self.key(base_url, email)
+        entry = {"base_url": base_url.strip().rstrip("/"), "email": email.strip(), "fetched_at": time.time()}
+        entry.update({kind: metadata[kind] for kind in self.KINDS})
+        self._data["sites"][k] = entry
+        self._data["last"] = k
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f)
+        os.replace(tmp, self.path)
+
+
+# ---------------------------
+# Project search index
+# ---------------------------
+
+class SearchIndex:
+    """
+    Type-to-filter index over project keys and names. Every whitespace-separated term
+    must occur in "KEY name"; an exact key comes first, then keys or name words starting
+    with the first term (binary search over sorted tokens), then other substring hits.
+    A query that extends the previous one only rescans the previous results.
+    """
+
+    def __init__(self, projects: List[Dict[str, Any]]):
+        self.projects = projects
+        self._keys = [(p.get("key") or "").casefold() for p in projects]
+        self._text = [f"{p.get('key') or ''} {p.get('name') or ''}".casefold() for p in projects]
+        tokens = []
+        for i, p in enumerate(projects):
+            tokens.append((self._keys[i], i))
+            tokens.extend((w, i) for w in re.split(r"[\s\-_/.:()]+", (p.get("name") or "").casefold()) if w)
+        tokens.sort()
+        self._tokens = tokens
+        self._token_keys = [t for t, _ in tokens]
+        self._last: Tuple[str, List[int]] = ("", list(range(len(projects))))
+
+    def _prefix(self, term: str) -> set:
+        hits = set()
+        for t, i in self._tokens[bisect_left(self._token_keys, term):]:
+            if not t.startswith(term):
+                break
+            hits.add(i)
+        return hits
+
+    def search(self, query: str) -> List[int]:
+        """Indices into ``projects`` matching ``query``, best first; everything for an empty query."""
+        q = " ".join(query.casefold().split())
+        if not q:
+            return list(range(len(self.projects)))
+        prev_q, prev = self._last
+        pool = prev if prev_q and q.startswith(prev_q) else range(len(self.projects))
+        terms = q.split()
+        matches = [i for i in pool if all(t in self._text[i] for t in terms)]
+        prefix = self._prefix(terms[0])
+        matches.sort(key=lambda i: (self._keys[i] != terms[0], i not in prefix, i))
+        self._last = (q, matches)
+        return matches
+
+
+class CountPreview:
+    """
+    Approximate issue counts for preview JQLs, fetched on a worker thread and cached by
+    JQL string, so flipping back to an earlier filter combination answers instantly.
+    """
+
+    def __init__(self, fetch: Callable[[str], int]):
+        self._fetch = fetch
+        self._jobs = BackgroundJobs(max_workers=2)
+        self.cache: Dict[str, Any] = {}
+        self._in_flight: set = set()
+
+    def request(self, jql: str) -> Optional[int]:
+        """Cached count for ``jql``, or None after queueing a background fetch."""
+        if jql in self.cache:
+            return self.cache[jql]
+        if jql not in self._in_flight:
+            self._in_flight.add(jql)
+            self._jobs.submit(jql, self._fetch, jql)
+        return None
+
+    def poll(self) -> List[Tuple[str, Any]]:
+        """Finished (jql, count-or-exception) pairs; only successful counts are cached."""
+        out = []
+        for jql, kind, payload in self._jobs.poll():
+            self._in_flight.discard(jql)
+            if kind == "done":
+                self.cache[jql] = payload
+            out.append((jql, payload))
+        return out
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._in_flight)
+
+    def shutdown(self) -> None:
+        self._jobs.shutdown()
+
+
 def validate_date(s: str) -> bool:
     import datetime as dt
     try:
@@ -116,6 +410,106 @@ class ToolTip:
             self.tooltip_window = None
 
 
+# ---------------------------
+# Virtualized list widget
+# ---------------------------
+
+def visible_rows(top: int, height_px: int, row_height: int, total: int) -> range:
+    """Row indices a viewport of ``height_px`` starting at row ``top`` has to draw."""
+    n = max(1, height_px // row_height)
+    top = max(0, min(top, total - n))
+    return range(top, min(total, top + n + 1))
+
+
+class VirtualList(ttk.Frame):
+    """
+    Scrollable list drawn on a Canvas that only renders the rows in view, so ten
+    thousand entries cost as much as ten. With ``checkable=True`` a click toggles the
+    row in ``checked`` instead of selecting it.
+    """
+
+    ROW_H = 20
+
+    def __init__(self, master, height_rows: int = 8, width: int = 300, checkable: bool = False,
+                 on_select: Optional[Callable[[str], None]] = None,
+                 on_toggle: Optional[Callable[[], None]] = None):
+        super().__init__(master)
+        self.checkable = checkable
+        self.on_select = on_select
+        self.on_toggle = on_toggle
+        self.rows: List[str] = []
+        self.checked: set = set()
+        self.selected: Optional[str] = None
+        self.top = 0
+        self.canvas = tk.Canvas(self, height=height_rows * self.ROW_H, width=width, background="white",
+                                highlightthickness=1, highlightbackground="lightgray")
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.scroll.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._redraw())
+        self.canvas.bind("<Button-1>", self._click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_by(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_by(1))
+
+    def set_rows(self, rows: List[str]):
+        self.rows = list(rows)
+        self.top = 0
+        self._redraw()
+
+    def set_checked(self, names):
+        self.checked = set(names)
+        self._redraw()
+
+    def _page(self) -> int:
+        return max(1, self.canvas.winfo_height() // self.ROW_H)
+
+    def _scroll_by(self, rows: int):
+        self.top = max(0, min(self.top + rows, len(self.rows) - self._page()))
+        self._redraw()
+
+    def _yview(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.rows))
+            self._scroll_by(0)
+        elif args[0] == "scroll":
+            self._scroll_by(int(args[1]) * (self._page() if args[2] == "pages" else 1))
+
+    def _redraw(self):
+        c = self.canvas
+        c.delete("all")
+        total = len(self.rows)
+        rows = visible_rows(self.top, c.winfo_height(), self.ROW_H, total)
+        self.top = rows.start
+        width = c.winfo_width()
+        for y, i in enumerate(rows):
+            text = self.rows[i]
+            if self.checkable:
+                text = ("☑ " if text in self.checked else "☐ ") + text
+            elif text == self.selected:
+                c.create_rectangle(0, y * self.ROW_H, width, (y + 1) * self.ROW_H, fill="#e3f2fd", outline="")
+            c.create_text(6, y * self.ROW_H + self.ROW_H // 2, text=text, anchor="w", font=("Arial", 9))
+        if total:
+            self.scroll.set(rows.start / total, min(1.0, (rows.start + self._page()) / total))
+        else:
+            self.scroll.set(0, 1)
+
+    def _click(self, event):
+        i = self.top + event.y // self.ROW_H
+        if i >= len(self.rows):
+            return
+        name = self.rows[i]
+        if self.checkable:
+            self.checked ^= {name}
+            if self.on_toggle:
+                self.on_toggle()
+        else:
+            self.selected = name
+            if self.on_select:
+                self.on_select(name)
+        self._redraw()
+
+
 # ---------------------------
 # GUI
 # ---------------------------
@@ -149,6 +543,11 @@ class ConfigBuilderApp(tk.Tk):
         self.email_var = tk.StringVar()
         self.token_var = tk.StringVar()
         
+        # project search
+        self.project_search_var = tk.StringVar()
+        self.project_index = SearchIndex([])
+        self._project_labels: List[str] = []
+        
         # selected project form
         self.pkey_var = tk.StringVar()
         self.plead_var = tk.StringVar()
@@ -169,9 +568,19 @@ class ConfigBuilderApp(tk.Tk):
         
         # Status tracking
         self.connection_status = False
+        self._jobs: Optional[BackgroundJobs] = None
+        self._fetched: Dict[str, Any] = {}
+        self.metadata_cache = MetadataCache()
+        self._preview: Optional[CountPreview] = None
+        self._preview_after: Optional[str] = None
+        self._preview_target: Optional[Tuple[str, str]] = None  # (jql, project key) currently shown
         
         self._build_layout()
         self._create_tooltips()
+        self._load_cached_metadata()
+        for var in (self.extra_jql_var, self.pkey_var, self.range_mode_var, self.rolling_n_var,
+                    self.custom_start_var, self.custom_end_var):
+            var.trace_add("write", lambda *a: self._schedule_preview())
 
     def _build_layout(self):
         # Add main container with padding
@@ -221,6 +630,15 @@ class ConfigBuilderApp(tk.Tk):
         self.test_btn = ttk.Button(status_frame, text="🔌 Test Connection & Fetch Metadata", command=self.on_test)
         self.test_btn.pack(side="left", padx=(0,10))
         
+        self.refresh_btn = ttk.Button(status_frame, text="⟳ Refresh", command=lambda: self.on_test(refresh=True))
+        self.refresh_btn.pack(side="left", padx=(0,10))
+        
+        self.cancel_btn = ttk.Button(status_frame, text="✖ Cancel", command=self.on_cancel_test, state="disabled")
+        self.cancel_btn.pack(side="left", padx=(0,10))
+        
+        self.progress_bar = ttk.Progressbar(status_frame, length=120, mode="determinate", maximum=4)
+        self.progress_bar.pack(side="left", padx=(0,10))
+        
         self.status_indicator = tk.Canvas(status_frame, width=16, height=16, highlightthickness=0)
         self.status_indicator.pack(side="left", padx=(0,5))
         self.status_circle = self.status_indicator.create_oval(2, 2, 14, 14, fill="gray", outline="darkgray")
@@ -250,14 +668,15 @@ class ConfigBuilderApp(tk.Tk):
         
         ttk.Label(left_proj, text="Available Projects:", font=("Arial", 9, "bold")).pack(anchor="w", pady=(0,5))
         
-        proj_scroll = ttk.Scrollbar(left_proj)
-        proj_scroll.pack(side="right", fill="y")
+        search_row = ttk.Frame(left_proj)
+        search_row.pack(fill="x", pady=(0,5))
+        ttk.Label(search_row, text="🔍", font=("Arial", 9)).pack(side="left")
+        self.project_search_entry = ttk.Entry(search_row, textvariable=self.project_search_var, font=("Arial", 9))
+        self.project_search_entry.pack(side="left", fill="x", expand=True, padx=(3,0))
+        self.project_search_var.trace_add("write", lambda *a: self._filter_projects())
         
-        self.projects_list = tk.Listbox(left_proj, width=40, height=8, exportselection=False,
-                                       yscrollcommand=proj_scroll.set, font=("Arial", 9))
-        self.projects_list.pack(side="left", fill="both", expand=True)
-        proj_scroll.config(command=self.projects_list.yview)
-        self.projects_list.bind("<<ListboxSelect>>", self.on_project_select)
+        self.projects_list = VirtualList(left_proj, height_rows=8, width=280, on_select=self.on_project_select)
+        self.projects_list.pack(fill="both", expand=True)
         
         # Right: Selected projects
         right_proj = ttk.Frame(proj_layout)
@@ -324,24 +743,9 @@ class ConfigBuilderApp(tk.Tk):
         ttk.Button(types_btn_frame, text="Select All", command=self.select_all_issue_types, width=12).pack(side="left", padx=(0,3))
         ttk.Button(types_btn_frame, text="Clear All", command=self.clear_all_issue_types, width=12).pack(side="left")
         
-        # Scrollable frame for checkboxes
-        types_canvas = tk.Canvas(left_types, height=150, highlightthickness=1, highlightbackground="lightgray")
-        types_scroll = ttk.Scrollbar(left_types, orient="vertical", command=types_canvas.yview)
-        self.types_checkbox_frame = ttk.Frame(types_canvas)
-        
-        self.types_checkbox_frame.bind(
-            "<Configure>",
-            lambda e: types_canvas.configure(scrollregion=types_canvas.bbox("all"))
-        )
-        
-        types_canvas.create_window((0, 0), window=self.types_checkbox_frame, anchor="nw")
-        types_canvas.configure(yscrollcommand=types_scroll.set)
-        
-        types_canvas.pack(side="left", fill="both", expand=True)
-        types_scroll.pack(side="right", fill="y")
-        
-        # Store checkbox variables
-        self.issue_type_vars = {}
+        self.types_list = VirtualList(left_types, height_rows=7, checkable=True,
+                                      on_toggle=self.update_selection_summary)
+        self.types_list.pack(fill="both", expand=True)
         
         # Priorities
         right_priorities = ttk.Frame(types_layout)
@@ -358,24 +762,9 @@ class ConfigBuilderApp(tk.Tk):
         ttk.Button(pri_btn_frame, text="Select All", command=self.select_all_priorities, width=12).pack(side="left", padx=(0,3))
         ttk.Button(pri_btn_frame, text="Clear All", command=self.clear_all_priorities, width=12).pack(side="left")
         
-        # Scrollable frame for checkboxes
-        pri_canvas = tk.Canvas(right_priorities, height=150, highlightthickness=1, highlightbackground="lightgray")
-        pri_scroll = ttk.Scrollbar(right_priorities, orient="vertical", command=pri_canvas.yview)
-        self.priorities_checkbox_frame = ttk.Frame(pri_canvas)
-        
-        self.priorities_checkbox_frame.bind(
-            "<Configure>",
-            lambda e: pri_canvas.configure(scrollregion=pri_canvas.bbox("all"))
-        )
-        
-        pri_canvas.create_window((0, 0), window=self.priorities_checkbox_frame, anchor="nw")
-        pri_canvas.configure(yscrollcommand=pri_scroll.set)
-        
-        pri_canvas.pack(side="left", fill="both", expand=True)
-        pri_scroll.pack(side="right", fill="y")
-        
-        # Store checkbox variables
-        self.priority_vars = {}
+        self.priorities_list = VirtualList(right_priorities, height_rows=7, checkable=True,
+                                           on_toggle=self.update_selection_summary)
+        self.priorities_list.pack(fill="both", expand=True)
         
         # Selection summary
         self.selection_summary = ttk.Label(types_container, text="", foreground=self.colors["info"], font=("Arial", 9))
@@ -390,6 +779,9 @@ class ConfigBuilderApp(tk.Tk):
         self.extra_jql_entry = ttk.Entry(jql_container, textvariable=self.extra_jql_var, width=90, font=("Arial", 9))
         self.extra_jql_entry.pack(fill="x")
         
+        self.preview_msg = ttk.Label(jql_container, text="", foreground="gray", font=("Arial", 9))
+        self.preview_msg.pack(anchor="w", pady=(6,0))
+        
         # ============ STEP 3: Report Configuration ============
         report_frame = ttk.LabelFrame(scrollable_frame, text="📊 Step 3: Report Configuration", padding="15")
         report_frame.pack(fill="x", padx=5, pady=8)
@@ -516,8 +908,8 @@ class ConfigBuilderApp(tk.Tk):
 
     def update_selection_summary(self):
         """Update the summary text showing what's selected"""
-        it_count = sum(1 for var in self.issue_type_vars.values() if var.get())
-        pr_count = sum(1 for var in self.priority_vars.values() if var.get())
+        it_count = len(self.types_list.checked)
+        pr_count = len(self.priorities_list.checked)
         
         parts = []
         if it_count > 0:
@@ -531,6 +923,7 @@ class ConfigBuilderApp(tk.Tk):
             parts.append("All priorities")
         
         summary = "✓ " + ", ".join(parts)
+        self._schedule_preview()
         
         # Color based on whether anything is selected
         if it_count > 0 or pr_count > 0:
@@ -540,26 +933,22 @@ class ConfigBuilderApp(tk.Tk):
     
     def select_all_issue_types(self):
         """Select all issue type checkboxes"""
-        for var in self.issue_type_vars.values():
-            var.set(True)
+        self.types_list.set_checked(self.issue_types)
         self.update_selection_summary()
     
     def clear_all_issue_types(self):
         """Clear all issue type checkboxes"""
-        for var in self.issue_type_vars.values():
-            var.set(False)
+        self.types_list.set_checked(())
         self.update_selection_summary()
     
     def select_all_priorities(self):
         """Select all priority checkboxes"""
-        for var in self.priority_vars.values():
-            var.set(True)
+        self.priorities_list.set_checked(self.priorities)
         self.update_selection_summary()
     
     def clear_all_priorities(self):
         """Clear all priority checkboxes"""
-        for var in self.priority_vars.values():
-            var.set(False)
+        self.priorities_list.set_checked(())
         self.update_selection_summary()
 
     def on_issue_type_select(self, event=None):
@@ -577,8 +966,20 @@ class ConfigBuilderApp(tk.Tk):
         else:
             canvas.itemconfig(circle, fill=self.colors["error"], outline="darkred")
 
-    def on_test(self):
-        """Test Jira connection and fetch metadata"""
+    def _load_cached_metadata(self):
+        """Prefill the last used site and its cached lists, so reopening the builder is instant"""
+        entry = self.metadata_cache.last()
+        if entry is None:
+            return
+        self.base_url_var.set(entry["base_url"])
+        self.email_var.set(entry["email"])
+        for kind in MetadataCache.KINDS:
+            self._apply_metadata(kind, entry[kind])
+        self.test_msg.config(text=f"{len(self.available_projects)} projects from cache — enter API token to connect",
+                             foreground="gray")
+
+    def on_test(self, refresh: bool = False):
+        """Test Jira connection and fetch metadata (on worker threads; the UI stays responsive)"""
         base = self.base_url_var.get().strip()
         email = self.email_var.get().strip()
         token = self.token_var.get().strip()
@@ -587,74 +988,124 @@ class ConfigBuilderApp(tk.Tk):
             self.test_msg.config(text="⚠ Please fill all connection fields", foreground=self.colors["warning"])
             self.status_indicator.itemconfig(self.status_circle, fill=self.colors["warning"], outline="darkorange")
             return
+        if self._jobs is not None:
+            return
         
         # Show loading state
         self.test_btn.config(state="disabled", text="🔄 Connecting...")
+        self.cancel_btn.config(state="normal")
+        self.progress_bar.config(value=0)
         self.test_msg.config(text="Connecting to Jira...", foreground=self.colors["info"])
-        self.update()
         
-        try:
-            headers = make_auth_headers(email, token)
-            _ = jira_get(base, "/rest/api/3/myself", headers)
-            
-            # Fetch metadata
-            self.available_projects = fetch_projects(base, headers)
-            self.projects_list.delete(0, tk.END)
-            for p in self.available_projects:
-                self.projects_list.insert(tk.END, f"{p['key']} — {p['name']}")
-            
-            self.issue_types = fetch_issue_types(base, headers)
-            self.priorities = fetch_priorities(base, headers)
-            
-            # Clear existing checkboxes
-            for widget in self.types_checkbox_frame.winfo_children():
-                widget.destroy()
-            for widget in self.priorities_checkbox_frame.winfo_children():
-                widget.destroy()
-            
-            self.issue_type_vars.clear()
-            self.priority_vars.clear()
-            
-            # Create checkboxes for issue types
-            for it in self.issue_types:
-                var = tk.BooleanVar(value=False)
-                self.issue_type_vars[it] = var
-                cb = ttk.Checkbutton(self.types_checkbox_frame, text=it, variable=var,
-                                    command=self.update_selection_summary)
-                cb.pack(anchor="w", pady=2, padx=5)
-            
-            # Create checkboxes for priorities
-            for pr in self.priorities:
-                var = tk.BooleanVar(value=False)
-                self.priority_vars[pr] = var
-                cb = ttk.Checkbutton(self.priorities_checkbox_frame, text=pr, variable=var,
-                                    command=self.update_selection_summary)
-                cb.pack(anchor="w", pady=2, padx=5)
-            
-            # Success
+        headers = make_auth_headers(email, token)
+        jobs = self._jobs = BackgroundJobs()
+        self._fetched = {}
+        # All requests run at the same time; results are applied as they arrive.
+        jobs.submit("myself", jira_get, base, "/rest/api/3/myself", headers)
+        cached = None if refresh else self.metadata_cache.get(base, email)
+        if cached is not None:
+            # Fresh cache: only the credentials need checking.
+            for kind in MetadataCache.KINDS:
+                self._apply_metadata(kind, cached[kind])
+            self.progress_bar.config(value=3)
+        else:
+            jobs.submit("projects", fetch_projects, base, headers,
+                        progress=jobs.progress("projects"), cancel=jobs.cancel_event)
+            jobs.submit("issue_types", fetch_issue_types, base, headers)
+            jobs.submit("priorities", fetch_priorities, base, headers)
+        self.after(POLL_MS, self._poll_metadata, jobs)
+
+    def _poll_metadata(self, jobs: BackgroundJobs):
+        """Apply finished background results on the main thread; reschedules itself until done."""
+        if jobs is not self._jobs:
+            return  # cancelled or superseded
+        for name, kind, payload in jobs.poll():
+            if kind == "progress":
+                fetched, total = payload
+                self.test_msg.config(text=f"Loading projects… {fetched}" + (f"/{total}" if total else ""),
+                                     foreground=self.colors["info"])
+            elif kind == "error":
+                if not isinstance(payload, Cancelled):
+                    self._finish_test(jobs, payload)
+                return
+            else:
+                self._fetched[name] = payload
+                self._apply_metadata(name, payload)
+                self.progress_bar.step(1)
+        if jobs.pending <= 0:
+            self._finish_test(jobs, None)
+        else:
+            self.after(POLL_MS, self._poll_metadata, jobs)
+
+    def _apply_metadata(self, name: str, payload: Any):
+        if name == "projects":
+            self.available_projects = payload
+            self._populate_projects()
+        elif name == "issue_types":
+            self.issue_types = payload
+            self._populate_checkboxes(self.types_list, self.issue_types)
+        elif name == "priorities":
+            self.priorities = payload
+            self._populate_checkboxes(self.priorities_list, self.priorities)
+
+    def _populate_projects(self):
+        self.project_index = SearchIndex(self.available_projects)
+        self._project_labels = [f"{p['key']} — {p['name']}" for p in self.available_projects]
+        self._filter_projects()
+
+    def _filter_projects(self):
+        """Show the projects matching the search box (only visible rows are drawn)"""
+        idx = self.project_index.search(self.project_search_var.get())
+        self.projects_list.set_rows([self._project_labels[i] for i in idx])
+
+    def _populate_checkboxes(self, view: VirtualList, names: List[str]):
+        # Keep ticks that still exist, e.g. after a refresh.
+        view.checked &= set(names)
+        view.set_rows(names)
+        self.update_selection_summary()
+
+    def _finish_test(self, jobs: BackgroundJobs, error: Optional[Exception]):
+        jobs.shutdown()
+        self._jobs = None
+        self.cancel_btn.config(state="disabled")
+        self.test_btn.config(state="normal", text="🔌 Test Connection & Fetch Metadata")
+        if error is None:
             self.connection_status = True
-            self.test_msg.config(text=f"✓ Connected! Found {len(self.available_projects)} projects",
+            if self._preview is not None:
+                self._preview.shutdown()
+            self._preview = None  # new credentials / site
+            self._schedule_preview()
+            if all(kind in self._fetched for kind in MetadataCache.KINDS):
+                self.metadata_cache.put(self.base_url_var.get(), self.email_var.get(),
+                                        **{kind: self._fetched[kind] for kind in MetadataCache.KINDS})
+                source = ""
+            else:
+                source = " (cached — ⟳ Refresh to reload)"
+            self.test_msg.config(text=f"✓ Connected! Found {len(self.available_projects)} projects{source}",
                                foreground=self.colors["success"])
             self.update_status_indicator(self.status_indicator, self.status_circle, True)
-            
-        except Exception as e:
-            self.connection_status = False
-            error_msg = str(e)
-            if len(error_msg) > 100:
-                error_msg = error_msg[:100] + "..."
-            self.test_msg.config(text=f"✗ Connection failed: {error_msg}",
-                               foreground=self.colors["error"])
-            self.update_status_indicator(self.status_indicator, self.status_circle, False)
-        
-        finally:
-            self.test_btn.config(state="normal", text="🔌 Test Connection & Fetch Metadata")
-
-    def on_project_select(self, event=None):
-        """Handle project selection from available list"""
-        sel = self.projects_list.curselection()
-        if not sel:
             return
-        line = self.projects_list.get(sel[0])
+        self.connection_status = False
+        error_msg = str(error)
+        if len(error_msg) > 100:
+            error_msg = error_msg[:100] + "..."
+        self.test_msg.config(text=f"✗ Connection failed: {error_msg}",
+                           foreground=self.colors["error"])
+        self.update_status_indicator(self.status_indicator, self.status_circle, False)
+
+    def on_cancel_test(self):
+        """Abandon the running metadata fetch; late results are ignored"""
+        if self._jobs is None:
+            return
+        self._jobs.cancel()
+        self._jobs = None
+        self.cancel_btn.config(state="disabled")
+        self.progress_bar.config(value=0)
+        self.test_btn.config(state="normal", text="🔌 Test Connection & Fetch Metadata")
+        self.test_msg.config(text="Cancelled", foreground=self.colors["warning"])
+
+    def on_project_select(self, line: str):
+        """Handle project selection from available list"""
         key = line.split(" — ")[0].strip()
         self.pkey_var.set(key)
         self.plead_var.set("")
@@ -727,6 +1178,85 @@ class ConfigBuilderApp(tk.Tk):
         for p in self.selected_projects:
             self.selected_list.insert(tk.END, f"{p['key']} → {p['lead_email']}")
 
+    def _window_cfg(self, quiet: bool = False) -> Optional[Dict[str, Any]]:
+        """Window section of the config from the form; None (after an error dialog unless quiet) if invalid"""
+        mode = self.range_mode_var.get()
+        if mode == "last_week":
+            return {"mode": "last_week"}
+        if mode == "rolling_days":
+            n_str = self.rolling_n_var.get().strip() or "7"
+            try:
+                n = max(1, int(n_str))
+            except ValueError:
+                if not quiet:
+                    messagebox.showerror("Invalid Input", "Rolling N must be a positive integer.")
+                return None
+            return {"mode": "rolling_days", "rolling_days": n}
+        cstart = self.custom_start_var.get().strip()
+        cend = self.custom_end_var.get().strip()
+        if not (validate_date(cstart) and validate_date(cend)):
+            if not quiet:
+                messagebox.showerror("Invalid Date", "Custom dates must be in YYYY-MM-DD format.")
+            return None
+        return {"mode": "custom_range", "start": cstart, "end": cend}
+
+    def _global_jql(self) -> str:
+        it_sel = [name for name in self.issue_types if name in self.types_list.checked]
+        pr_sel = [name for name in self.priorities if name in self.priorities_list.checked]
+        return build_global_jql(it_sel, pr_sel, self.extra_jql_var.get().strip())
+
+    def _schedule_preview(self):
+        """Debounce: (re)start the quiet-period timer on every filter edit"""
+        if self._preview_after is not None:
+            self.after_cancel(self._preview_after)
+        self._preview_after = self.after(PREVIEW_DEBOUNCE_MS, self._run_preview)
+
+    def _run_preview(self):
+        """Ask Jira (off the UI thread) how many issues the report query would return"""
+        self._preview_after = None
+        key = self.pkey_var.get().strip() or (self.selected_projects[0]["key"] if self.selected_projects else "")
+        window_cfg = self._window_cfg(quiet=True)
+        if not (self.connection_status and key and window_cfg):
+            self.preview_msg.config(text="")
+            return
+        try:
+            jql = preview_jql(key, window_cfg, self._global_jql())
+        except ValueError as e:
+            self.preview_msg.config(text=f"Preview unavailable: {e}", foreground="gray")
+            return
+        if self._preview is None:
+            headers = make_auth_headers(self.email_var.get().strip(), self.token_var.get().strip())
+            base = self.base_url_var.get().strip()
+            self._preview = CountPreview(
+                lambda q: int(jira_post(base, "/rest/api/3/search/approximate-count", headers, {"jql": q})
+                              .get("count", 0)))
+        self._preview_target = (jql, key)
+        count = self._preview.request(jql)
+        if count is not None:
+            self._show_preview(key, count)
+        else:
+            self.preview_msg.config(text=f"Estimating issues for {key}…", foreground="gray")
+            self.after(POLL_MS, self._poll_preview, self._preview)
+
+    def _poll_preview(self, preview: CountPreview):
+        if preview is not self._preview:
+            return  # reconnected since
+        for jql, result in preview.poll():
+            if self._preview_target is None or jql != self._preview_target[0]:
+                continue  # filters changed while this was in flight
+            if isinstance(result, Exception):
+                msg = str(result)
+                self.preview_msg.config(text=f"Preview failed: {msg[:100]}", foreground=self.colors["error"])
+            else:
+                self._show_preview(self._preview_target[1], result)
+        if preview.busy:
+            self.after(POLL_MS, self._poll_preview, preview)
+
+    def _show_preview(self, key: str, count: int):
+        color = self.colors["warning"] if count > 5000 else self.colors["info"]
+        self.preview_msg.config(text=f"≈ {count:,} issue(s) would be fetched for {key} with these filters and window",
+                                foreground=color)
+
     def on_generate(self):
         """Generate config.json file"""
         # Check connection
@@ -742,30 +1272,14 @@ class ConfigBuilderApp(tk.Tk):
                 return
         
         # Gather selected filters from checkboxes
-        it_sel = [name for name, var in self.issue_type_vars.items() if var.get()]
-        pr_sel = [name for name, var in self.priority_vars.items() if var.get()]
-        extra = self.extra_jql_var.get().strip()
-        global_jql = build_global_jql(it_sel, pr_sel, extra)
+        it_sel = [name for name in self.issue_types if name in self.types_list.checked]
+        pr_sel = [name for name in self.priorities if name in self.priorities_list.checked]
+        global_jql = self._global_jql()
         
         # Window mode
-        mode = self.range_mode_var.get()
-        if mode == "last_week":
-            window_cfg = {"mode": "last_week"}
-        elif mode == "rolling_days":
-            n_str = self.rolling_n_var.get().strip() or "7"
-            try:
-                n = max(1, int(n_str))
-            except ValueError:
-                messagebox.showerror("Invalid Input", "Rolling N must be a positive integer.")
-                return
-            window_cfg = {"mode": "rolling_days", "rolling_days": n}
-        else:
-            cstart = self.custom_start_var.get().strip()
-            cend = self.custom_end_var.get().strip()
-            if not (validate_date(cstart) and validate_date(cend)):
-                messagebox.showerror("Invalid Date", "Custom dates must be in YYYY-MM-DD format.")
-                return
-            window_cfg = {"mode": "custom_range", "start": cstart, "end": cend}
+        window_cfg = self._window_cfg()
+        if window_cfg is None:
+            return
         
         # Top N, CSV, alerts
         topn_str = self.top_n_var.get().strip() or "10"
@@ -781,7 +1295,7 @@ class ConfigBuilderApp(tk.Tk):
         # Build config
         cfg = {
             "report": {
-                "timezone_label": "Europe/Berlin",
+                "timezone_label": TIMEZONE_LABEL,
                 "window": window_cfg,
                 "show_top_n": topn,
                 "include_csv_attachment": include_csv,
@@ -0,0 +1,208 @@
+# daemon.py
+"""
+Long-running scheduler: ``python main.py --daemon``.
+
+Instead of two UTC cron lines (one per DST season), the daemon computes each next run
+in ``timezone_label``, so "Monday 10:00 Europe/Berlin" stays 10:00 local all year.
+Between runs it keeps the Jira clients (connection pools), the SMTP session, the issue
+store, the changelog cache and the run history in memory (main.WarmResources), and it
+serves health and metrics over HTTP:
+
+  GET /healthz   JSON: last run, next run, counts; 503 when the last run failed
+  GET /metrics   Prometheus text: daemon gauges plus the last run's metrics
+
+Config (defaults shown):
+
+    "daemon": {"schedule": [{"days": ["MON"], "at": "10:00"}], "host": "127.0.0.1", "port": 8077}
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+DAEMON_HOST = os.getenv("DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.getenv("DAEMON_PORT", "8077"))
+# The wall clock is re-read at least this often, so suspend/resume or clock steps cannot make a run late.
+DAEMON_TICK_SECONDS = 60.0
+
+WEEKDAYS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+DEFAULT_SCHEDULE = [{"days": ["MON"], "at": "10:00"}]
+
+
+class Schedule:
+    """Weekly wall-clock slots in one timezone, e.g. [{"days": ["MON"], "at": "10:00"}]."""
+
+    def __init__(self, entries: List[dict], tz_label: str):
+        self.tz = ZoneInfo(tz_label)
+        self.slots: List[Tuple[frozenset, int, int]] = []
+        for e in entries:
+            days = [d.strip().upper()[:3] for d in e.get("days") or WEEKDAYS]
+            bad = [d for d in days if d not in WEEKDAYS]
+            if bad:
+                raise ValueError(f"Unknown weekday(s) in schedule: {', '.join(bad)}")
+            h, m = (int(x) for x in e["at"].split(":"))
+            self.slots.append((frozenset(WEEKDAYS.index(d) for d in days), h, m))
+        if not self.slots:
+            raise ValueError("Empty daemon schedule")
+
+    def next_after(self, now: datetime) -> datetime:
+        """First slot strictly after ``now`` (aware), as an aware datetime in the schedule's zone."""
+        local = now.astimezone(self.tz)
+        best: Optional[datetime] = None
+        for offset in range(8):
+            d = local.date() + timedelta(days=offset)
+            for days, h, m in self.slots:
+                if d.weekday() not in days:
+                    continue
+                # fold=0 takes the first of a repeated (autumn) hour; a wall time skipped in
+                # spring resolves to the same instant after the jump. The UTC round trip
+                # normalises both.
+                t = datetime(d.year, d.month, d.day, h, m, tzinfo=self.tz).astimezone(timezone.utc).astimezone(self.tz)
+                if t > now and (best is None or t < best):
+                    best = t
+            if best is not None:
+                return best
+        raise ValueError("Schedule has no upcoming slot")
+
+
+class ReportDaemon:
+    def __init__(self, schedule: Schedule, run: Callable[..., Any], resources, host: str = DAEMON_HOST,
+                 port: int = DAEMON_PORT):
+        self.schedule = schedule
+        self._run = run
+        self.resources = resources
+        self.host, self.port = host, port
+        self.started_at = time.time()
+        self.next_run: Optional[datetime] = None
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._srv: Optional[ThreadingHTTPServer] = None
+
+    # ------------------------ runs ------------------------
+    def run_once(self) -> bool:
+        with self._lock:
+            self.running = True
+        t0 = time.time()
+        error = None
+        try:
+            self._run(resources=self.resources)
+        except Exception as e:
+            # A failed run (Jira down, undelivered mail) must not stop the schedule;
+            # run state makes the next run resume it.
+            error = f"{type(e).__name__}: {e}"
+            print(f"Daemon: run failed: {error}")
+        with self._lock:
+            self.running = False
+            self.runs += 1
+            self.failures += error is not None
+            self.last_run = {"started_at": t0, "finished_at": time.time(), "seconds": round(time.time() - t0, 3),
+                             "ok": error is None, "error": error}
+        return error is None
+
+    def run_forever(self) -> None:
+        self.start_http()
+        try:
+            while not self._stop.is_set():
+                self.next_run = self.schedule.next_after(datetime.now(timezone.utc))
+                print(f"Daemon: next run {self.next_run:%Y-%m-%d %H:%M %Z}")
+                while not self._stop.is_set():
+                    left = self.next_run.timestamp() - time.time()
+                    if left <= 0:
+                        break
+                    self._stop.wait(min(left, DAEMON_TICK_SECONDS))
+                if not self._stop.is_set():
+                    self.run_once()
+        finally:
+            self.stop_http()
+            self.resources.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ------------------------ health / metrics ------------------------
+    def health(self) -> Tuple[int, Dict[str, Any]]:
+        with self._lock:
+            failed = self.last_run is not None and not self.last_run["ok"]
+            body = {
+                "status": "running" if self.running else ("last_run_failed" if failed else "ok"),
+                "started_at": self.started_at,
+                "runs": self.runs,
+                "failures": self.failures,
+                "next_run": self.next_run.isoformat() if self.next_run else None,
+                "last_run": self.last_run,
+            }
+        return (503 if failed else 200), body
+
+    def prometheus(self) -> str:
+        with self._lock:
+            last = self.last_run or {}
+            lines = [
+                "# TYPE jira_report_daemon_runs_total counter",
+                f"jira_report_daemon_runs_total {self.runs}",
+                "# TYPE jira_report_daemon_failures_total counter",
+                f"jira_report_daemon_failures_total {self.failures}",
+                "# TYPE jira_report_daemon_up_seconds gauge",
+                f"jira_report_daemon_up_seconds {round(time.time() - self.started_at, 3)}",
+                "# TYPE jira_report_daemon_next_run_timestamp_seconds gauge",
+                f"jira_report_daemon_next_run_timestamp_seconds {self.next_run.timestamp() if self.next_run else 0}",
+                "# TYPE jira_report_daemon_last_run_success gauge",
+                f"jira_report_daemon_last_run_success {int(bool(last.get('ok')))}",
+            ]
+        metrics = self.resources.last_metrics
+        return "\n".join(lines) + "\n" + (metrics.to_prometheus() if metrics is not None else "")
+
+    def _handler(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: bytes, ctype: str):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/healthz":
+                    status, body = daemon.health()
+                    self._reply(status, json.dumps(body).encode("utf-8"), "application/json")
+                elif path == "/metrics":
+                    self._reply(200, daemon.prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+                else:
+                    self._reply(404, b"not found\n", "text/plain")
+
+        return Handler
+
+    def start_http(self) -> str:
+        self._srv = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._srv.daemon_threads = True
+        threading.Thread(target=self._srv.serve_forever, name="daemon-http", daemon=True).start()
+        host, port = self._srv.server_address[:2]
+        print(f"Daemon: health on http://{host}:{port}/healthz, metrics on /metrics")
+        return f"http://{host}:{port}"
+
+    def stop_http(self) -> None:
+        if self._srv is not None:
+            self._srv.shutdown()
+            self._srv.server_close()
+            self._srv = None
+
+
+def from_config(cfg: dict, run: Callable[..., Any], resources) -> ReportDaemon:
+    d = cfg.get("daemon") or {}
+    schedule = Schedule(d.get("schedule") or DEFAULT_SCHEDULE, cfg["report"].get("timezone_label", "Europe/Berlin"))
+    return ReportDaemon(schedule, run, resources, host=d.get("host") or DAEMON_HOST,
+                        port=int(d.get("port") or DAEMON_PORT))
@@ -0,0 +1,85 @@
+# history.py
+"""
+Per-project runtime history for cost-aware scheduling.
+
+After each run the wall time, stage timings and issue count of every project (key per
+site, the same unit ``shard.py`` hashes) are appended to ``run_history.json``. The next
+run predicts each project's cost from its recent runs and schedules the largest first
+(LPT). That way one huge project at the end of the config no longer decides when the run ends.
+"""
+from __future__ import annotations
+import heapq
+import json
+import os
+import statistics
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+RUN_HISTORY_PATH = os.getenv("RUN_HISTORY_PATH", "run_history.json")
+HISTORY_RUNS_KEPT = int(os.getenv("HISTORY_RUNS_KEPT", "5"))
+
+
+class RunHistory:
+    def __init__(self, path: Optional[str] = None, keep: int = HISTORY_RUNS_KEPT):
+        self.path = path if path is not None else RUN_HISTORY_PATH
+        self.keep = keep
+        self._lock = threading.Lock()
+        self.units: Dict[str, List[Dict[str, Any]]] = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.units = json.load(f).get("units", {})
+
+    def record(self, unit: str, seconds: float, stages: Optional[Dict[str, float]] = None,
+               issues: Optional[int] = None) -> None:
+        entry = {"at": time.time(), "seconds": round(seconds, 3),
+                 "stages": {k: round(v, 3) for k, v in (stages or {}).items()}, "issues": issues}
+        with self._lock:
+            runs = self.units.setdefault(unit, [])
+            runs.append(entry)
+            del runs[:-self.keep]
+
+    def predict(self, unit: str) -> Optional[float]:
+        """Median wall time of the kept runs (robust to one slow outlier), None if never seen."""
+        with self._lock:
+            runs = self.units.get(unit)
+            return statistics.median(r["seconds"] for r in runs) if runs else None
+
+    def costs(self, units: Sequence[str]) -> Dict[str, float]:
+        """Predicted cost per unit; units without history get the median of the known ones."""
+        known = {u: c for u in units if (c := self.predict(u)) is not None}
+        default = statistics.median(known.values()) if known else 1.0
+        return {u: known.get(u, default) for u in units}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            body = json.dumps({"units": self.units}, indent=2)
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, self.path)
+
+
+def lpt_order(items: Sequence[str], costs: Dict[str, float]) -> List[str]:
+    """Largest predicted cost first; equal costs keep their original (config) order."""
+    pos = {u: i for i, u in enumerate(items)}
+    return sorted(items, key=lambda u: (-costs[u], pos[u]))
+
+
+def lpt_assign(items: Sequence[str], costs: Dict[str, float], workers: int) -> Tuple[List[List[str]], float]:
+    """
+    Longest-processing-time-first assignment onto ``workers`` bins: each item, largest
+    first, goes to the currently least-loaded worker. Returns (bins, predicted makespan).
+    """
+    bins: List[List[str]] = [[] for _ in range(max(1, workers))]
+    heap = [(0.0, i) for i in range(len(bins))]
+    for u in lpt_order(items, costs):
+        load, i = heapq.heappop(heap)
+        bins[i].append(u)
+        heapq.heappush(heap, (load + costs[u], i))
+    return bins, max(load for load, _ in heap)
@@ -0,0 +1,193 @@
+# issuestore.py
+"""
+Issue cache for fetched report queries.
+
+A project reported several times with different ``jql_extra`` filters is fetched once
+(in memory, optionally persisted under ISSUE_STORE_DIR) and every variant is filtered
+locally with the JQL evaluator in ``jira.py`` instead of issuing its own server query.
+
+Every entry also records its ``scope`` (site, project and filters, but no window), and
+the newest copy per scope stays findable with ``latest``. A run that is out of time uses
+it as last-resort data, even when the copy was fetched for an earlier window.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from jira import JqlExpr
+
+ISSUE_STORE_DIR = os.getenv("ISSUE_STORE_DIR", "")
+# JSON file persisting fetched changelogs between runs ("" keeps them in memory only).
+CHANGELOG_CACHE_PATH = os.getenv("CHANGELOG_CACHE_PATH", "")
+# Cached issues older than this are refetched (seconds).
+ISSUE_STORE_TTL = float(os.getenv("ISSUE_STORE_TTL", "3600"))
+
+
+def _fields(fields: str) -> List[str]:
+    return sorted({f.strip() for f in fields.split(",") if f.strip()})
+
+
+class IssueStore:
+    def __init__(self, path: Optional[str] = None, ttl: float = ISSUE_STORE_TTL):
+        self.path = path if path is not None else ISSUE_STORE_DIR
+        self.ttl = ttl
+        self._mem: Dict[str, Dict[str, Any]] = {}
+        # scope hash -> key of the newest entry fetched for that scope
+        self._latest: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def _key(jql: str, key: Optional[str] = None) -> str:
+        # ``key`` (a planner query key: site + normalized JQL + fields) overrides the raw JQL,
+        # so the same JQL on two Jira sites never shares an entry.
+        return hashlib.sha1((key or jql).encode("utf-8")).hexdigest()[:20]
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._mem.get(key)
+        if entry is not None and time.time() - entry.get("fetched_at", 0) > self.ttl:
+            del self._mem[key]
+            return None
+        if entry is None and self.path and os.path.exists(self._file(key)):
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry.get("fetched_at", 0) > self.ttl:
+                return None
+            self._mem[key] = entry
+        return entry
+
+    def get(self, jql: str, fields: str, key: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Cached issues for ``jql`` if they were fetched with at least ``fields``."""
+        with self._lock:
+            entry = self._load(self._key(jql, key))
+        if entry is None or not set(_fields(fields)) <= set(entry["fields"]):
+            return None
+        return entry["issues"]
+
+    def latest(self, scope: str, fields: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """
+        (issues, fetched_at) of the newest copy fetched for ``scope``, whatever its window
+        and age: last-resort data when the run is out of time.
+        """
+        sk = self._key(f"scope: {scope}")
+        with self._lock:
+            key = self._latest.get(sk)
+            if key is None and self.path and os.path.exists(self._file(f"latest-{sk}")):
+                with open(self._file(f"latest-{sk}"), "r", encoding="utf-8") as f:
+                    key = json.load(f)["key"]
+            entry = None if key is None else self._mem.get(key)
+            if entry is None and key is not None and self.path and os.path.exists(self._file(key)):
+                with open(self._file(key), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+        if entry is None or not set(_fields(fields)) <= set(entry["fields"]):
+            return None
+        return entry["issues"], entry.get("fetched_at", 0.0)
+
+    def _write(self, name: str, data: Dict[str, Any]) -> None:
+        tmp = f"{self._file(name)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self._file(name))
+
+    def put(self, jql: str, fields: str, issues: List[Dict[str, Any]], key: Optional[str] = None,
+            scope: Optional[str] = None) -> None:
+        key = self._key(jql, key)
+        entry = {"jql": jql, "fields": _fields(fields), "fetched_at": time.time(), "scope": scope, "issues": issues}
+        with self._lock:
+            self._mem[key] = entry
+            if scope is not None:
+                self._latest[self._key(f"scope: {scope}")] = key
+            if self.path:
+                self._write(key, entry)
+                if scope is not None:
+                    self._write(f"latest-{self._key(f'scope: {scope}')}", {"key": key, "scope": scope})
+
+    def expire(self) -> int:
+        """Drop in-memory entries older than the TTL (a long-lived store between runs); returns how many."""
+        now = time.time()
+        with self._lock:
+            old = [k for k, e in self._mem.items() if now - e.get("fetched_at", 0) > self.ttl]
+            for k in old:
+                del self._mem[k]
+        return len(old)
+
+    def discard(self, jql: str, key: Optional[str] = None) -> None:
+        """Release the in-memory copy (a persisted copy stays on disk)."""
+        with self._lock:
+            self._mem.pop(self._key(jql, key), None)
+
+    def fetch(self, jql: str, fields: str, loader: Callable[[str, str], List[Dict[str, Any]]],
+              key: Optional[str] = None, scope: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the cached issues, calling ``loader(jql, fields)`` on a miss."""
+        issues = self.get(jql, fields, key)
+        if issues is not None:
+            self.hits += 1
+            return issues
+        self.misses += 1
+        issues = loader(jql, fields)
+        self.put(jql, fields, issues, key, scope)
+        return issues
+
+    @staticmethod
+    def filter(issues: Iterable[Dict[str, Any]], expr: Optional[JqlExpr]) -> List[Dict[str, Any]]:
+        if expr is None:
+            return list(issues)
+        return [i for i in issues if expr.matches(i)]
+
+
+class ChangelogCache:
+    """
+    Issue changelogs keyed by issue key and validated by the issue's ``updated`` timestamp:
+    any change to an issue (including a transition) bumps ``updated``, so a matching
+    timestamp means the cached history is still complete.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else CHANGELOG_CACHE_PATH
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+
+    def get(self, key: str, updated: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and updated and entry["updated"] == updated:
+                self.hits += 1
+                return entry["histories"]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, updated: Optional[str], histories: List[Dict[str, Any]]) -> None:
+        if not updated:
+            return
+        with self._lock:
+            self._data[key] = {"updated": updated, "histories": histories}
+            self._dirty = True
+
+    def save(self) -> None:
+        if not (self.path and self._dirty):
+            return
+        with self._lock:
+            d = os.path.dirname(self.path)
+            if d:
+                os.makedirs(d, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
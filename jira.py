@@ -1,6 +1,13 @@
 from __future__ import annotations
+import json
 import os
-from typing import Any, Dict, List, Optional
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -10,19 +17,962 @@ JIRA_BASE_URL = os.getenv("JIRA_BASE_URL")
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 
+# Upper bounds (seconds) of the request latency histogram; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Page sizing for /search/jql. Jira returns at most 5000 issues per page for id/key-only
+# requests and fewer (often 100) for richer field sets; the sizer learns the real cap.
+MIN_PAGE_SIZE = 50
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 5000
+TARGET_PAGE_BYTES = int(os.getenv("JIRA_TARGET_PAGE_BYTES", str(2 * 1024 * 1024)))
+SKINNY_FIELDS = frozenset({"id", "key"})
+WANTED_FIELDS = "summary,issuetype,status,assignee,created,resolutiondate,resolution,updated,key"
+
+# Fetch planning (approximate count first). Above the threshold, issues are fetched as
+# id-only pages followed by concurrent bulk fetches of BULK_FETCH_SIZE issues each.
+STRATEGY_COUNT_ONLY = "count_only"
+STRATEGY_SINGLE_PAGE = "single_page"
+STRATEGY_SEQUENTIAL = "sequential"
+STRATEGY_PARALLEL = "parallel"
+PARALLEL_FETCH_THRESHOLD = int(os.getenv("JIRA_PARALLEL_FETCH_THRESHOLD", "2000"))
+BULK_FETCH_SIZE = 100
+FETCH_CONCURRENCY = int(os.getenv("JIRA_FETCH_CONCURRENCY", "8"))
+
+# POST /changelog/bulkfetch accepts up to 1000 issues per request.
+CHANGELOG_BATCH_SIZE = 1000
+CHANGELOG_FIELDS = ("status", "resolution")
+
+# Retry policy shared by both HTTP engines (urllib3 Retry here, jira_async for asyncio).
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.6
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+REQUEST_TIMEOUT = 30
+
+RATE_LIMIT_HEADERS = ("Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+                      "X-RateLimit-NearLimit", "RateLimit-Reason")
+
+
+def json_decoder(name: Optional[str] = None):
+    """
+    Return a ``bytes -> object`` JSON decoder. ``auto`` (default, or JIRA_JSON_DECODER)
+    prefers orjson when it is installed and falls back to the stdlib.
+    """
+    name = (name or os.getenv("JIRA_JSON_DECODER") or "auto").lower()
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError:
+            if name == "orjson":
+                raise
+    if name not in ("auto", "json", "orjson"):
+        raise ValueError(f"Unknown JSON decoder: {name!r} (use auto, orjson or json)")
+    return json.loads
+
+
+class PageSizer:
+    """
+    Adaptive maxResults for one paginated search. Starts from the requested field set,
+    then steers towards TARGET_PAGE_BYTES per response using the observed bytes per
+    issue, never asking for more than the server has shown it will return.
+    """
+
+    def __init__(self, fields: str, fixed: Optional[int] = None, target_bytes: int = TARGET_PAGE_BYTES):
+        self.fixed = fixed
+        self.target_bytes = target_bytes
+        self.server_cap = MAX_PAGE_SIZE
+        names = {f.strip() for f in (fields or "").split(",") if f.strip()}
+        if fixed:
+            self.size = fixed
+        elif names and names <= SKINNY_FIELDS:
+            self.size = MAX_PAGE_SIZE
+        elif not names or any(n.startswith("*") for n in names):
+            self.size = DEFAULT_PAGE_SIZE
+        else:
+            # A short explicit field list is cheap per issue; start a bit higher than the default.
+            self.size = 250 if len(names) <= 10 else DEFAULT_PAGE_SIZE
+
+    def observe(self, requested: int, returned: int, nbytes: int, has_more: bool) -> None:
+        if self.fixed or returned <= 0:
+            return
+        if has_more and returned < requested:
+            # The server capped the page; asking for more only wastes bytes in the URL.
+            self.server_cap = returned
+        per_issue = max(1.0, nbytes / returned)
+        ideal = int(self.target_bytes / per_issue)
+        # Grow at most 4x per page so one tiny page does not cause a huge jump.
+        ideal = min(ideal, self.size * 4)
+        self.size = max(MIN_PAGE_SIZE, min(ideal, self.server_cap, MAX_PAGE_SIZE))
+
+
+def _field_set(fields: str) -> str:
+    return ",".join(sorted({f.strip() for f in (fields or "").split(",") if f.strip()}))
+
+
+def page_cap(fields: str, seen: Optional[Dict[str, int]] = None) -> int:
+    """
+    Issues Jira is known to return per /search/jql page for ``fields``: MAX_PAGE_SIZE for
+    id/key only; for richer field sets DEFAULT_PAGE_SIZE until a larger page was seen
+    (``seen``: largest page per field set, kept by the client's SearchPagers).
+    """
+    fs = _field_set(fields)
+    if fs and set(fs.split(",")) <= SKINNY_FIELDS:
+        return MAX_PAGE_SIZE
+    return max(DEFAULT_PAGE_SIZE, (seen or {}).get(fs, 0))
+
+
+class FetchPlan:
+    """Planner decision for one JQL; ``actual`` is filled in after the fetch for calibration."""
+
+    def __init__(self, strategy: str, estimate: Optional[int]):
+        self.strategy = strategy
+        self.estimate = estimate
+        self.actual: Optional[int] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"strategy": self.strategy, "estimate": self.estimate, "actual": self.actual}
+
+
+def choose_strategy(estimate: int, *, count_only: bool, fields: str, page_size: Optional[int],
+                    fetch_concurrency: int, page_caps: Optional[Dict[str, int]] = None) -> FetchPlan:
+    """The plan_fetch decision for a known estimate (shared by both HTTP engines)."""
+    if count_only:
+        return FetchPlan(STRATEGY_COUNT_ONLY, estimate)
+    if estimate <= min(PageSizer(fields, fixed=page_size).size, page_cap(fields, page_caps)):
+        return FetchPlan(STRATEGY_SINGLE_PAGE, estimate)
+    if estimate <= PARALLEL_FETCH_THRESHOLD or fetch_concurrency <= 1:
+        return FetchPlan(STRATEGY_SEQUENTIAL, estimate)
+    return FetchPlan(STRATEGY_PARALLEL, estimate)
+
+
+def planner_unavailable(e: Exception) -> FetchPlan:
+    """plan_fetch when the count endpoint failed: page sequentially without an estimate."""
+    print(f"Fetch planner: approximate count unavailable ({type(e).__name__}); paging sequentially")
+    return FetchPlan(STRATEGY_SEQUENTIAL, None)
+
+
+def log_fetch_plan(client, plan: FetchPlan, issues: List[Dict[str, Any]]) -> None:
+    """Record how a planned fetch turned out (``client.plan_log``, for run metrics and calibration)."""
+    plan.actual = len(issues)
+    if client.planning:
+        client.plan_log.append(plan)
+        print(f"Fetch planner: {plan.strategy} — estimated {plan.estimate}, fetched {plan.actual}")
+
+
+class SearchPager:
+    """
+    Token paging over GET /search/jql with an adaptive page size. The engines only send
+    the requests, so the sync and asyncio loops are the same three lines:
+
+        while not pager.done:
+            pager.feed(*request(pager.params()))
+    """
+
+    MAX_PAGES = 501
+
+    def __init__(self, jql: str, fields: str, page_size: Optional[int] = None, first_page: Optional[int] = None,
+                 seen: Optional[Dict[str, int]] = None):
+        self.jql = jql
+        self.fields = fields
+        self.seen = seen
+        self.sizer = PageSizer(fields, fixed=page_size)
+        if first_page and not page_size:
+            # Sized from the estimate, but never above what Jira is known to return for these fields.
+            self.sizer.size = min(max(self.sizer.size, first_page), page_cap(fields, seen))
+        self.issues: List[Dict[str, Any]] = []
+        self.token: Optional[str] = None
+        self.pages = 0
+        self.done = False
+        self._requested = 0
+
+    def params(self) -> Dict[str, Any]:
+        self._requested = self.sizer.size
+        params: Dict[str, Any] = {"jql": self.jql, "maxResults": self._requested}
+        if self.fields:
+            params["fields"] = self.fields
+        if self.token:
+            params["nextPageToken"] = self.token
+        return params
+
+    def feed(self, data: Dict[str, Any], nbytes: int) -> None:
+        page = data.get("issues", [])
+        self.issues.extend(page)
+        self.token = data.get("nextPageToken")
+        self.sizer.observe(self._requested, len(page), nbytes, bool(self.token))
+        if self.seen is not None and len(page) > self.seen.get(_field_set(self.fields), 0):
+            self.seen[_field_set(self.fields)] = len(page)
+        self.pages += 1
+        self.done = not self.token or self.pages >= self.MAX_PAGES
+
+
+def split_cached_changelogs(issues: List[Dict[str, Any]],
+                            cache) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+    """(histories already cached by key, issues still to fetch by id) for get_changelogs."""
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    missing: Dict[str, Dict[str, Any]] = {}
+    for it in issues:
+        key = it.get("key")
+        cached = cache.get(key, (it.get("fields") or {}).get("updated")) if cache is not None else None
+        if cached is not None:
+            out[key] = cached
+        else:
+            missing[str(it.get("id") or key)] = it
+    return out, missing
+
+
+def merge_changelogs(out: Dict[str, List[Dict[str, Any]]], missing: Dict[str, Dict[str, Any]],
+                     results: List[Dict[str, List[Dict[str, Any]]]], cache) -> Dict[str, List[Dict[str, Any]]]:
+    """Fold per-shard results (keyed by issue id) into ``out`` by key and store them in ``cache``."""
+    for by_id in results:
+        for ident, histories in by_id.items():
+            if ident in missing:
+                out[missing[ident]["key"]] = histories
+    for it in missing.values():
+        # Issues without a matching change are absent from the response: an empty history.
+        histories = out.setdefault(it["key"], [])
+        if cache is not None:
+            cache.put(it["key"], (it.get("fields") or {}).get("updated"), histories)
+    return out
+
+
+class DeadlineExceeded(RuntimeError):
+    """The run's deadline (``JiraClient.deadline``) passed before a Jira call could finish."""
+
+
+def deadline_left(deadline: Optional[float], what: str = "Jira request") -> Optional[float]:
+    """Seconds until ``deadline`` (epoch), None without one; raises DeadlineExceeded once it passed."""
+    if deadline is None:
+        return None
+    left = deadline - time.time()
+    if left <= 0:
+        raise DeadlineExceeded(f"{what}: run deadline passed")
+    return left
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread (or task) of one client: on average ``rate``
+    requests per second with bursts of up to ``burst``. ``reserve()`` takes a token and
+    returns how long the caller has to wait before sending.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self._t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._t) * self.rate)
+            self._t = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class JiraHttpStats:
+    """
+    In-process HTTP telemetry for one JiraClient: latency histogram, status codes,
+    retries and time spent backing off inside urllib3, response bytes, and the
+    rate-limit headers Jira sent back. Safe to share across threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.latency_total = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.status_codes: Counter = Counter()
+        self.retries = 0
+        self.retry_status_codes: Counter = Counter()
+        self.backoff_seconds = 0.0
+        self.throttle_seconds = 0.0
+        self.response_bytes = 0
+        self.wire_bytes = 0
+        self.decode_seconds = 0.0
+        self.rate_limit: Dict[str, str] = {}
+        self.min_rate_limit_remaining: Optional[int] = None
+
+    def reset(self) -> None:
+        """Start counting afresh (a long-lived client reports per run)."""
+        fresh = JiraHttpStats()
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+
+    def _note_headers(self, headers) -> None:
+        for h in RATE_LIMIT_HEADERS:
+            v = headers.get(h) if headers is not None else None
+            if v is None:
+                continue
+            self.rate_limit[h] = v
+            if h == "X-RateLimit-Remaining":
+                try:
+                    n = int(v)
+                except ValueError:
+                    continue
+                if self.min_rate_limit_remaining is None or n < self.min_rate_limit_remaining:
+                    self.min_rate_limit_remaining = n
+
+    def record_response(self, status: int, seconds: float, nbytes: int, headers=None) -> None:
+        with self._lock:
+            self.requests += 1
+            self.latency_total += seconds
+            i = 0
+            while i < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[i]:
+                i += 1
+            self.latency_buckets[i] += 1
+            self.status_codes[status] += 1
+            self.response_bytes += nbytes
+            self._note_headers(headers)
+
+    def record_transfer(self, wire_bytes: int, decode_seconds: float) -> None:
+        with self._lock:
+            self.wire_bytes += wire_bytes
+            self.decode_seconds += decode_seconds
+
+    def record_retry(self, status: Optional[int], headers=None) -> None:
+        with self._lock:
+            self.retries += 1
+            self.retry_status_codes[status if status is not None else "error"] += 1
+            self._note_headers(headers)
+
+    def record_backoff(self, seconds: float) -> None:
+        with self._lock:
+            self.backoff_seconds += seconds
+
+    def record_throttle(self, seconds: float) -> None:
+        """Time spent waiting for the client's own rate-limit budget (RateLimiter)."""
+        with self._lock:
+            self.throttle_seconds += seconds
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{b:g}" for b in LATENCY_BUCKETS] + ["le_inf"]
+            return {
+                "requests": self.requests,
+                "latency_seconds_total": round(self.latency_total, 6),
+                "latency_seconds_avg": round(self.latency_total / self.requests, 6) if self.requests else 0.0,
+                "latency_histogram": dict(zip(labels, self.latency_buckets)),
+                "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+                "retries": self.retries,
+                "retry_status_codes": {str(k): v for k, v in self.retry_status_codes.items()},
+                "backoff_seconds": round(self.backoff_seconds, 6),
+                "throttle_seconds": round(self.throttle_seconds, 6),
+                "response_bytes": self.response_bytes,
+                "wire_bytes": self.wire_bytes,
+                "decode_seconds": round(self.decode_seconds, 6),
+                "rate_limit": dict(self.rate_limit),
+                "min_rate_limit_remaining": self.min_rate_limit_remaining,
+            }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        return (
+            f"HTTP: {s['requests']} request(s), avg {s['latency_seconds_avg']:.3f}s, "
+            f"{s['response_bytes']} bytes ({s['wire_bytes']} on the wire), "
+            f"decode {s['decode_seconds']:.3f}s, statuses {s['status_codes']}, "
+            f"{s['retries']} retr(y/ies) {s['retry_status_codes']} with {s['backoff_seconds']:.1f}s backoff, "
+            f"min rate-limit remaining {s['min_rate_limit_remaining']}"
+        )
+
+
+class _TelemetryRetry(Retry):
+    """urllib3 Retry that reports every retry and backoff sleep to a JiraHttpStats."""
+
+    stats: Optional[JiraHttpStats] = None
+    deadline: Optional[float] = None
+
+    def new(self, **kw):
+        r = super().new(**kw)
+        r.stats = self.stats
+        r.deadline = self.deadline
+        return r
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if self.stats is not None:
+            self.stats.record_retry(getattr(response, "status", None), getattr(response, "headers", None))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+    def sleep(self, response=None):
+        if self.deadline is not None:
+            # Give up instead of backing off past the run deadline.
+            wait = (self.get_retry_after(response) if response is not None else None) or self.get_backoff_time()
+            if time.time() + wait >= self.deadline:
+                raise DeadlineExceeded(f"retry backoff of {wait:.1f}s would pass the run deadline")
+        t0 = time.perf_counter()
+        try:
+            super().sleep(response)
+        finally:
+            if self.stats is not None:
+                self.stats.record_backoff(time.perf_counter() - t0)
+
+
+# ------------------------ JQL expression model ------------------------
+class JqlExpr(ABC):
+    """Tiny JQL AST: enough to build, simplify and locally evaluate the queries this tool emits."""
+
+    @abstractmethod
+    def to_jql(self) -> str:
+        ...
+
+    @abstractmethod
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        ...
+
+    def __str__(self) -> str:
+        return self.to_jql()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, JqlExpr) and self.to_jql() == other.to_jql()
+
+    def __hash__(self) -> int:
+        return hash(self.to_jql())
+
+
+class UnsupportedJql(ValueError):
+    """Raised when a JQL construct cannot be evaluated locally."""
+
+
+_DATE_FIELDS = {"created", "resolved", "resolutiondate", "updated", "duedate"}
+
+# JQL field name -> REST field id, for every field the local evaluator understands.
+LOCAL_JQL_FIELDS = {
+    "project": "project",
+    "issuetype": "issuetype",
+    "type": "issuetype",
+    "priority": "priority",
+    "status": "status",
+    "resolution": "resolution",
+    "component": "components",
+    "components": "components",
+    "labels": "labels",
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "created": "created",
+    "resolved": "resolutiondate",
+    "resolutiondate": "resolutiondate",
+    "updated": "updated",
+    "duedate": "duedate",
+    "key": "key",
+    "issuekey": "key",
+}
+
+_RELATIVE_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def _issue_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Jira timestamps are rendered in the user's zone; compare on that wall-clock time."""
+    if not value:
+        return None
+    v = value.strip()
+    try:
+        return datetime.strptime(v[:19], "%Y-%m-%dT%H:%M:%S") if "T" in v else datetime.strptime(v[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _literal_datetime(value: str, now: Optional[datetime] = None) -> datetime:
+    v = value.strip()
+    for fmt in ("%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y-%m-%d", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(v, fmt)
+        except ValueError:
+            continue
+    # Relative offsets such as "-7d", "-2w", "-4h" (JQL has no plain seconds unit).
+    if len(v) >= 2 and v[-1].lower() in _RELATIVE_UNITS and v[:-1].lstrip("+-").isdigit():
+        return (now or datetime.now()) + timedelta(seconds=int(v[:-1]) * _RELATIVE_UNITS[v[-1].lower()])
+    raise UnsupportedJql(f"Unsupported date literal: {value!r}")
+
+
+def _field_id(field: str) -> str:
+    fid = LOCAL_JQL_FIELDS.get(field.lower())
+    if fid is None:
+        raise UnsupportedJql(f"Field {field!r} is not available for local evaluation")
+    return fid
+
+
+def _field_value(issue: Dict[str, Any], field: str) -> Any:
+    f = issue.get("fields") or {}
+    fid = _field_id(field)
+    if fid == "key":
+        return issue.get("key")
+    if fid == "resolutiondate":
+        return f.get("resolutiondate") or f.get("resolved")
+    if fid == "project":
+        return f.get("project") or {"key": (issue.get("key") or "").rsplit("-", 1)[0]}
+    return f.get(fid)
+
+
+def _candidates(value: Any) -> List[str]:
+    """Every string a JQL literal may use to name this value (names, keys, ids, emails), case-folded."""
+    items = value if isinstance(value, list) else [value]
+    out: List[str] = []
+    for v in items:
+        if isinstance(v, dict):
+            for k in ("name", "key", "value", "accountId", "displayName", "emailAddress", "id"):
+                if v.get(k) is not None:
+                    out.append(str(v[k]).casefold())
+        elif v is not None and v != "":
+            out.append(str(v).casefold())
+    return out
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+class Cmp(JqlExpr):
+    def __init__(self, field: str, op: str, value: Any, quote: bool = True):
+        self.field = field
+        self.op = op
+        self.value = value
+        self.quote = quote
+
+    def _lit(self, v: Any) -> str:
+        if not self.quote:
+            return str(v)
+        return '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def to_jql(self) -> str:
+        if isinstance(self.value, (list, tuple)):
+            return f"{self.field} {self.op} ({', '.join(self._lit(v) for v in self.value)})"
+        return f"{self.field} {self.op} {self._lit(self.value)}"
+
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        actual = _field_value(issue, self.field)
+        if _is_empty(actual):
+            # JQL comparisons never match empty fields (use IS EMPTY for that).
+            return False
+        if _field_id(self.field) in _DATE_FIELDS:
+            return _compare(_issue_datetime(actual), self.op, _literal_datetime(str(self.value)))
+        values = self.value if isinstance(self.value, (list, tuple)) else [self.value]
+        hit = bool(set(_candidates(actual)) & {str(v).casefold() for v in values})
+        if self.op in ("=", "in"):
+            return hit
+        if self.op in ("!=", "not in"):
+            return not hit
+        raise UnsupportedJql(f"Operator {self.op!r} is not supported on field {self.field!r}")
+
+
+# Operators Cmp.matches can evaluate: ordering on dates, (non-)membership on everything else.
+_DATE_OPS = ("<", "<=", ">", ">=", "=", "!=")
+_VALUE_OPS = ("=", "!=", "in", "not in")
+
+
+def _compare(actual: Any, op: str, value: Any) -> bool:
+    if actual is None:
+        return False
+    if op == "<":
+        return actual < value
+    if op == "<=":
+        return actual <= value
+    if op == ">":
+        return actual > value
+    if op == ">=":
+        return actual >= value
+    if op == "=":
+        return actual == value
+    if op == "!=":
+        return actual != value
+    raise UnsupportedJql(f"Unsupported operator: {op!r}")
+
+
+class IsEmpty(JqlExpr):
+    def __init__(self, field: str, negated: bool = False):
+        self.field = field
+        self.negated = negated
+
+    def to_jql(self) -> str:
+        return f"{self.field} IS {'NOT ' if self.negated else ''}EMPTY"
+
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        empty = _is_empty(_field_value(issue, self.field))
+        return not empty if self.negated else empty
+
+
+class And(JqlExpr):
+    def __init__(self, *parts: JqlExpr):
+        self.parts = list(parts)
+
+    def to_jql(self) -> str:
+        return " AND ".join(f"({p.to_jql()})" if isinstance(p, Or) else p.to_jql() for p in self.parts)
+
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        return all(p.matches(issue) for p in self.parts)
+
+
+class Or(JqlExpr):
+    def __init__(self, *parts: JqlExpr):
+        self.parts = list(parts)
+
+    def to_jql(self) -> str:
+        return " OR ".join(f"({p.to_jql()})" if isinstance(p, And) else p.to_jql() for p in self.parts)
+
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        return any(p.matches(issue) for p in self.parts)
+
+
+class Raw(JqlExpr):
+    """Opaque JQL text (e.g. user-supplied extras) carried through unchanged."""
+
+    def __init__(self, text: str):
+        self.text = text.strip()
+
+    def to_jql(self) -> str:
+        return f"({self.text})" if _has_top_level_or(self.text) else self.text
+
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        raise UnsupportedJql(f"Opaque JQL cannot be evaluated locally: {self.text!r}")
+
+
+def _has_top_level_or(text: str) -> bool:
+    depth = 0
+    quote: Optional[str] = None
+    i = 0
+    up = text.upper()
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif depth == 0 and up.startswith("OR", i) and (i == 0 or not text[i - 1].isalnum()) \
+                and (i + 2 == len(text) or not text[i + 2].isalnum()):
+            return True
+        i += 1
+    return False
+
+
+def merge_extra(expr: JqlExpr, extra_filters: str) -> JqlExpr:
+    """
+    Attach JiraClient._merge_filters extras to an expression. AND-only extras become a
+    conjunct; anything with a top-level OR keeps the exact textual semantics of the
+    string builders (JQL binds AND tighter than OR).
+    """
+    merged = JiraClient._merge_filters(extra_filters)
+    if not merged:
+        return expr
+    if merged.startswith(" AND ") and not _has_top_level_or(merged[5:]):
+        return And(expr, Raw(merged[5:]))
+    return Raw(f"{expr.to_jql()}{merged}")
+
+
+def _is_window_branch(e: JqlExpr, field: str) -> Optional[Tuple[str, str]]:
+    """Match `field >= s AND field < e` -> (s, e)."""
+    if not (isinstance(e, And) and len(e.parts) == 2):
+        return None
+    lo, hi = e.parts
+    if (isinstance(lo, Cmp) and isinstance(hi, Cmp) and lo.field == hi.field == field
+            and lo.op == ">=" and hi.op == "<"):
+        return str(lo.value), str(hi.value)
+    return None
+
+
+def _is_open_at(e: JqlExpr) -> Optional[str]:
+    """Match `created < x AND (resolved IS EMPTY OR resolved >= x)` -> x."""
+    if not (isinstance(e, And) and len(e.parts) == 2):
+        return None
+    c, o = e.parts
+    if not (isinstance(c, Cmp) and c.field == "created" and c.op == "<" and isinstance(o, Or) and len(o.parts) == 2):
+        return None
+    empty, ge = o.parts
+    if (isinstance(empty, IsEmpty) and empty.field == "resolved" and not empty.negated
+            and isinstance(ge, Cmp) and ge.field == "resolved" and ge.op == ">=" and ge.value == c.value):
+        return str(c.value)
+    return None
+
+
+def simplify(expr: JqlExpr) -> JqlExpr:
+    """
+    Algebraic clean-up of a JQL expression:
+      - flatten nested AND/OR, drop duplicate operands, unwrap single-operand groups
+      - drop `f IS NOT EMPTY` next to a comparison on `f` (comparisons never match empty)
+      - collapse the window union
+            (created in [s,e)) OR (resolved in [s,e)) OR (open at e)
+        into  created < e AND (resolved IS EMPTY OR resolved >= s)
+        which is exact for Jira data, where an issue is never resolved before it is created.
+    """
+    if isinstance(expr, (And, Or)):
+        kind = type(expr)
+        parts: List[JqlExpr] = []
+        for p in (simplify(p) for p in expr.parts):
+            for q in (p.parts if isinstance(p, kind) else [p]):
+                if q not in parts:
+                    parts.append(q)
+        if kind is And:
+            compared = {p.field for p in parts if isinstance(p, Cmp) and p.op in ("<", "<=", ">", ">=", "=")}
+            parts = [p for p in parts if not (isinstance(p, IsEmpty) and p.negated and p.field in compared)]
+        else:
+            parts = _collapse_window_union(parts)
+        if len(parts) == 1:
+            return parts[0]
+        return kind(*parts)
+    return expr
+
+
+def _collapse_window_union(parts: List[JqlExpr]) -> List[JqlExpr]:
+    created = {i: _is_window_branch(p, "created") for i, p in enumerate(parts)}
+    resolved = {i: _is_window_branch(p, "resolved") for i, p in enumerate(parts)}
+    open_at = {i: _is_open_at(p) for i, p in enumerate(parts)}
+    for ci, cw in created.items():
+        if not cw:
+            continue
+        for ri, rw in resolved.items():
+            if rw != cw:
+                continue
+            for oi, end in open_at.items():
+                if end != cw[1]:
+                    continue
+                start_s, end_s = cw
+                merged = And(Cmp("created", "<", end_s),
+                             Or(IsEmpty("resolved"), Cmp("resolved", ">=", start_s)))
+                rest = [p for i, p in enumerate(parts) if i not in (ci, ri, oi)]
+                return [merged] + rest
+    return parts
+
+
+# ------------------------ JQL parser (local evaluation subset) ------------------------
+_JQL_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<str>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>!=|>=|<=|!~|=|<|>|~)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s(),=<>!~"']+)
+    )""",
+    re.VERBOSE,
+)
+_KEYWORDS = {"AND", "OR", "NOT", "IN", "IS", "EMPTY", "NULL", "ORDER", "BY"}
+
+
+def _tokenize_jql(text: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _JQL_TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise UnsupportedJql(f"Cannot tokenize JQL near: {text[pos:pos + 20]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        val = m.group(kind)
+        if kind == "str":
+            val = re.sub(r"\\(.)", r"\1", val[1:-1])
+        elif kind == "word" and val.upper() in _KEYWORDS:
+            kind, val = "kw", val.upper()
+        tokens.append((kind, val))
+    return tokens
+
+
+class _JqlParser:
+    """
+    Recursive-descent parser for the JQL the config builder and union builder emit:
+    ``=``, ``!=``, ``in``, ``not in``, ``IS [NOT] EMPTY``, date comparisons, AND, OR and
+    parentheses. Functions, ``~``, ``NOT`` and ``ORDER BY`` raise UnsupportedJql.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize_jql(text)
+        self.i = 0
+
+    def _peek(self) -> Tuple[str, str]:
+        return self.tokens[self.i] if self.i < len(self.tokens) else ("eof", "")
+
+    def _next(self) -> Tuple[str, str]:
+        tok = self._peek()
+        self.i += 1
+        return tok
+
+    def _expect(self, kind: str, val: Optional[str] = None) -> str:
+        k, v = self._next()
+        if k != kind or (val is not None and v != val):
+            raise UnsupportedJql(f"Expected {val or kind}, got {v or k!r}")
+        return v
+
+    def parse(self) -> JqlExpr:
+        expr = self._or()
+        if self._peek()[0] != "eof":
+            raise UnsupportedJql(f"Unexpected {self._peek()[1]!r} in JQL")
+        return expr
+
+    def _or(self) -> JqlExpr:
+        parts = [self._and()]
+        while self._peek() == ("kw", "OR"):
+            self._next()
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else Or(*parts)
+
+    def _and(self) -> JqlExpr:
+        parts = [self._term()]
+        while self._peek() == ("kw", "AND"):
+            self._next()
+            parts.append(self._term())
+        return parts[0] if len(parts) == 1 else And(*parts)
+
+    def _term(self) -> JqlExpr:
+        if self._peek() == ("punct", "("):
+            self._next()
+            expr = self._or()
+            self._expect("punct", ")")
+            return expr
+        return self._clause()
+
+    def _value(self) -> Tuple[str, bool]:
+        kind, val = self._next()
+        if kind not in ("str", "word"):
+            raise UnsupportedJql(f"Expected a value, got {val or kind!r}")
+        if kind == "word" and self._peek() == ("punct", "("):
+            raise UnsupportedJql(f"JQL function {val}() cannot be evaluated locally")
+        return val, kind == "str"
+
+    def _clause(self) -> JqlExpr:
+        kind, field = self._next()
+        if kind not in ("str", "word"):
+            raise UnsupportedJql(f"Expected a field name, got {field or kind!r}")
+        k, v = self._next()
+        if (k, v) == ("kw", "IS"):
+            negated = self._peek() == ("kw", "NOT")
+            if negated:
+                self._next()
+            if self._next() not in (("kw", "EMPTY"), ("kw", "NULL")):
+                raise UnsupportedJql("IS must be followed by EMPTY or NULL")
+            return IsEmpty(field, negated)
+        if (k, v) in (("kw", "IN"), ("kw", "NOT")):
+            op = "in"
+            if v == "NOT":
+                self._expect("kw", "IN")
+                op = "not in"
+            self._expect("punct", "(")
+            values = [self._value()[0]]
+            while self._peek() == ("punct", ","):
+                self._next()
+                values.append(self._value()[0])
+            self._expect("punct", ")")
+            return Cmp(field, op, values)
+        if k == "op" and v not in ("~", "!~"):
+            if self._peek() in (("kw", "EMPTY"), ("kw", "NULL")) and v in ("=", "!="):
+                self._next()
+                return IsEmpty(field, negated=(v == "!="))
+            val, quoted = self._value()
+            return Cmp(field, v, val, quote=quoted)
+        raise UnsupportedJql(f"Unsupported JQL operator {v!r}")
+
+
+def parse_jql(text: str) -> JqlExpr:
+    """Parse JQL into a JqlExpr; raises UnsupportedJql outside the supported subset."""
+    return _JqlParser(text).parse()
+
+
+def jql_fields(expr: JqlExpr) -> List[str]:
+    """REST field ids an expression reads; raises UnsupportedJql for fields the evaluator cannot resolve."""
+    if isinstance(expr, (And, Or)):
+        out: List[str] = []
+        for p in expr.parts:
+            out.extend(f for f in jql_fields(p) if f not in out)
+        return out
+    if isinstance(expr, Cmp):
+        fid = _field_id(expr.field)
+        # Checked here, when the plan is built, so Cmp.matches cannot fail halfway through a run.
+        if fid in _DATE_FIELDS:
+            if expr.op not in _DATE_OPS or isinstance(expr.value, (list, tuple)):
+                raise UnsupportedJql(f"Operator {expr.op!r} is not supported on date field {expr.field!r}")
+            _literal_datetime(str(expr.value))
+        elif expr.op not in _VALUE_OPS:
+            raise UnsupportedJql(f"Operator {expr.op!r} is not supported on field {expr.field!r}")
+        return [fid]
+    if isinstance(expr, IsEmpty):
+        return [_field_id(expr.field)]
+    raise UnsupportedJql(f"Cannot evaluate {expr.to_jql()!r} locally")
+
+
+def narrows_only(extra_filters: str) -> bool:
+    """True if appending ``extra_filters`` can only remove issues (no leading or top-level OR)."""
+    text = (extra_filters or "").strip()
+    if text.upper().startswith("AND "):
+        text = text[4:].strip()
+    return not (text.upper().startswith("OR ") or _has_top_level_or(text))
+
+
+def local_filter(extra_filters: str) -> Optional[JqlExpr]:
+    """
+    Turn a ``jql_extra`` / global-extra string into a predicate over already fetched issues.
+    Returns None for an empty filter. Extras that widen the query (leading or top-level OR)
+    cannot be applied to a superset and raise UnsupportedJql, as does anything outside
+    the parser subset.
+    """
+    text = (extra_filters or "").strip()
+    if not text:
+        return None
+    if text.upper().startswith("AND "):
+        text = text[4:].strip()
+    if not narrows_only(text):
+        raise UnsupportedJql("Extras with a top-level OR widen the query and cannot filter a superset")
+    expr = parse_jql(text)
+    jql_fields(expr)
+    return expr
+
 
 class JiraClient:
-    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None, api_token: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None, api_token: Optional[str] = None,
+                 *, page_size: Optional[int] = None, json_decoder_name: Optional[str] = None,
+                 planning: bool = True, fetch_concurrency: int = FETCH_CONCURRENCY,
+                 rate_limit: Optional[float] = None):
+        """
+        ``fetch_concurrency`` also caps connections, so it bounds requests in flight across
+        all threads using this client; ``rate_limit`` (requests/second) paces them.
+        """
         base = (base_url or JIRA_BASE_URL or "").rstrip("/")
         self.base_url = f"{base}/rest/api/3/"
         self.auth = (email or JIRA_EMAIL, api_token or JIRA_API_TOKEN)
         if not all(self.auth) or not base.startswith("http"):
             raise RuntimeError("JiraClient: missing or invalid JIRA_BASE_URL / JIRA_EMAIL / JIRA_API_TOKEN")
 
+        self.http_stats = JiraHttpStats()
         self.sess = requests.Session()
-        retry = Retry(total=5, backoff_factor=0.6, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
-        self.sess.mount("https://", HTTPAdapter(max_retries=retry))
-        self.sess.headers.update({"Accept": "application/json"})
+        retry = _TelemetryRetry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR,
+                                status_forcelist=RETRY_STATUSES, allowed_methods=None)
+        retry.stats = self.http_stats
+        self._retry = retry
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=max(1, fetch_concurrency), pool_block=True)
+        self.sess.mount("https://", adapter)
+        self.sess.mount("http://", adapter)
+        # Search responses are repetitive JSON and compress very well.
+        self.sess.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+        self.page_size = page_size  # None -> adaptive (PageSizer)
+        self._loads = json_decoder(json_decoder_name)
+        self.planning = planning
+        self.fetch_concurrency = fetch_concurrency
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.plan_log: List[FetchPlan] = []
+        # Largest search page seen per field set (page_cap).
+        self.page_caps: Dict[str, int] = {}
+
+        # Running totals for run metrics (callers diff them per project).
+        self.pages = 0
+        self.bytes_received = 0
+        self._counter_lock = threading.Lock()
+
+    def close(self) -> None:
+        self.sess.close()
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Epoch seconds after which no request is started, retried or waited for."""
+        return self._retry.deadline
+
+    @deadline.setter
+    def deadline(self, at: Optional[float]) -> None:
+        self._retry.deadline = at
 
     @staticmethod
     def _merge_filters(extra_filters: str) -> str:
@@ -66,6 +1016,16 @@ class JiraClient:
         term = f'created <= "{end}" AND (resolved IS EMPTY OR resolved > "{end}")'
         return f"project = {project_key} AND {term}{JiraClient._merge_filters(extra_filters)}"
 
+    @staticmethod
+    def _end_plus_1(end: str) -> str:
+        """end + 1 day (YYYY-MM-DD), for inclusive '< end+1' comparisons."""
+        try:
+            end_dt = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1)
+            return end_dt.strftime("%Y-%m-%d")
+        except Exception:
+            # Fallback (shouldn't happen if end is valid ISO date)
+            return end
+
     # ------------------------ unified union builder used at runtime ------------------------
     @staticmethod
     def build_jql_union_window(
@@ -75,13 +1035,20 @@ class JiraClient:
         end: Optional[str] = None,
         interval: Optional[str] = None,
         extra_filters: str = "",
+        simplified: bool = False,
     ) -> str:
         """
         Union of:
           - Created in window
           - Resolved in window (via 'resolved' alias + IS NOT EMPTY)
           - Open as-of end snapshot
+        With ``simplified=True`` (start/end windows) the three branches are built as a
+        JqlExpr and reduced by ``simplify()`` before rendering.
         """
+        if simplified and not interval:
+            expr = JiraClient.union_window_expr(project_key, start=start, end=end)
+            return merge_extra(simplify(expr), extra_filters).to_jql()
+
         # Allow interval + end (snapshot), but not interval + start
         if interval and start:
             raise ValueError("When using 'interval', do not pass 'start'; provide 'end' only for the snapshot.")
@@ -101,13 +1068,7 @@ class JiraClient:
                 raise ValueError("Union JQL requires 'start' and 'end' (YYYY-MM-DD) when 'interval' is not used.")
 
             # Inclusive window using the robust < end_plus_1d pattern (no startOfDay/endOfDay functions)
-            # Compute end_plus_1 = end + 1 day
-            try:
-                end_dt = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1)
-                end_plus_1 = end_dt.strftime("%Y-%m-%d")
-            except Exception:
-                # Fallback (shouldn't happen if end is valid ISO date)
-                end_plus_1 = end
+            end_plus_1 = JiraClient._end_plus_1(end)
 
             start_s = f'"{start}"'
             end_s = f'"{end}"'
@@ -122,30 +1083,184 @@ class JiraClient:
         core = f"( {created_term} OR {resolved_term} OR {open_term} )"
         return f"project = {project_key} AND {core}{filters}"
 
+    @staticmethod
+    def union_window_expr(project_key: str, *, start: Optional[str], end: Optional[str]) -> JqlExpr:
+        """The three-branch union of build_jql_union_window as an (unsimplified) expression."""
+        if not (start and end):
+            raise ValueError("Union JQL requires 'start' and 'end' (YYYY-MM-DD) when 'interval' is not used.")
+        return And(Cmp("project", "=", project_key, quote=False), JiraClient.window_expr(start=start, end=end))
+
+    @staticmethod
+    def window_expr(*, start: str, end: str) -> JqlExpr:
+        """Created in, resolved in or open at the end of [start, end]: the union minus the project term."""
+        endp1 = JiraClient._end_plus_1(end)
+        created = And(Cmp("created", ">=", start), Cmp("created", "<", endp1))
+        resolved = And(Cmp("resolved", ">=", start), Cmp("resolved", "<", endp1), IsEmpty("resolved", negated=True))
+        open_at_end = And(Cmp("created", "<", endp1), Or(IsEmpty("resolved"), Cmp("resolved", ">=", endp1)))
+        return Or(created, resolved, open_at_end)
+
+    @staticmethod
+    def build_jql_count_terms(project_key: str, *, start: str, end: str, extra_filters: str = "") -> Dict[str, str]:
+        """
+        One JQL per headline number, using the same inclusive '< end+1' terms as
+        build_jql_union_window, so server-side counts match what tag_issues would produce:
+          created, resolved, open_start (opening backlog), open (closing backlog)
+        """
+        if not (start and end):
+            raise ValueError("Count JQL requires 'start' and 'end' (YYYY-MM-DD).")
+        start_s = f'"{start}"'
+        endp1_s = f'"{JiraClient._end_plus_1(end)}"'
+        terms = {
+            "created": f"(created >= {start_s} AND created < {endp1_s})",
+            "resolved": f"(resolved >= {start_s} AND resolved < {endp1_s} AND resolved IS NOT EMPTY)",
+            "open_start": f"(created < {start_s} AND (resolved IS EMPTY OR resolved >= {start_s}))",
+            "open": f"(created < {endp1_s} AND (resolved IS EMPTY OR resolved >= {endp1_s}))",
+        }
+        filters = JiraClient._merge_filters(extra_filters)
+        return {name: f"project = {project_key} AND {term}{filters}" for name, term in terms.items()}
+
     # ------------------------ enhanced search ------------------------
-    def _search_enhanced(self, jql: str, fields: str = "*all", next_page_token: Optional[str] = None) -> Dict[str, Any]:
-        url = self.base_url + "search/jql"
-        params = {"jql": jql, "maxResults": 100}
-        if fields:
-            params["fields"] = fields
-        if next_page_token:
-            params["nextPageToken"] = next_page_token
-        resp = self.sess.get(url, params=params, auth=self.auth, timeout=30)
+    def _request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None,
+                 json_body: Optional[Dict[str, Any]] = None, page: bool = False) -> Tuple[Dict[str, Any], int]:
+        """One telemetered REST call. Returns (decoded body, response bytes)."""
+        left = deadline_left(self.deadline)
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve()
+            if wait:
+                if left is not None and wait >= left:
+                    raise DeadlineExceeded("rate limit wait would pass the run deadline")
+                time.sleep(wait)
+                self.http_stats.record_throttle(wait)
+        left = deadline_left(self.deadline)
+        t0 = time.perf_counter()
+        resp = self.sess.request(method, self.base_url + path, params=params, json=json_body, auth=self.auth,
+                                 timeout=REQUEST_TIMEOUT if left is None else min(REQUEST_TIMEOUT, left))
+        body = resp.content
+        nbytes = len(body)
+        # Latency covers the whole logical request, including urllib3 retries and backoff.
+        self.http_stats.record_response(resp.status_code, time.perf_counter() - t0, nbytes, resp.headers)
         resp.raise_for_status()
-        return resp.json()
+        t1 = time.perf_counter()
+        data = self._loads(body)
+        try:
+            wire = int(resp.raw.tell()) or nbytes
+        except Exception:
+            wire = nbytes
+        self.http_stats.record_transfer(wire, time.perf_counter() - t1)
+        if page:
+            with self._counter_lock:
+                self.pages += 1
+                self.bytes_received += nbytes
+        return data, nbytes
+
+    def _search_enhanced(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """One search/jql page (``SearchPager.params()``). Returns (decoded body, response bytes)."""
+        return self._request("GET", "search/jql", params=params, page=True)
+
+    def approximate_count(self, jql: str) -> int:
+        """Jira's cheap count estimate for a JQL (POST /search/approximate-count)."""
+        data, _ = self._request("POST", "search/approximate-count", json_body={"jql": jql})
+        return int(data.get("count", 0))
+
+    def get_counts(self, jql_by_name: Dict[str, str]) -> Dict[str, int]:
+        """Server-side counts for several JQLs at once (one small request each, in parallel)."""
+        names = list(jql_by_name)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(names), self.fetch_concurrency))) as pool:
+            values = list(pool.map(lambda n: self.approximate_count(jql_by_name[n]), names))
+        return dict(zip(names, values))
+
+    # ------------------------ fetch planning ------------------------
+    def plan_fetch(self, jql: str, *, count_only: bool = False, fields: str = WANTED_FIELDS) -> FetchPlan:
+        """
+        Ask Jira for an approximate count first and choose how to fetch:
+          - count_only  : caller needs numbers only; no issue download
+          - single_page : fits in one page of the requested field set
+          - sequential  : token pagination (adaptive page size)
+          - parallel    : id-only paging + concurrent bulk fetch of the full issues
+        If the count endpoint is unavailable, fall back to sequential paging.
+        """
+        try:
+            estimate = self.approximate_count(jql)
+        except Exception as e:
+            return planner_unavailable(e)
+        return choose_strategy(estimate, count_only=count_only, fields=fields, page_size=self.page_size,
+                               fetch_concurrency=self.fetch_concurrency, page_caps=self.page_caps)
+
+    def expected_requests(self, plan: FetchPlan, fields: str = WANTED_FIELDS) -> Optional[int]:
+        """Search/bulk requests a fetch following ``plan`` should need (None without an estimate)."""
+        if plan.estimate is None:
+            return None
+        n = plan.estimate
+        if plan.strategy == STRATEGY_COUNT_ONLY:
+            return 0
+        if plan.strategy == STRATEGY_PARALLEL:
+            return -(-n // MAX_PAGE_SIZE) + -(-n // BULK_FETCH_SIZE)
+        # Jira caps rich pages (often at 100) whatever maxResults asks for.
+        size = page_cap(fields, self.page_caps)
+        if self.page_size:
+            size = min(size, self.page_size)
+        return max(1, -(-n // size))
 
-    def get_issues(self, jql: str) -> List[Dict[str, Any]]:
-        issues: List[Dict[str, Any]] = []
+    def _get_issues_paged(self, jql: str, fields: str, first_page: Optional[int] = None) -> List[Dict[str, Any]]:
+        pager = SearchPager(jql, fields, self.page_size, first_page, self.page_caps)
+        while not pager.done:
+            pager.feed(*self._search_enhanced(pager.params()))
+        return pager.issues
+
+    def _bulk_fetch(self, ids: List[str], fields: str) -> List[Dict[str, Any]]:
+        data, _ = self._request("POST", "issue/bulkfetch", page=True,
+                                json_body={"issueIdsOrKeys": ids, "fields": fields.split(",")})
+        return data.get("issues", [])
+
+    def _get_issues_parallel(self, jql: str, fields: str) -> List[Dict[str, Any]]:
+        # Phase 1: id-only pages are tiny, so Jira serves them in pages of up to 5000.
+        ids = [it.get("id") or it.get("key") for it in self._get_issues_paged(jql, "id")]
+        shards = [ids[i: i + BULK_FETCH_SIZE] for i in range(0, len(ids), BULK_FETCH_SIZE)]
+        # Phase 2: full issues, BULK_FETCH_SIZE per request, several requests in flight.
+        with ThreadPoolExecutor(max_workers=self.fetch_concurrency) as pool:
+            pages = list(pool.map(lambda shard: self._bulk_fetch(shard, fields), shards))
+        return [it for page in pages for it in page]
+
+    def get_issues(self, jql: str, fields: str = WANTED_FIELDS) -> List[Dict[str, Any]]:
+        wanted_fields = fields
+        plan = self.plan_fetch(jql, fields=wanted_fields) if self.planning else FetchPlan(STRATEGY_SEQUENTIAL, None)
+        if plan.strategy == STRATEGY_PARALLEL:
+            issues = self._get_issues_parallel(jql, wanted_fields)
+        else:
+            issues = self._get_issues_paged(jql, wanted_fields, first_page=plan.estimate)
+        log_fetch_plan(self, plan, issues)
+        return issues
+
+    # ------------------------ changelogs ------------------------
+    def _changelog_batch(self, ids: List[str], field_ids: Tuple[str, ...]) -> Dict[str, List[Dict[str, Any]]]:
+        out: Dict[str, List[Dict[str, Any]]] = {}
         token: Optional[str] = None
-        wanted_fields = "summary,issuetype,status,assignee,created,resolutiondate,resolution,updated,key"
-        guard = 0
-        while True:
-            data = self._search_enhanced(jql, fields=wanted_fields, next_page_token=token)
-            issues.extend(data.get("issues", []))
+        for _ in range(500):
+            body: Dict[str, Any] = {"issueIdsOrKeys": ids, "fieldIds": list(field_ids),
+                                    "maxResults": CHANGELOG_BATCH_SIZE}
+            if token:
+                body["nextPageToken"] = token
+            data, _ = self._request("POST", "changelog/bulkfetch", json_body=body, page=True)
+            for log in data.get("issueChangeLogs", []):
+                out.setdefault(str(log.get("issueId")), []).extend(log.get("changeHistories", []))
             token = data.get("nextPageToken")
             if not token:
                 break
-            guard += 1
-            if guard > 500:
-                break
-        return issues
+        return out
+
+    def get_changelogs(self, issues: List[Dict[str, Any]], field_ids: Tuple[str, ...] = CHANGELOG_FIELDS,
+                       cache=None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Change histories (only ``field_ids`` items) for ``issues``, keyed by issue key, via
+        POST /changelog/bulkfetch: up to CHANGELOG_BATCH_SIZE issues per request and
+        ``fetch_concurrency`` requests in flight. ``cache`` (get/put keyed by issue key and
+        its ``updated`` timestamp) skips issues that have not changed since the last fetch.
+        """
+        out, missing = split_cached_changelogs(issues, cache)
+        ids = list(missing)
+        shards = [ids[i: i + CHANGELOG_BATCH_SIZE] for i in range(0, len(ids), CHANGELOG_BATCH_SIZE)]
+        results = []
+        if shards:
+            with ThreadPoolExecutor(max_workers=max(1, min(len(shards), self.fetch_concurrency))) as pool:
+                results = list(pool.map(lambda shard: self._changelog_batch(shard, field_ids), shards))
+        return merge_changelogs(out, missing, results, cache)
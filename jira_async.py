@@ -0,0 +1,400 @@
+# jira_async.py
+"""
+asyncio engine for the Jira client.
+
+``AsyncJiraClient`` speaks HTTP/1.1 over stdlib asyncio streams with a keep-alive
+connection pool, so hundreds of page, bulk-fetch and changelog requests can be in
+flight on one thread. Planning, paging and retry behaviour follow ``JiraClient``:
+the same strategies (``choose_strategy``), paging (``SearchPager``), plan logging,
+retry policy (RETRY_*) and telemetry (``JiraHttpStats``).
+
+TLS verification honours REQUESTS_CA_BUNDLE / CURL_CA_BUNDLE like requests does.
+HTTP(S)_PROXY is not supported: a client whose Jira host would go through a proxy
+refuses to start (use the requests engine, or list the host in NO_PROXY).
+
+``AsyncBackedJiraClient`` is the synchronous facade: a ``JiraClient`` whose network
+methods run on the async engine in a background event loop, so ``main.run`` and the
+tests can use either engine (JIRA_ENGINE=asyncio or ``--engine asyncio``).
+"""
+from __future__ import annotations
+import asyncio
+import base64
+import gzip
+import json
+import os
+import ssl
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from jira import (BULK_FETCH_SIZE, CHANGELOG_BATCH_SIZE, CHANGELOG_FIELDS, JIRA_API_TOKEN, JIRA_BASE_URL,
+                  JIRA_EMAIL, DeadlineExceeded, deadline_left, RETRY_BACKOFF_FACTOR, RETRY_STATUSES, RETRY_TOTAL,
+                  STRATEGY_PARALLEL, STRATEGY_SEQUENTIAL, WANTED_FIELDS, FetchPlan, JiraClient,
+                  JiraHttpStats, RateLimiter, SearchPager, choose_strategy, json_decoder, log_fetch_plan,
+                  merge_changelogs, planner_unavailable, split_cached_changelogs)
+
+# Requests in flight (and pooled connections) per client; one thread serves all of them.
+ASYNC_FETCH_CONCURRENCY = int(os.getenv("JIRA_ASYNC_CONCURRENCY", "64"))
+# Statuses for which urllib3 honours Retry-After by default.
+_RETRY_AFTER_STATUSES = (413, 429, 503)
+_BACKOFF_MAX = 120.0
+
+
+class _Headers(dict):
+    """Response headers with case-insensitive ``get`` (keys are stored lower-cased)."""
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+def _ssl_context() -> ssl.SSLContext:
+    """Default TLS context, trusting the same CA bundle requests would (REQUESTS_CA_BUNDLE, CURL_CA_BUNDLE)."""
+    return ssl.create_default_context(cafile=os.getenv("REQUESTS_CA_BUNDLE") or os.getenv("CURL_CA_BUNDLE") or None)
+
+
+class _HttpPool:
+    """Keep-alive HTTP/1.1 connections to one origin over asyncio streams; at most ``size`` busy at once."""
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        u = urlsplit(base_url)
+        self.host = u.hostname or ""
+        self.port = u.port or (443 if u.scheme == "https" else 80)
+        self.host_header = u.netloc.rsplit("@", 1)[-1]
+        self.ssl = _ssl_context() if u.scheme == "https" else None
+        self.timeout = timeout
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._sem = asyncio.Semaphore(max(1, size))
+        self.opened = 0
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(self, method: str, target: str, headers: Dict[str, str],
+                      body: Optional[bytes]) -> Tuple[int, _Headers, bytes, int]:
+        """(status, headers, decoded body, bytes on the wire)."""
+        async with self._sem:
+            for attempt in (0, 1):
+                reused = bool(self._idle)
+                conn = self._idle.pop() if reused else await self._open()
+                try:
+                    status, hdrs, raw, keep = await asyncio.wait_for(
+                        self._exchange(conn, method, target, headers, body), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn[1].close()
+                    if reused and attempt == 0:
+                        continue  # the server dropped an idle keep-alive connection
+                    raise
+                except BaseException:
+                    conn[1].close()
+                    raise
+                if keep:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()
+                return status, hdrs, _decode_body(raw, hdrs.get("Content-Encoding")), len(raw)
+        raise ConnectionError("unreachable")
+
+    async def _exchange(self, conn, method: str, target: str, headers: Dict[str, str], body: Optional[bytes]):
+        reader, writer = conn
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host_header}", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        hdrs = _Headers()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            hdrs[k.strip().lower()] = v.strip()
+
+        keep = version == "HTTP/1.1" and hdrs.get("Connection", "").lower() != "close"
+        code = int(status)
+        if method == "HEAD" or code in (204, 304) or 100 <= code < 200:
+            raw = b""
+        elif "chunked" in hdrs.get("Transfer-Encoding", "").lower():
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            raw = b"".join(parts)
+        elif hdrs.get("Content-Length") is not None:
+            raw = await reader.readexactly(int(hdrs.get("Content-Length")))
+        else:
+            raw = await reader.read()
+            keep = False
+        return code, hdrs, raw, keep
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+def _decode_body(raw: bytes, encoding: Optional[str]) -> bytes:
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    return raw
+
+
+def _backoff(retries: int) -> float:
+    """urllib3's exponential backoff: nothing before the first retry, then factor * 2^(n-1)."""
+    return 0.0 if retries <= 1 else min(_BACKOFF_MAX, RETRY_BACKOFF_FACTOR * 2 ** (retries - 1))
+
+
+def _retry_after(status: int, headers: _Headers) -> Optional[float]:
+    if status not in _RETRY_AFTER_STATUSES:
+        return None
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncJiraClient:
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None, api_token: Optional[str] = None,
+                 *, page_size: Optional[int] = None, json_decoder_name: Optional[str] = None,
+                 planning: bool = True, fetch_concurrency: int = ASYNC_FETCH_CONCURRENCY, timeout: float = 30.0,
+                 rate_limit: Optional[float] = None):
+        base = (base_url or JIRA_BASE_URL or "").rstrip("/")
+        auth = (email or JIRA_EMAIL, api_token or JIRA_API_TOKEN)
+        if not all(auth) or not base.startswith("http"):
+            raise RuntimeError("AsyncJiraClient: missing or invalid JIRA_BASE_URL / JIRA_EMAIL / JIRA_API_TOKEN")
+        if requests.utils.get_environ_proxies(base):
+            raise RuntimeError(f"AsyncJiraClient: {base} would go through HTTP(S)_PROXY, which the asyncio engine "
+                               "does not support; use the requests engine or add the host to NO_PROXY")
+        self.base_url = f"{base}/rest/api/3/"
+        self._path = urlsplit(self.base_url).path
+        token = base64.b64encode(f"{auth[0]}:{auth[1]}".encode("utf-8")).decode("ascii")
+        self._headers = {"Authorization": f"Basic {token}", "Accept": "application/json",
+                         "Accept-Encoding": "gzip, deflate", "User-Agent": "jira-weekly-report (asyncio)"}
+        self._pool = _HttpPool(base, fetch_concurrency, timeout)
+        self.http_stats = JiraHttpStats()
+        self.page_size = page_size
+        self._loads = json_decoder(json_decoder_name)
+        self.planning = planning
+        self.fetch_concurrency = fetch_concurrency
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.deadline: Optional[float] = None  # epoch seconds, see JiraClient.deadline
+        self.plan_log: List[FetchPlan] = []
+        self.page_caps: Dict[str, int] = {}
+        self.pages = 0
+        self.bytes_received = 0
+
+    async def aclose(self) -> None:
+        await self._pool.close()
+
+    async def __aenter__(self) -> "AsyncJiraClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None,
+                       json_body: Optional[Dict[str, Any]] = None, page: bool = False) -> Tuple[Dict[str, Any], int]:
+        """One telemetered REST call with JiraClient's retry policy. Returns (decoded body, response bytes)."""
+        target = self._path + path + (f"?{urlencode(params)}" if params else "")
+        body = json.dumps(json_body).encode("utf-8") if json_body is not None else None
+        headers = dict(self._headers)
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        left = deadline_left(self.deadline)
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve()
+            if wait:
+                if left is not None and wait >= left:
+                    raise DeadlineExceeded("rate limit wait would pass the run deadline")
+                await asyncio.sleep(wait)
+                self.http_stats.record_throttle(wait)
+        t0 = time.perf_counter()
+        retries = 0
+        while True:
+            left = deadline_left(self.deadline)
+            try:
+                status, hdrs, data, wire = await asyncio.wait_for(
+                    self._pool.request(method, target, headers, body), left)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                if retries >= RETRY_TOTAL:
+                    raise
+                status, hdrs = None, None
+            else:
+                if status not in RETRY_STATUSES or retries >= RETRY_TOTAL:
+                    break
+            retries += 1
+            self.http_stats.record_retry(status, hdrs)
+            delay = (_retry_after(status, hdrs) if status else None)
+            delay = _backoff(retries) if delay is None else delay
+            if self.deadline is not None and time.time() + delay >= self.deadline:
+                raise DeadlineExceeded(f"retry backoff of {delay:.1f}s would pass the run deadline")
+            if delay:
+                await asyncio.sleep(delay)
+                self.http_stats.record_backoff(delay)
+
+        nbytes = len(data)
+        self.http_stats.record_response(status, time.perf_counter() - t0, nbytes, hdrs)
+        if status >= 400:
+            raise requests.HTTPError(f"{status} Error for url: {self.base_url}{path}: {data[:200]!r}")
+        t1 = time.perf_counter()
+        decoded = self._loads(data)
+        self.http_stats.record_transfer(wire, time.perf_counter() - t1)
+        if page:
+            self.pages += 1
+            self.bytes_received += nbytes
+        return decoded, nbytes
+
+    # ------------------------ counts & planning ------------------------
+    async def approximate_count(self, jql: str) -> int:
+        data, _ = await self._request("POST", "search/approximate-count", json_body={"jql": jql})
+        return int(data.get("count", 0))
+
+    async def get_counts(self, jql_by_name: Dict[str, str]) -> Dict[str, int]:
+        names = list(jql_by_name)
+        values = await asyncio.gather(*(self.approximate_count(jql_by_name[n]) for n in names))
+        return dict(zip(names, values))
+
+    async def plan_fetch(self, jql: str, *, count_only: bool = False, fields: str = WANTED_FIELDS) -> FetchPlan:
+        try:
+            estimate = await self.approximate_count(jql)
+        except Exception as e:
+            return planner_unavailable(e)
+        return choose_strategy(estimate, count_only=count_only, fields=fields, page_size=self.page_size,
+                               fetch_concurrency=self.fetch_concurrency, page_caps=self.page_caps)
+
+    # ------------------------ issues ------------------------
+    async def _get_issues_paged(self, jql: str, fields: str, first_page: Optional[int] = None) -> List[Dict[str, Any]]:
+        pager = SearchPager(jql, fields, self.page_size, first_page, self.page_caps)
+        while not pager.done:
+            pager.feed(*await self._request("GET", "search/jql", params=pager.params(), page=True))
+        return pager.issues
+
+    async def _bulk_fetch(self, ids: List[str], fields: str) -> List[Dict[str, Any]]:
+        data, _ = await self._request("POST", "issue/bulkfetch", page=True,
+                                      json_body={"issueIdsOrKeys": ids, "fields": fields.split(",")})
+        return data.get("issues", [])
+
+    async def _get_issues_parallel(self, jql: str, fields: str) -> List[Dict[str, Any]]:
+        ids = [it.get("id") or it.get("key") for it in await self._get_issues_paged(jql, "id")]
+        shards = [ids[i: i + BULK_FETCH_SIZE] for i in range(0, len(ids), BULK_FETCH_SIZE)]
+        # Every shard is in flight at once; the connection pool bounds real concurrency.
+        pages = await asyncio.gather(*(self._bulk_fetch(shard, fields) for shard in shards))
+        return [it for page in pages for it in page]
+
+    async def get_issues(self, jql: str, fields: str = WANTED_FIELDS) -> List[Dict[str, Any]]:
+        plan = await self.plan_fetch(jql, fields=fields) if self.planning else FetchPlan(STRATEGY_SEQUENTIAL, None)
+        if plan.strategy == STRATEGY_PARALLEL:
+            issues = await self._get_issues_parallel(jql, fields)
+        else:
+            issues = await self._get_issues_paged(jql, fields, first_page=plan.estimate)
+        log_fetch_plan(self, plan, issues)
+        return issues
+
+    # ------------------------ changelogs ------------------------
+    async def _changelog_batch(self, ids: List[str], field_ids: Tuple[str, ...]) -> Dict[str, List[Dict[str, Any]]]:
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        token: Optional[str] = None
+        for _ in range(500):
+            body: Dict[str, Any] = {"issueIdsOrKeys": ids, "fieldIds": list(field_ids),
+                                    "maxResults": CHANGELOG_BATCH_SIZE}
+            if token:
+                body["nextPageToken"] = token
+            data, _ = await self._request("POST", "changelog/bulkfetch", json_body=body, page=True)
+            for log in data.get("issueChangeLogs", []):
+                out.setdefault(str(log.get("issueId")), []).extend(log.get("changeHistories", []))
+            token = data.get("nextPageToken")
+            if not token:
+                break
+        return out
+
+    async def get_changelogs(self, issues: List[Dict[str, Any]], field_ids: Tuple[str, ...] = CHANGELOG_FIELDS,
+                             cache=None) -> Dict[str, List[Dict[str, Any]]]:
+        out, missing = split_cached_changelogs(issues, cache)
+        ids = list(missing)
+        shards = [ids[i: i + CHANGELOG_BATCH_SIZE] for i in range(0, len(ids), CHANGELOG_BATCH_SIZE)]
+        results = await asyncio.gather(*(self._changelog_batch(shard, field_ids) for shard in shards))
+        return merge_changelogs(out, missing, list(results), cache)
+
+
+class AsyncBackedJiraClient(JiraClient):
+    """
+    Blocking ``JiraClient`` surface over ``AsyncJiraClient``: calls are submitted to an
+    event loop on a background thread and waited for, so callers keep their sync code
+    (and may call from several threads) while requests share one loop and one pool.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None, api_token: Optional[str] = None,
+                 **kw):
+        kw.setdefault("fetch_concurrency", ASYNC_FETCH_CONCURRENCY)
+        self._engine = AsyncJiraClient(base_url, email, api_token, **kw)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="jira-asyncio", daemon=True)
+        self._thread.start()
+        self.base_url = self._engine.base_url
+        self.http_stats = self._engine.http_stats
+        self.plan_log = self._engine.plan_log
+        self.page_caps = self._engine.page_caps
+        self._loads = self._engine._loads
+        self._counter_lock = threading.Lock()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        if self._loop.is_running():
+            self._run(self._engine.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    # Settings and counters live on the engine.
+    page_size = property(lambda self: self._engine.page_size,
+                         lambda self, v: setattr(self._engine, "page_size", v))
+    planning = property(lambda self: self._engine.planning,
+                        lambda self, v: setattr(self._engine, "planning", v))
+    fetch_concurrency = property(lambda self: self._engine.fetch_concurrency,
+                                 lambda self, v: setattr(self._engine, "fetch_concurrency", v))
+    pages = property(lambda self: self._engine.pages, lambda self, v: setattr(self._engine, "pages", v))
+    bytes_received = property(lambda self: self._engine.bytes_received,
+                              lambda self, v: setattr(self._engine, "bytes_received", v))
+    deadline = property(lambda self: self._engine.deadline, lambda self, v: setattr(self._engine, "deadline", v))
+
+    def _request(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None,
+                 json_body: Optional[Dict[str, Any]] = None, page: bool = False) -> Tuple[Dict[str, Any], int]:
+        return self._run(self._engine._request(method, path, params=params, json_body=json_body, page=page))
+
+    def approximate_count(self, jql: str) -> int:
+        return self._run(self._engine.approximate_count(jql))
+
+    def get_counts(self, jql_by_name: Dict[str, str]) -> Dict[str, int]:
+        return self._run(self._engine.get_counts(jql_by_name))
+
+    def plan_fetch(self, jql: str, *, count_only: bool = False, fields: str = WANTED_FIELDS) -> FetchPlan:
+        return self._run(self._engine.plan_fetch(jql, count_only=count_only, fields=fields))
+
+    def get_issues(self, jql: str, fields: str = WANTED_FIELDS) -> List[Dict[str, Any]]:
+        return self._run(self._engine.get_issues(jql, fields))
+
+    def get_changelogs(self, issues: List[Dict[str, Any]], field_ids: Tuple[str, ...] = CHANGELOG_FIELDS,
+                       cache=None) -> Dict[str, List[Dict[str, Any]]]:
+        return self._run(self._engine.get_changelogs(issues, field_ids, cache))
@@ -1,7 +1,8 @@
 # mailer.py
 from __future__ import annotations
 import os, io, csv, smtplib
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
@@ -22,42 +23,131 @@ def _resolution_name(fields: dict) -> str:
     return ((fields.get("resolution") or {}).get("name") or "").strip()
 
 
-def _table(rows: List[dict], title: str) -> str:
-    if not rows:
-        return f"<h3>{title}</h3><p>No issues.</p>"
-    tr = []
-    for row in rows:
-        f = row["fields"]
-        key = row["key"]
-        url = f"{JIRA_BASE_URL}/browse/{key}" if JIRA_BASE_URL else "#"
-        summary = (f.get("summary") or "").replace("&", "&amp;").replace("<", "&lt;")
-        status = _status_name(f) or "—"
-        assignee = (f.get("assignee", {}) or {}).get("displayName", "—")
-        created = (f.get("created") or "—")[:10]
-        resolved_on = (f.get("resolutiondate") or f.get("resolved") or "")[:10] or "—"
-        resolution = _resolution_name(f) or "—"
-
-        tr.append(
-            f"<tr>"
-            f"<td><a href='{url}'>{key}</a></td>"
-            f"<td>{summary}</td>"
-            f"<td>{status}</td>"
-            f"<td>{assignee}</td>"
-            f"<td>{created}</td>"
-            f"<td>{resolved_on}</td>"
-            f"<td>{resolution}</td>"
-            f"</tr>"
-        )
-    return (
-        f"<h3>{title}</h3>"
-        "<table border='1' cellpadding='6' cellspacing='0' style='border-collapse:collapse'>"
-        "<thead><tr>"
-        "<th>Key</th><th>Summary</th><th>Status</th><th>Assignee</th><th>Created</th><th>Resolved</th><th>Resolution</th>"
-        "</tr></thead>"
-        "<tbody>" + "".join(tr) + "</tbody></table>"
+# Characters that must not reach the HTML body verbatim. One translate() pass per
+# field replaces the old chained .replace() calls and covers every user-supplied value.
+_HTML_ESCAPES = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+
+def _esc(value) -> str:
+    return str(value).translate(_HTML_ESCAPES)
+
+
+# Templates are compiled once at import time; rendering only fills in bound .format calls.
+_ROW_TMPL = (
+    "<tr>"
+    "<td><a href='{url}'>{key}</a></td>"
+    "<td>{summary}</td>"
+    "<td>{status}</td>"
+    "<td>{assignee}</td>"
+    "<td>{created}</td>"
+    "<td>{resolved}</td>"
+    "<td>{resolution}</td>"
+    "</tr>"
+).format
+
+_TABLE_HEAD_TMPL = (
+    "<h3>{title}</h3>"
+    "<table border='1' cellpadding='6' cellspacing='0' style='border-collapse:collapse'>"
+    "<thead><tr>"
+    "<th>Key</th><th>Summary</th><th>Status</th><th>Assignee</th><th>Created</th><th>Resolved</th><th>Resolution</th>"
+    "</tr></thead>"
+    "<tbody>"
+).format
+
+_TABLE_TAIL = "</tbody></table>"
+
+_EMPTY_TABLE_TMPL = "<h3>{title}</h3><p>No issues.</p>".format
+
+_CARD_TMPL = (
+    '<div style="padding:12px;border:1px solid #ddd;border-radius:8px;">'
+    '<b>{label}</b><div style="font-size:28px;">{value}</div>'
+    "</div>"
+).format
+
+_COUNT_ONLY_NOTE = (
+    "<p style='color:#555;'><i>Headline counts only: approximate figures from Jira's approximate-count "
+    "queries, the issue list was not downloaded.</i></p>"
+)
+
+_DEGRADED_TMPL = (
+    "<p style='background:#fff4e5;border:1px solid #f0a030;padding:8px 12px;margin:10px 0;'>"
+    "<b>Partial report:</b> {reason}</p>"
+).format
+
+_FLOW_TMPL = (
+    "<h3>Flow</h3>"
+    "<table border='1' cellpadding='6' cellspacing='0' style='border-collapse:collapse'>"
+    "<tbody>"
+    "<tr><td>Lead time (created → resolved)</td><td>median {lead_median} d, p85 {lead_p85} d (n={lead_n})</td></tr>"
+    "<tr><td>Cycle time (in progress → resolved)</td><td>median {cycle_median} d, p85 {cycle_p85} d (n={cycle_n})</td></tr>"
+    "<tr><td>Reopened issues (ever)</td><td>{reopened_issues}</td></tr>"
+    "<tr><td>Avg time in status</td><td>{time_in_status}</td></tr>"
+    "</tbody></table>"
+).format
+
+
+def _dash(v) -> str:
+    return "–" if v is None else str(v)
+
+
+def _flow_html(flow: Optional[dict]) -> str:
+    if not flow:
+        return ""
+    lead, cycle = flow["lead_time_days"], flow["cycle_time_days"]
+    tis = ", ".join(f"{_esc(k)} {v} h" for k, v in list(flow["time_in_status_hours"].items())[:6]) or "–"
+    return _FLOW_TMPL(
+        lead_median=_dash(lead["median"]), lead_p85=_dash(lead["p85"]), lead_n=lead["n"],
+        cycle_median=_dash(cycle["median"]), cycle_p85=_dash(cycle["p85"]), cycle_n=cycle["n"],
+        reopened_issues=flow.get("reopened_issues", 0), time_in_status=tis,
     )
 
 
+_PAGE_TMPL = """
+    <html><body style="font-family:Arial,Helvetica,sans-serif">
+      <h2>{heading}</h2>
+      {notice}
+      <div style="display:flex;gap:16px;margin:10px 0;flex-wrap:wrap;">
+        {cards}
+      </div>
+      {identity_line}
+      {flow}
+      {table}
+      <p style="color:#777;margin-top:16px;">{footer}</p>
+    </body></html>
+    """.format
+
+
+def _render_row(row: dict, base_url: str = JIRA_BASE_URL) -> str:
+    f = row["fields"]
+    key = row["key"] or ""
+    return _ROW_TMPL(
+        url=_esc(f"{base_url}/browse/{key}" if base_url else "#"),
+        key=_esc(key),
+        summary=_esc(f.get("summary") or ""),
+        status=_esc(_status_name(f) or "—"),
+        assignee=_esc((f.get("assignee", {}) or {}).get("displayName") or "—"),
+        created=_esc((f.get("created") or "—")[:10]),
+        resolved=_esc((f.get("resolutiondate") or f.get("resolved") or "")[:10] or "—"),
+        resolution=_esc(_resolution_name(f) or "—"),
+    )
+
+
+def _table(rows: List[dict], title: str, base_url: Optional[str] = None) -> str:
+    if not rows:
+        return _EMPTY_TABLE_TMPL(title=_esc(title))
+    base = (base_url or JIRA_BASE_URL).rstrip("/")
+    parts = [_TABLE_HEAD_TMPL(title=_esc(title))]
+    parts.extend(_render_row(r, base) for r in rows)
+    parts.append(_TABLE_TAIL)
+    return "".join(parts)
+
+
 def _csv_bytes(rows: List[dict]) -> bytes:
     buf = io.StringIO()
     w = csv.writer(buf)
@@ -87,8 +177,18 @@ def _csv_bytes(rows: List[dict]) -> bytes:
     return buf.getvalue().encode("utf-8")
 
 
-def send_report(to_email: str, project_key: str, window_label: str,
-                rows: List[dict], counts: Dict[str, int], show_top_n: int = 20):
+def build_report_message(to_email: str, project_key: str, window_label: str,
+                         rows: List[dict], counts: Dict[str, int], show_top_n: int = 20,
+                         include_csv: bool = True, count_only: bool = False,
+                         flow: Optional[dict] = None, base_url: Optional[str] = None,
+                         degraded: Optional[str] = None) -> MIMEMultipart:
+    """
+    Project report email. ``count_only`` renders just the headline numbers (no issue
+    table or CSV) for reports whose counts came from Jira's approximate-count queries.
+    ``flow`` (report.flow_metrics) adds the reopen-aware identity and a flow-time table.
+    ``base_url`` is the project's Jira site for issue links (default JIRA_BASE_URL).
+    ``degraded`` (a reason) marks a report cut short by the run deadline, in the subject and body.
+    """
     # Only include issues that actually matched the window (at least one flag true)
     rows_in_window = [
         r for r in rows
@@ -99,56 +199,119 @@ def send_report(to_email: str, project_key: str, window_label: str,
     created = counts.get("created", 0)
     resolved = counts.get("resolved", 0)
     closing = counts.get("open", 0)
-    closing_calc = counts.get("closing_calc", opening + created - resolved)
+    reopened = counts.get("reopened")
+    closing_calc = counts.get("closing_calc", opening + created - resolved + (reopened or 0))
 
+    reopen_terms = ("", "") if reopened is None else (" + Reopened", f" + {reopened}")
     identity_line = (
         f"<p style='margin:8px 0;color:#444;'>"
-        f"<b>Identity:</b> Closing backlog = Opening + Created − Resolved "
-        f"→ {closing} = {opening} + {created} − {resolved}"
+        f"<b>Identity:</b> Closing backlog = Opening + Created − Resolved{reopen_terms[0]} "
+        f"→ {closing} = {opening} + {created} − {resolved}{reopen_terms[1]}"
         f"{' ✅' if closing == closing_calc else f' (calc {closing_calc})'}"
         f"</p>"
     )
+    cards = [
+        _CARD_TMPL(label="Opening backlog", value=opening),
+        _CARD_TMPL(label="Created (in window)", value=created),
+        _CARD_TMPL(label="Resolved (in window)", value=resolved),
+        _CARD_TMPL(label="Open (at end)", value=closing),
+    ]
+    if reopened is not None:
+        cards.insert(3, _CARD_TMPL(label="Reopened (in window)", value=reopened))
 
-    html = f"""
-    <html><body style="font-family:Arial,Helvetica,sans-serif">
-      <h2>Jira Report — Project {project_key} — {window_label}</h2>
-      <div style="display:flex;gap:16px;margin:10px 0;flex-wrap:wrap;">
-        <div style="padding:12px;border:1px solid #ddd;border-radius:8px;">
-          <b>Opening backlog</b><div style="font-size:28px;">{opening}</div>
-        </div>
-        <div style="padding:12px;border:1px solid #ddd;border-radius:8px;">
-          <b>Created (in window)</b><div style="font-size:28px;">{created}</div>
-        </div>
-        <div style="padding:12px;border:1px solid #ddd;border-radius:8px;">
-          <b>Resolved (in window)</b><div style="font-size:28px;">{resolved}</div>
-        </div>
-        <div style="padding:12px;border:1px solid #ddd;border-radius:8px;">
-          <b>Open (at end)</b><div style="font-size:28px;">{closing}</div>
-        </div>
-      </div>
-      {identity_line}
-      {_table(rows_in_window[:show_top_n], f"Top {min(len(rows_in_window), show_top_n)} issues matched in this window")}
-      <p style="color:#777;margin-top:16px;">Resolved = resolution set in window; Open(at end) = still open at the end of the selected window.</p>
-    </body></html>
-    """
+    html = _PAGE_TMPL(
+        heading=_esc(f"Jira Report — Project {project_key} — {window_label}"),
+        notice=_DEGRADED_TMPL(reason=_esc(degraded)) if degraded else "",
+        cards="".join(cards),
+        identity_line=identity_line,
+        flow=_flow_html(flow),
+        table=_COUNT_ONLY_NOTE if count_only else _table(
+            rows_in_window[:show_top_n],
+            f"Top {min(len(rows_in_window), show_top_n)} issues matched in this window",
+            base_url,
+        ),
+        footer="Resolved = resolution set in window; Open(at end) = still open at the end of the selected window.",
+    )
+
+    msg = MIMEMultipart("mixed")
+    msg["Subject"] = f"{'[Partial] ' if degraded else ''}Jira Report — {project_key} — {window_label}"
+    msg["From"] = EMAIL_FROM
+    msg["To"] = to_email
+    alt = MIMEMultipart("alternative")
+    alt.attach(MIMEText(html, "html"))
+    msg.attach(alt)
+
+    if include_csv and not count_only:
+        csv_bytes = _csv_bytes(rows_in_window)
+        csv_name = f"{project_key}_report_{window_label.replace(' ', '_').replace('/', '-')}.csv"
+        part = MIMEApplication(csv_bytes, Name=csv_name)
+        part["Content-Disposition"] = f'attachment; filename="{csv_name}"'
+        msg.attach(part)
 
-    csv_bytes = _csv_bytes(rows_in_window)
-    csv_name = f"{project_key}_report_{window_label.replace(' ', '_').replace('/', '-')}.csv"
+    return msg
+
+
+def build_no_data_message(to_email: str, project_key: str, window_label: str, reason: str) -> MIMEMultipart:
+    """Notice for a report the run deadline left without any data, so the lead is not left guessing."""
+    html = _PAGE_TMPL(
+        heading=_esc(f"Jira Report — Project {project_key} — {window_label}"),
+        notice=_DEGRADED_TMPL(reason=_esc(reason)),
+        cards="",
+        identity_line="",
+        flow="",
+        table="<p>Neither the issue list nor the headline counts could be fetched before the run deadline.</p>",
+        footer="",
+    )
+    msg = MIMEMultipart("mixed")
+    msg["Subject"] = f"[Partial] no data — Jira Report — {project_key} — {window_label}"
+    msg["From"] = EMAIL_FROM
+    msg["To"] = to_email
+    alt = MIMEMultipart("alternative")
+    alt.attach(MIMEText(html, "html"))
+    msg.attach(alt)
+    return msg
+
+
+def build_assignee_message(to_email: str, assignee_name: str, project_key: str, window_label: str,
+                           rows: List[dict], counts: Dict[str, int], show_top_n: int = 20,
+                           base_url: Optional[str] = None) -> MIMEMultipart:
+    """Mini report for one assignee: their created / resolved / still-open issues in the window."""
+    html = _PAGE_TMPL(
+        heading=_esc(f"Your Jira Issues — {assignee_name} — Project {project_key} — {window_label}"),
+        notice="",
+        cards="".join([
+            _CARD_TMPL(label="Created (in window)", value=counts.get("created", 0)),
+            _CARD_TMPL(label="Resolved (in window)", value=counts.get("resolved", 0)),
+            _CARD_TMPL(label="Still open (at end)", value=counts.get("open", 0)),
+        ]),
+        identity_line="",
+        flow="",
+        table=_table(rows[:show_top_n], f"Top {min(len(rows), show_top_n)} of your issues in this window", base_url),
+        footer="You receive this because issues assigned to you matched the report window.",
+    )
 
     msg = MIMEMultipart("mixed")
-    msg["Subject"] = f"Jira Report — {project_key} — {window_label}"
+    msg["Subject"] = f"Your Jira Issues — {project_key} — {window_label}"
     msg["From"] = EMAIL_FROM
     msg["To"] = to_email
     alt = MIMEMultipart("alternative")
     alt.attach(MIMEText(html, "html"))
     msg.attach(alt)
+    return msg
 
-    part = MIMEApplication(csv_bytes, Name=csv_name)
-    part["Content-Disposition"] = f'attachment; filename="{csv_name}"'
-    msg.attach(part)
 
+@contextmanager
+def smtp_session() -> Iterator[smtplib.SMTP]:
+    """Open one authenticated SMTP connection that callers can reuse for several messages."""
     with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30) as server:
         server.ehlo()
         server.starttls()
         server.login(SMTP_USERNAME, SMTP_PASSWORD)
+        yield server
+
+
+def send_report(to_email: str, project_key: str, window_label: str,
+                rows: List[dict], counts: Dict[str, int], show_top_n: int = 20):
+    msg = build_report_message(to_email, project_key, window_label, rows, counts, show_top_n=show_top_n)
+    with smtp_session() as server:
         server.sendmail(EMAIL_FROM, [to_email], msg.as_string())
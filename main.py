@@ -1,150 +1,947 @@
 # main.py
+import argparse
+import functools
+import hashlib
 import json
 import os
-from typing import Tuple, Optional
-from datetime import datetime, timedelta, date
+import signal
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Set, Tuple, Optional
+from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from jira import JiraClient
-from report import tag_issues
-from mailer import send_report
+from jira import DeadlineExceeded, JiraClient, JqlExpr, UnsupportedJql, WANTED_FIELDS, jql_fields, local_filter, narrows_only
+from jira_async import AsyncBackedJiraClient
+from issuestore import ChangelogCache, IssueStore
+from windows import windows_from_config
+from planner import ExecutionPlan, PlannedReport, normalize_jql
+from report import flow_metrics, tag_issues, group_by_assignee, in_window_union
+from mailer import EMAIL_FROM, build_assignee_message, build_no_data_message, build_report_message
+from spool import Spool, smtp_sender
+from metrics import RUN, RunMetrics, peak_rss_bytes
+from profiling import PROFILE_DIR, profiling_run, project_profiler
+from history import RunHistory, lpt_assign, lpt_order
+from shard import SHARD_STRATEGY, ShardResults, parse_shard, select_shard, select_shard_lpt, shard_unit
+from runstate import RunState, STAGE_DELIVERED, STAGE_RENDERED, config_hash, project_id
 
 CONFIG_PATH = os.getenv("CONFIG_PATH", "config.json")
+# How long the run keeps retrying failed deliveries before leaving them in the spool.
+SPOOL_DRAIN_SECONDS = float(os.getenv("SPOOL_DRAIN_SECONDS", "120"))
+# HTTP engine for Jira calls: "requests" (blocking session + thread pools) or "asyncio" (jira_async).
+JIRA_ENGINE = os.getenv("JIRA_ENGINE", "requests")
+# Parallel report workers per site (reports that share one fetch always stay on one worker).
+RUN_WORKERS = int(os.getenv("RUN_WORKERS", "1"))
+# Run deadline: "HH:MM" in timezone_label (or an ISO datetime) and/or a budget in seconds.
+RUN_DEADLINE = os.getenv("RUN_DEADLINE", "")
+RUN_BUDGET_SECONDS = float(os.getenv("RUN_BUDGET_SECONDS", "0"))
+# Kept free before the deadline for SMTP delivery: no Jira request starts after deadline - reserve.
+DEADLINE_RESERVE_SECONDS = float(os.getenv("DEADLINE_RESERVE_SECONDS", "120"))
+# Name of the implicit site built from JIRA_BASE_URL / JIRA_EMAIL / JIRA_API_TOKEN when config has no "sites".
+DEFAULT_SITE = "default"
 
 
-def _today_in_tz(tz_label: str) -> date:
-    try:
-        tz = ZoneInfo(tz_label)
-        return datetime.now(tz).date()
-    except Exception:
-        return date.today()
+class RunContext:
+    """Everything a project needs from the surrounding run (config, window, shared resources)."""
+
+    def __init__(self, cfg: dict, *, mode: str, start: Optional[str], end: Optional[str],
+                 interval: Optional[str], window_label: str, windows: Optional[List[tuple]] = None):
+        report_cfg = cfg["report"]
+        self.cfg = cfg
+        self.mode = mode
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.window_label = window_label
+        # (mode, start, end, interval, label) per report window; the fields above describe
+        # the fetch window, which is the widest of them when there are several.
+        self.windows = windows or [(mode, start, end, interval, window_label)]
+        self.global_extra = (cfg.get("global_jql_extra") or "").strip()
+        self.show_top_n = int(report_cfg.get("show_top_n", 20))
+        self.fanout = report_cfg.get("assignee_fanout") or {}
+        self.include_csv = bool(report_cfg.get("include_csv_attachment", True))
+        # Nothing but the four headline numbers would be shown -> skip downloading issues.
+        self.count_only = bool(report_cfg.get("count_only")) or (self.show_top_n <= 0 and not self.include_csv)
+        self.profile_dir: Optional[str] = None
+        self.metrics = RunMetrics()
+        self.engine = JIRA_ENGINE
+        self.sites = _sites_from_config(cfg)
+        self.default_site = cfg.get("default_site") or (next(iter(self.sites)) if len(self.sites) == 1 else None)
+        # One client (connection pool, rate limit, concurrency cap) per site in use.
+        self.clients: Dict[str, JiraClient] = {}
+        # Per-site clients for the count fallback of degraded reports (see _fallback_client).
+        self.fallback_clients: Dict[str, JiraClient] = {}
+        self._fallback_lock = threading.Lock()
+        self.spool: Optional[Spool] = None
+        self.state: Optional[RunState] = None
+        self.store = IssueStore()
+        # Optional changelog stage: reopen-aware counts, cycle time and time in status.
+        self.changelog = report_cfg.get("changelog") or {}
+        self.changelog_cache = ChangelogCache()
+        self.plan: Optional[ExecutionPlan] = None
+        # (query key, name) -> result shared by every consumer of that query
+        self.results: Dict[Tuple[str, str], Any] = {}
+        self.remaining: Dict[str, int] = {}
+        # Set by --shard: per-report results for the merge step.
+        self.shard_results: Optional[ShardResults] = None
+        self.workers = RUN_WORKERS
+        self.history = RunHistory()
+        self.costs: Dict[str, float] = {}
+        self.tz_label = report_cfg.get("timezone_label", "Europe/Berlin")
+        # Epoch seconds the run must finish by (None: no deadline).
+        self.deadline: Optional[float] = None
+        self.degraded: Dict[str, str] = {}
+        # Set by a long-running process (daemon.py); None for one-shot runs.
+        self.resources: Optional[WarmResources] = None
 
 
-def _prev_calendar_week_window(tz_label: str) -> Tuple[str, str, str]:
+class WarmResources:
     """
-    Previous ISO calendar week (Mon..Sun) in tz_label.
-    Returns (start, end, label).
+    What a long-running process keeps between runs: Jira clients (and their connection
+    pools) per site, the SMTP session, the issue store, the changelog cache and the run
+    history. One-shot runs build fresh ones and close them at the end.
     """
-    today = _today_in_tz(tz_label)
-    this_monday = today - timedelta(days=today.weekday())  # Monday of this week
-    last_monday = this_monday - timedelta(days=7)
-    last_sunday = last_monday + timedelta(days=6)
-    return last_monday.isoformat(), last_sunday.isoformat(), f"{last_monday} to {last_sunday} (last_week)"
 
+    def __init__(self):
+        self.clients: Dict[Tuple[str, str, str], JiraClient] = {}
+        self.store = IssueStore()
+        self.changelog_cache = ChangelogCache()
+        self.history = RunHistory()
+        self.sender = None
+        self.last_metrics: Optional[RunMetrics] = None
+
+    def client(self, engine: str, name: str, site: dict) -> JiraClient:
+        # An edited site entry gets a new client; the old one stays until close().
+        key = (engine, name, json.dumps(site, sort_keys=True))
+        if key not in self.clients:
+            self.clients[key] = _make_client(engine, site)
+        return self.clients[key]
+
+    def smtp(self, batch_size: int):
+        if self.sender is None:
+            self.sender = smtp_sender(batch_size=batch_size)
+        return self.sender
 
-def _last_7_days_up_to_yesterday(tz_label: str) -> Tuple[str, str, str]:
+    def close(self) -> None:
+        for jc in self.clients.values():
+            jc.close()
+        self.clients.clear()
+        if self.sender is not None:
+            self.sender.close()
+            self.sender = None
+        self.changelog_cache.save()
+
+
+def _sites_from_config(cfg: dict) -> Dict[str, dict]:
     """
-    A 7-day window ending yesterday in tz_label.
-    If today is Monday, this becomes Mon-1..Sun-1 (the previous full week by days, not ISO).
+    ``sites`` maps a name to {base_url, email_env, token_env, concurrency, rate_limit}.
+    Credentials stay in the environment: email_env/token_env name the variables to read
+    (default JIRA_EMAIL / JIRA_API_TOKEN). Without ``sites`` there is one implicit site.
     """
-    today = _today_in_tz(tz_label)
-    end = today - timedelta(days=1)       # yesterday
-    start = end - timedelta(days=6)       # 7 days inclusive
-    return start.isoformat(), end.isoformat(), f"{start} to {end} (last_7_days)"
+    sites = cfg.get("sites") or {DEFAULT_SITE: {}}
+    for name, site in sites.items():
+        if name != DEFAULT_SITE and not site.get("base_url"):
+            raise ValueError(f"Site {name!r} has no base_url")
+    return sites
+
+
+def _site_of(ctx: "RunContext", p: dict) -> str:
+    name = p.get("site") or ctx.default_site
+    if name not in ctx.sites:
+        raise ValueError(f"Project {p['key']}: unknown site {name!r} (sites: {', '.join(ctx.sites)})")
+    return name
 
 
-def _rolling_days_window(tz_label: str, days: int) -> Tuple[str, str, str, str]:
-    if days < 1:
-        days = 1
-    today = _today_in_tz(tz_label)
-    start = (today - timedelta(days=days)).isoformat()
-    end = (today - timedelta(days=1)).isoformat()
-    label = f"Last {days} days ({start} to {end})"
-    interval = f"{days}d"
-    return start, end, label, interval
+def _make_client(engine: str, site: Optional[dict] = None) -> JiraClient:
+    if engine not in ("requests", "asyncio"):
+        raise ValueError(f"Unknown Jira engine: {engine!r} (use requests or asyncio)")
+    cls = AsyncBackedJiraClient if engine == "asyncio" else JiraClient
+    if not site:
+        return cls()
+    kw: Dict[str, Any] = {}
+    if site.get("concurrency"):
+        kw["fetch_concurrency"] = int(site["concurrency"])
+    if site.get("rate_limit"):
+        kw["rate_limit"] = float(site["rate_limit"])
+    return cls(site.get("base_url"), os.getenv(site.get("email_env") or "JIRA_EMAIL"),
+               os.getenv(site.get("token_env") or "JIRA_API_TOKEN"), **kw)
 
 
-def _window_from_config(cfg: dict) -> Tuple[str, Optional[str], Optional[str], Optional[str], str]:
+def _open_clients(ctx: "RunContext", plan: ExecutionPlan) -> None:
+    for name in sorted({r.site for r in plan.reports.values()}):
+        if name in ctx.clients:
+            pass
+        elif ctx.resources is not None:
+            ctx.clients[name] = jc = ctx.resources.client(ctx.engine, name, ctx.sites[name])
+            jc.http_stats.reset()
+        else:
+            ctx.clients[name] = _make_client(ctx.engine, ctx.sites[name])
+        ctx.clients[name].deadline = None if ctx.deadline is None else ctx.deadline - DEADLINE_RESERVE_SECONDS
+
+
+def _fallback_client(ctx: "RunContext", site: str) -> JiraClient:
+    """
+    Client for the count fallback of a degraded report. The regular clients stop at
+    deadline - reserve; this one may spend the reserve, up to the deadline itself, so a
+    report that ran out of time still gets its four count queries.
     """
-    Returns (mode, start, end, interval, label).
+    with ctx._fallback_lock:
+        if site not in ctx.fallback_clients:
+            jc = _make_client(ctx.engine, ctx.sites[site])
+            jc.deadline = ctx.deadline
+            ctx.fallback_clients[site] = jc
+        return ctx.fallback_clients[site]
 
-    Modes:
-      - custom_range: uses explicit start/end
-      - last_week:
-          * If today is Monday in tz -> last 7 days (Mon-1 .. Sun-1)
-          * Else -> previous calendar week (Mon..Sun)
-      - rolling_days: uses interval like '7d' and computes start/end for display
+
+def _run_deadline(at: Optional[str], budget: Optional[float], tz_label: str,
+                  now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Epoch seconds of the run deadline: the earlier of ``at`` ("HH:MM" today in
+    ``tz_label``, or an ISO datetime) and now + ``budget`` seconds. A clock-time deadline
+    that already passed when the run starts (a manual re-run later in the day) is ignored.
     """
-    w = cfg["report"]["window"]
-    tz_label = cfg["report"].get("timezone_label", "Europe/Berlin")
-    mode = w.get("mode", "custom_range")
+    tz = ZoneInfo(tz_label)
+    now = now or datetime.now(tz)
+    candidates = [now.timestamp() + float(budget)] if budget else []
+    if at:
+        if len(at) <= 5:
+            h, m = (int(x) for x in at.split(":"))
+            t = now.astimezone(tz).replace(hour=h, minute=m, second=0, microsecond=0)
+        else:
+            t = datetime.fromisoformat(at)
+            t = t if t.tzinfo else t.replace(tzinfo=tz)
+        if t > now:
+            candidates.append(t.timestamp())
+        else:
+            print(f"Deadline {at} had already passed when the run started; ignored")
+    return min(candidates) if candidates else None
+
+
+def _degrade_reason(ctx: "RunContext", report: PlannedReport) -> Optional[str]:
+    """Why this report must be cut down to make the deadline, or None if it still fits."""
+    if ctx.deadline is None or report.query.count_only:
+        return None
+    left = ctx.deadline - DEADLINE_RESERVE_SECONDS - time.time()
+    need = ctx.costs.get(shard_unit(report.project), 0.0)
+    if left > need:
+        return None
+    at = datetime.fromtimestamp(ctx.deadline, ZoneInfo(ctx.tz_label)).strftime("%H:%M")
+    return (f"the run had to finish by {at} and {max(0, left):.0f}s were left for Jira "
+            f"(this project usually takes {need:.0f}s)")
+
+
+def _site_base_url(ctx: "RunContext", report: PlannedReport) -> Optional[str]:
+    """Issue links in emails point at the project's own site."""
+    return ctx.sites[report.site].get("base_url")
+
+
+def _spool_id(key: str, *parts: str) -> str:
+    return f"{key}-" + hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def _report_spool_id(report: PlannedReport, *parts: str) -> str:
+    """
+    Spool id of one of the report's emails. The report id keeps filter variants for one
+    lead apart, the site the same key on two sites (which run in parallel threads).
+    """
+    return _spool_id(report.project["key"], report.site, report.pid, report.window[4], *parts)
+
+
+def _spool_assignee_reports(ctx: RunContext, report: PlannedReport, rows: list,
+                            base_url: Optional[str] = None) -> List[str]:
+    """Fan the already tagged rows out into one mini report per assignee (no extra Jira calls)."""
+    key, window_label = report.project["key"], report.window[4]
+    emails = ctx.fanout.get("emails") or {}
+    groups = group_by_assignee(rows)
+    ids: List[str] = []
+    for ident, g in groups.items():
+        # Jira Cloud often hides emailAddress; config can map accountId or display name -> email.
+        to = emails.get(g["account_id"]) or emails.get(g["name"]) or g["email"]
+        if not to:
+            print(f"  Fan-out: no email for assignee {g['name']!r}, skipped")
+            continue
+        msg = build_assignee_message(to, g["name"], key, window_label, g["rows"], g["counts"],
+                                     show_top_n=ctx.show_top_n, base_url=base_url)
+        sid = _report_spool_id(report, "assignee", ident, to)
+        ids.append(ctx.spool.put(msg, EMAIL_FROM, [to], ident=sid))
+    print(f"  Fan-out: spooled {len(ids)} assignee report(s) from {len(groups)} assignee(s)")
+    return ids
+
 
-    if mode == "custom_range":
-        start = w["start"]
-        end = w["end"]
-        return mode, start, end, None, f"{start} to {end}"
+def _project_jql(ctx: RunContext, p: dict) -> Tuple[str, str]:
+    """Build ONE union JQL (mode-aware). Returns (jql, branch label)."""
+    key = p["key"]
+    extra = _project_extra(ctx, p)
 
-    if mode == "last_week":
-        today = _today_in_tz(tz_label)
-        if today.weekday() == 0:  # Monday
-            start, end, label = _last_7_days_up_to_yesterday(tz_label)
-            # Clarify in label that Monday logic used
-            label = f"{start} to {end} (last_week via last_7_days)"
+    if ctx.mode == "rolling_days":
+        if not ctx.interval:
+            raise ValueError("rolling_days selected but no interval computed.")
+        # interval + end are BOTH required here (end used for snapshot)
+        jql = JiraClient.build_jql_union_window(key, interval=ctx.interval, end=ctx.end, extra_filters=extra)
+        return jql, "union: interval+end"
+    # custom_range / last_week: use explicit start & end
+    if not (ctx.start and ctx.end):
+        raise ValueError(f"{ctx.mode} selected but start/end not available.")
+    jql = JiraClient.build_jql_union_window(key, start=ctx.start, end=ctx.end, extra_filters=extra, simplified=True)
+    return jql, "union: start+end (simplified)"
+
+
+def _project_extra(ctx: RunContext, p: dict) -> str:
+    project_extra = (p.get("jql_extra") or "").strip()
+    return " ".join(x for x in [ctx.global_extra, project_extra] if x).strip()
+
+
+def _query_scope(ctx: RunContext, p: dict, site: str) -> str:
+    """What a project's union query fetches, minus the window: site, project and filters."""
+    return f"{site}: {p['key'].upper()} [{normalize_jql(_project_extra(ctx, p))}]"
+
+
+def _is_count_only(ctx: RunContext, p: dict) -> bool:
+    return bool(p.get("count_only", ctx.count_only))
+
+
+def _local_variant_filters(ctx: RunContext, variants: List[dict]) -> Optional[Dict[str, Optional[JqlExpr]]]:
+    """
+    A key listed several times with different ``jql_extra`` filters is fetched once
+    (union + global extra) and each variant is filtered locally. Returns None when a
+    filter is outside the local evaluator's JQL subset (variants then query separately).
+    """
+    try:
+        if not narrows_only(ctx.global_extra):
+            raise UnsupportedJql("global_jql_extra contains a top-level OR")
+        return {project_id(p): local_filter(p.get("jql_extra") or "") for p in variants}
+    except UnsupportedJql as e:
+        print(f"Project {variants[0]['key']}: {len(variants)} variants queried separately ({e})")
+        return None
+
+
+def _build_plan(ctx: RunContext, pending: List[Tuple[dict, tuple, str]]) -> ExecutionPlan:
+    """Map every pending report to its server query; identical queries collapse into one fetch."""
+    selected = list({project_id(p): p for p, _, _ in pending}.values())
+    by_key: Dict[Tuple[str, str], List[dict]] = {}
+    for p in selected:
+        if not _is_count_only(ctx, p):
+            by_key.setdefault((_site_of(ctx, p), p["key"]), []).append(p)
+    # (site, key) -> (superset jql, fields, per-variant filters) for keys served by local filtering
+    supersets: Dict[Tuple[str, str], Tuple[str, str, Dict[str, Optional[JqlExpr]]]] = {}
+    for key, variants in by_key.items():
+        if len({_project_extra(ctx, p) for p in variants}) < 2:
+            continue
+        filters = _local_variant_filters(ctx, variants)
+        if filters is None:
+            continue
+        fields = WANTED_FIELDS.split(",")
+        for expr in filters.values():
+            if expr is not None:
+                fields.extend(f for f in jql_fields(expr) if f not in fields)
+        supersets[key] = (_project_jql(ctx, {**variants[0], "jql_extra": ""})[0], ",".join(fields), filters)
+
+    plan = ExecutionPlan()
+    for p, window, rid in pending:
+        pid, site = project_id(p), _site_of(ctx, p)
+        if _is_count_only(ctx, p):
+            jqls = JiraClient.build_jql_count_terms(p["key"], start=window[1], end=window[2],
+                                                    extra_filters=_project_extra(ctx, p))
+            plan.add(rid, p, "", "", count_jqls=jqls, window=window, site=site)
+        elif (site, p["key"]) in supersets:
+            jql, fields, filters = supersets[(site, p["key"])]
+            plan.add(rid, p, jql, fields, local_filter=filters[pid], window=window, site=site,
+                     scope=_query_scope(ctx, {**p, "jql_extra": ""}, site))
         else:
-            start, end, label = _prev_calendar_week_window(tz_label)
-        return mode, start, end, None, label
+            # Every window of a project shares the fetch over the widest window.
+            plan.add(rid, p, _project_jql(ctx, p)[0], WANTED_FIELDS, window=window, site=site,
+                     scope=_query_scope(ctx, p, site))
+    return plan
 
-    if mode == "rolling_days":
-        days = int(w.get("rolling_days", 7))
-        start, end, label, interval = _rolling_days_window(tz_label, days)
-        return mode, start, end, interval, label
 
-    raise ValueError(f"Unsupported window mode: {mode}")
+def _estimate_plan(ctx: RunContext, plan: ExecutionPlan) -> None:
+    """Dry run: one approximate count per distinct issue query gives strategy and request count."""
+    for q in plan.queries.values():
+        if q.count_only:
+            q.expected_requests = len(q.count_jqls)
+            continue
+        jc = ctx.clients[q.site]
+        q.fetch_plan = jc.plan_fetch(q.jql, fields=q.fields)
+        expected = jc.expected_requests(q.fetch_plan, q.fields)
+        # +1 for the approximate count the real run makes before fetching.
+        q.expected_requests = None if expected is None else expected + 1
 
 
-def run():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        cfg = json.load(f)
+def _shared(ctx: RunContext, report: PlannedReport, name: str, compute):
+    """Compute a per-query result once and reuse it for every consumer of that query."""
+    if len(report.query.consumers) < 2:
+        return compute()
+    k = (report.query.key, name)
+    if k not in ctx.results:
+        ctx.results[k] = compute()
+    return ctx.results[k]
 
-    mode, start, end, interval, window_label = _window_from_config(cfg)
-    projects = cfg.get("projects", [])
-    global_extra = (cfg.get("global_jql_extra") or "").strip()
 
-    print(f"Window mode: {mode} | start={start} | end={end} | interval={interval} | label={window_label}")
+def _release(ctx: RunContext, report: PlannedReport) -> None:
+    """Drop shared data once the query's last consumer has run."""
+    q = report.query
+    ctx.remaining[q.key] = ctx.remaining.get(q.key, len(q.consumers)) - 1
+    if ctx.remaining[q.key] <= 0:
+        if ctx.resources is None:
+            # A warm store (daemon) keeps its entries for the next run; the TTL evicts them.
+            ctx.store.discard(q.jql, key=q.key)
+        for k in [k for k in list(ctx.results) if k[0] == q.key]:
+            del ctx.results[k]
+
+
+def _schedule(ctx: RunContext,
+              plan: ExecutionPlan) -> Tuple[Dict[str, List[List[PlannedReport]]], Dict[str, float], Optional[float]]:
+    """
+    Group reports by query (consumers of one fetch stay together), order each site's
+    groups largest predicted cost first and predict the makespan over ``ctx.workers``.
+    Returns ({site: [group, ...]}, {unit: predicted seconds}, predicted makespan or
+    None without any history).
+    """
+    groups: Dict[str, List[PlannedReport]] = {}
+    for report in plan.reports.values():
+        groups.setdefault(report.query.key, []).append(report)
+    unit_of = {qk: shard_unit(g[0].project) for qk, g in groups.items()}
+    costs = ctx.history.costs(list(dict.fromkeys(unit_of.values())))
+    # History holds a unit's total time; filter variants that query separately split it.
+    n_groups = Counter(unit_of.values())
+    group_costs = {qk: costs[u] / n_groups[u] for qk, u in unit_of.items()}
+    by_site: Dict[str, List[str]] = {}
+    for qk, g in groups.items():
+        by_site.setdefault(g[0].site, []).append(qk)
+    ordered: Dict[str, List[List[PlannedReport]]] = {}
+    predicted = 0.0
+    for site, qks in by_site.items():
+        ordered[site] = [groups[qk] for qk in lpt_order(qks, group_costs)]
+        predicted = max(predicted, lpt_assign(qks, group_costs, ctx.workers)[1])
+    if not any(ctx.history.predict(u) is not None for u in costs):
+        return ordered, {}, None
+    return ordered, costs, predicted
 
-    jc = JiraClient()
-
-    for p in projects:
-        key = p["key"]
-        lead_email = p["lead_email"]
-        project_extra = (p.get("jql_extra") or "").strip()
-        extra = " ".join(x for x in [global_extra, project_extra] if x).strip()
-
-        # Build ONE union JQL (mode-aware)
-        if mode == "rolling_days":
-            if not interval:
-                raise ValueError("rolling_days selected but no interval computed.")
-            # interval + end are BOTH required here (end used for snapshot)
-            jql = JiraClient.build_jql_union_window(key, interval=interval, end=end, extra_filters=extra)
-            branch = "union: interval+end"
+
+def _record_history(ctx: RunContext, unit_seconds: Dict[str, float], unit_pids: Dict[str, List[str]]) -> None:
+    projects = ctx.metrics.summary()["projects"]
+    for unit, seconds in unit_seconds.items():
+        stages: Counter = Counter()
+        issues = None
+        for pid in unit_pids[unit]:
+            m = projects.get(pid, {})
+            stages.update({k: v for k, v in m.get("stages", {}).items() if k in ("fetch", "changelog", "render")})
+            if "issues" in m.get("counters", {}):
+                issues = (issues or 0) + m["counters"]["issues"]
+        ctx.history.record(unit, seconds, dict(stages), issues)
+    ctx.history.save()
+
+
+def _run_project_counts(ctx: RunContext, report: PlannedReport, degraded: Optional[str] = None) -> List[str]:
+    """
+    Count-only fast path: four server-side count queries instead of downloading the union.
+    ``degraded`` runs it for a full report that ran out of time (its own window and filters).
+    """
+    p = report.project
+    key, mkey = p["key"], report.pid
+    lead_email = p["lead_email"]
+    window_label = report.window[4]
+    jc = _fallback_client(ctx, report.site) if degraded and ctx.deadline is not None else ctx.clients[report.site]
+    print(f"\nProject {key} — Window {window_label}  [count-only{', degraded' if degraded else ''}]")
+    with ctx.metrics.stage(mkey, "count"):
+        if degraded:
+            jqls = JiraClient.build_jql_count_terms(key, start=report.window[1], end=report.window[2],
+                                                    extra_filters=_project_extra(ctx, p))
+            counts = dict(jc.get_counts(jqls))
         else:
-            # custom_range / last_week: use explicit start & end
-            if not (start and end):
-                raise ValueError(f"{mode} selected but start/end not available.")
-            jql = JiraClient.build_jql_union_window(key, start=start, end=end, extra_filters=extra)
-            branch = "union: start+end"
+            jqls = report.query.count_jqls
+            counts = dict(_shared(ctx, report, "counts", lambda: jc.get_counts(jqls)))
+    counts["closing_calc"] = counts["open_start"] + counts["created"] - counts["resolved"]
+    ctx.metrics.add(mkey, "count_queries", len(jqls))
+    if ctx.shard_results:
+        ctx.shard_results.record(report.pid, p, window_label, counts, [], count_only=True, degraded=degraded)
+    print(f"Counts — created={counts['created']} resolved={counts['resolved']} open@end={counts['open']}")
+
+    with ctx.metrics.stage(mkey, "render"):
+        msg = build_report_message(lead_email, key, window_label, [], counts, show_top_n=0,
+                                   include_csv=False, count_only=True, base_url=_site_base_url(ctx, report),
+                                   degraded=degraded)
+    ident = _report_spool_id(report)
+    with ctx.metrics.stage(mkey, "spool"):
+        ctx.spool.put(msg, EMAIL_FROM, [lead_email], ident=ident)
+    print(f"Spooled report {ident} for {lead_email}")
+    if ctx.fanout.get("enabled"):
+        print("  Fan-out: skipped in count-only mode (no issue rows)")
+    return [ident]
+
 
-        print(f"\nProject {key} — Window {window_label}  [{branch}]")
-        print("JQL (union):\n", jql)
+def _fetch_report_issues(ctx: RunContext, report: PlannedReport, stale: Optional[List[dict]] = None) -> List[dict]:
+    q, jc = report.query, ctx.clients[report.site]
+    if stale is not None:
+        return stale if report.local_filter is None else IssueStore.filter(stale, report.local_filter)
+    # Every fetch goes through the store: shared by the query's consumers, and the
+    # newest copy per scope is the deadline fallback of a later run.
+    superset = ctx.store.fetch(q.jql, q.fields, jc.get_issues, key=q.key, scope=q.scope)
+    if report.local_filter is None:
+        return superset
+    issues = IssueStore.filter(superset, report.local_filter)
+    print(f"Local filter {report.local_filter}: {len(issues)} of {len(superset)} issues")
+    return issues
 
-        issues = jc.get_issues(jql)
-        print(f"Fetched {len(issues)} issues (union)")
 
-        tagged = tag_issues(issues, start, end)
-        rows = tagged["rows"]
-        counts = tagged["counts"]
-        print(f"Counts — created={counts['created']} resolved={counts['resolved']} open@end={counts['open']}")
-        print(f"Total unique issues in union: {len(rows)}")
+def _flow_for_rows(ctx: RunContext, jc: JiraClient, issues: List[dict], rows: List[dict], start: str,
+                   end: str) -> dict:
+    """Fetch status/resolution changelogs for the report's rows and compute flow metrics."""
+    wanted = {r["key"] for r in rows}
+    histories = jc.get_changelogs([i for i in issues if i.get("key") in wanted], cache=ctx.changelog_cache)
+    flow = flow_metrics(rows, histories, start, end,
+                        in_progress_statuses=ctx.changelog.get("in_progress_statuses") or ("In Progress",))
+    c = flow["counts"]
+    print(f"Changelog: {len(histories)} histories, reopened={c['reopened']}, "
+          f"cycle median={flow['cycle_time_days']['median']} d")
+    return flow
 
-        send_report(
+
+def _run_report(ctx: RunContext, report: PlannedReport, degraded: Optional[str] = None) -> List[str]:
+    """
+    Run one report within the deadline. A report that no longer fits is built from
+    cached issues if a copy exists, otherwise from the four count queries; a full run
+    cut off by the deadline falls back to counts too, and past the deadline itself to a
+    no-data notice. Degraded emails say so.
+    """
+    if degraded is None:
+        try:
+            return _run_project(ctx, report)
+        except DeadlineExceeded as e:
+            degraded = f"Jira did not answer before the run deadline ({e})"
+    key, mkey = report.project["key"], report.pid
+    ctx.degraded[report.pid] = degraded
+    ctx.metrics.set(mkey, "degraded", 1)
+    print(f"Project {key}: degraded, {degraded}")
+    q = report.query
+    cached = ctx.store.latest(q.scope, q.fields) if q.scope else None
+    if cached is not None:
+        issues, fetched_at = cached
+        _, start, end, _, _ = report.window
+        if start and end:
+            # The copy may be from another window; keep what this window's union would return.
+            issues = IssueStore.filter(issues, JiraClient.window_expr(start=start, end=end))
+        at = datetime.fromtimestamp(fetched_at, ZoneInfo(ctx.tz_label)).strftime("%Y-%m-%d %H:%M")
+        return _run_project(ctx, report, stale=issues, degraded=f"{degraded}; issue data cached at {at}")
+    try:
+        return _run_project_counts(ctx, report, degraded=f"{degraded}; headline counts only")
+    except DeadlineExceeded as e:
+        return _run_project_no_data(ctx, report, f"{degraded}; not even the headline counts could be fetched ({e})")
+
+
+def _run_project_no_data(ctx: RunContext, report: PlannedReport, degraded: str) -> List[str]:
+    """Last resort of a degraded report: tell the lead it has no data this time instead of sending nothing."""
+    p, key = report.project, report.project["key"]
+    if ctx.shard_results:
+        ctx.shard_results.record(report.pid, p, report.window[4], {}, [], count_only=True, degraded=degraded)
+    msg = build_no_data_message(p["lead_email"], key, report.window[4], degraded)
+    ident = _report_spool_id(report)
+    ctx.spool.put(msg, EMAIL_FROM, [p["lead_email"]], ident=ident)
+    print(f"Spooled no-data notice {ident} for {p['lead_email']}")
+    return [ident]
+
+
+def _run_project(ctx: RunContext, report: PlannedReport, stale: Optional[List[dict]] = None,
+                 degraded: Optional[str] = None) -> List[str]:
+    """
+    Fetch, tag, render and spool one project. Returns the spool ids it produced.
+    ``stale`` issues (with a ``degraded`` reason) replace the fetch and skip the changelog stage.
+    """
+    if report.query.count_only:
+        return _run_project_counts(ctx, report)
+    p = report.project
+    key, mkey = p["key"], report.pid
+    lead_email = p["lead_email"]
+    _, start, end, _, window_label = report.window
+    jc, metrics = ctx.clients[report.site], ctx.metrics
+
+    branch = "union"
+    if len(report.query.consumers) > 1:
+        branch += f", shared by {len(report.query.consumers)} reports"
+    if report.local_filter is not None:
+        branch += ", local filter"
+    print(f"\nProject {key} — Window {window_label}  [{branch}]")
+    print("JQL (union):\n", report.query.jql)
+
+    pages0, bytes0, plans0 = jc.pages, jc.bytes_received, len(jc.plan_log)
+    with metrics.stage(mkey, "fetch"):
+        issues = _fetch_report_issues(ctx, report, stale)
+    metrics.add(mkey, "pages", jc.pages - pages0)
+    metrics.add(mkey, "bytes_received", jc.bytes_received - bytes0)
+    metrics.add(mkey, "issues", len(issues))
+    if len(jc.plan_log) > plans0 and jc.plan_log[-1].estimate is not None:
+        # Logged next to the actual issue count so the planner can be calibrated.
+        metrics.set(mkey, "estimated_issues", jc.plan_log[-1].estimate)
+    print(f"Fetched {len(issues)} issues (union)")
+
+    with metrics.stage(mkey, "tag"):
+        tagged = _shared(ctx, report, f"tagged:{report.local_filter}:{start}:{end}",
+                         lambda: tag_issues(issues, start, end))
+    rows = tagged["rows"]
+    if (start, end) != (ctx.start, ctx.end):
+        # Narrower window tagged from the widest fetch: keep only its own union.
+        rows = [r for r in rows if in_window_union(r)]
+    counts = tagged["counts"]
+    flow = None
+    if ctx.changelog.get("enabled") and stale is None:
+        with metrics.stage(mkey, "changelog"):
+            flow = _shared(ctx, report, f"flow:{report.local_filter}:{start}:{end}",
+                           lambda: _flow_for_rows(ctx, jc, issues, rows, start, end))
+        counts = flow["counts"]
+    print(f"Counts — created={counts['created']} resolved={counts['resolved']} open@end={counts['open']}")
+    print(f"Total unique issues in union: {len(rows)}")
+    if ctx.shard_results:
+        ctx.shard_results.record(report.pid, p, window_label, counts, rows, degraded=degraded)
+
+    with metrics.stage(mkey, "render"):
+        msg = build_report_message(
             lead_email,
             key,
             window_label,
             rows,
             counts,
-            show_top_n=int(cfg["report"].get("show_top_n", 20)),
+            show_top_n=ctx.show_top_n,
+            include_csv=ctx.include_csv,
+            flow=flow,
+            base_url=_site_base_url(ctx, report),
+            degraded=degraded,
         )
+    # Spool before delivery so an SMTP failure never forces a Jira re-fetch.
+    ident = _report_spool_id(report)
+    with metrics.stage(mkey, "spool"):
+        ctx.spool.put(msg, EMAIL_FROM, [lead_email], ident=ident)
+    print(f"Spooled report {ident} for {lead_email}")
+    ids = [ident]
+
+    if ctx.fanout.get("enabled") and degraded:
+        print("  Fan-out: skipped for a degraded report")
+    elif ctx.fanout.get("enabled"):
+        with metrics.stage(mkey, "fanout"):
+            ids.extend(_spool_assignee_reports(ctx, report, rows, _site_base_url(ctx, report)))
+    metrics.set(mkey, "peak_rss_bytes", peak_rss_bytes())
+    return ids
+
+
+def _apply_overrides(cfg: dict, start: Optional[str], end: Optional[str]) -> None:
+    if bool(start) != bool(end):
+        raise ValueError("--start and --end must be given together.")
+    if start and end:
+        cfg["report"]["window"] = {"mode": "custom_range", "start": start, "end": end}
+
+
+def run(start: Optional[str] = None, end: Optional[str] = None, projects: Optional[List[str]] = None,
+        fresh: bool = False, profile_dir: Optional[str] = None, dry_run: bool = False,
+        engine: Optional[str] = None, shard: Optional[str] = None, workers: Optional[int] = None,
+        shard_strategy: Optional[str] = None, deadline: Optional[str] = None, budget: Optional[float] = None,
+        resources: Optional[WarmResources] = None):
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+
+    # Hash the config as written; CLI overrides are part of the window key instead.
+    state_hash = config_hash(cfg)
+    _apply_overrides(cfg, start, end)
+
+    windows = windows_from_config(cfg)
+    if len(windows) == 1:
+        mode, start, end, interval, window_label = windows[0]
+    else:
+        # Fetch once over the widest window; every window's union is a subset of it.
+        mode, interval = "multi_window", None
+        start, end = min(w[1] for w in windows), max(w[2] for w in windows)
+        window_label = f"{start} to {end} ({len(windows)} windows)"
+        for w in windows:
+            print(f"Report window: {w[4]}")
+    selected = cfg.get("projects", [])
+    if projects:
+        wanted = {k.strip().upper() for k in projects if k.strip()}
+        selected = [p for p in selected if p["key"].upper() in wanted]
+    if shard:
+        index, count = parse_shard(shard)
+        if (shard_strategy or SHARD_STRATEGY) == "lpt":
+            selected = select_shard_lpt(selected, index, count, RunHistory())
+        else:
+            selected = select_shard(selected, index, count)
+        print(f"Shard {index}/{count}: {len(selected)} project(s): {', '.join(p['key'] for p in selected) or '-'}")
+
+    print(f"Window mode: {mode} | start={start} | end={end} | interval={interval} | label={window_label}")
+
+    ctx = RunContext(cfg, mode=mode, start=start, end=end, interval=interval, window_label=window_label,
+                     windows=windows)
+    ctx.state = RunState(state_hash, start, end)
+    ctx.profile_dir = profile_dir if profile_dir is not None else PROFILE_DIR
+    ctx.engine = engine or JIRA_ENGINE
+    ctx.workers = max(1, workers or RUN_WORKERS)
+    if ctx.profile_dir and ctx.workers > 1:
+        # tracemalloc is process-wide: concurrent projects would share (and corrupt) each other's numbers.
+        print(f"Profiling: running 1 worker instead of {ctx.workers}")
+        ctx.workers = 1
+    if resources is not None:
+        ctx.resources = resources
+        ctx.store, ctx.changelog_cache, ctx.history = resources.store, resources.changelog_cache, resources.history
+        ctx.store.expire()
+    dl_cfg = cfg["report"].get("deadline") or {}
+    ctx.deadline = _run_deadline(deadline or RUN_DEADLINE or dl_cfg.get("at"),
+                                 budget or RUN_BUDGET_SECONDS or dl_cfg.get("budget_seconds"), ctx.tz_label)
+    if ctx.deadline is not None:
+        at = datetime.fromtimestamp(ctx.deadline, ZoneInfo(ctx.tz_label))
+        print(f"Run deadline: {at:%Y-%m-%d %H:%M:%S %Z} (Jira work stops {DEADLINE_RESERVE_SECONDS:.0f}s earlier)")
+    if shard and not dry_run:
+        ctx.shard_results = ShardResults(index, count, state_hash, (start, end))
+    print(f"Run state: {ctx.state.path}")
+    try:
+        if dry_run:
+            _dry_run(ctx, selected, fresh=fresh)
+            return
+        try:
+            with profiling_run(ctx.profile_dir):
+                _run_all(ctx, selected, fresh=fresh)
+        finally:
+            print(f"Run metrics written to {ctx.metrics.write()}")
+    finally:
+        if resources is not None:
+            resources.last_metrics = ctx.metrics
+        else:
+            for jc in ctx.clients.values():
+                jc.close()
+        for jc in ctx.fallback_clients.values():
+            jc.close()
+
+
+def _reports(ctx: RunContext, selected: List[dict]):
+    """Yield (project, window, report id) for every configured report, project by project."""
+    seen = set()
+    for p in selected:
+        for w in ctx.windows:
+            # Single-window ids stay the plain project id so existing run state still applies.
+            rid = project_id(p) if len(ctx.windows) == 1 else f"{project_id(p)}|{w[4]}"
+            if rid not in seen:
+                seen.add(rid)
+                yield p, w, rid
+
+
+def _pending_reports(ctx: RunContext, selected: List[dict], *, fresh: bool,
+                     reset: bool = True) -> List[Tuple[dict, tuple, str]]:
+    pending = []
+    for p, w, rid in _reports(ctx, selected):
+        if fresh:
+            if reset:
+                ctx.state.reset(rid)
+        elif ctx.state.done(rid, STAGE_DELIVERED) or ctx.state.done(rid, STAGE_RENDERED):
+            # Rendered reports live in the spool; the drain below finishes their delivery.
+            print(f"\nProject {p['key']} → {p.get('lead_email')} [{w[4]}]: already done in a previous attempt, skipped")
+            continue
+        pending.append((p, w, rid))
+    return pending
+
+
+def _dry_run(ctx: RunContext, selected: List[dict], *, fresh: bool = False) -> None:
+    """Print the execution plan and expected Jira request count; nothing is fetched, spooled or sent."""
+    plan = _build_plan(ctx, _pending_reports(ctx, selected, fresh=fresh, reset=False))
+    _open_clients(ctx, plan)
+    _estimate_plan(ctx, plan)
+    print(plan.format())
+
+
+def _run_all(ctx: RunContext, selected: List[dict], *, fresh: bool = False) -> None:
+    ctx.spool = spool = Spool()
+    state, metrics = ctx.state, ctx.metrics
+    failures: List[str] = []
+
+    ctx.plan = _build_plan(ctx, _pending_reports(ctx, selected, fresh=fresh))
+    print(ctx.plan.format())
+    _open_clients(ctx, ctx.plan)
+    if ctx.shard_results:
+        ctx.shard_results.assign(rid for _, _, rid in _reports(ctx, selected))
+
+    schedule, costs, predicted = _schedule(ctx, ctx.plan)
+    ctx.costs = costs
+    unit_seconds: Dict[str, float] = {}
+    unit_pids: Dict[str, List[str]] = {}
+    unit_failed: Set[str] = set()
+    unit_lock = threading.Lock()
+
+    def run_group(reports: List[PlannedReport]) -> None:
+        t0, ok = time.perf_counter(), True
+        # Reports sharing one fetch degrade together.
+        degraded = _degrade_reason(ctx, reports[0])
+        for report in reports:
+            p, pid = report.project, report.pid
+            try:
+                with project_profiler(_spool_id(p["key"], pid), ctx.profile_dir):
+                    ids = _run_report(ctx, report, degraded)
+            except Exception as e:
+                ok = False
+                failures.append(p["key"])
+                state.fail(pid, f"{type(e).__name__}: {e}")
+                if ctx.shard_results:
+                    ctx.shard_results.fail(pid, p, report.window[4], f"{type(e).__name__}: {e}")
+                print(f"Project {p['key']} failed: {type(e).__name__}: {e}")
+                continue
+            finally:
+                _release(ctx, report)
+            state.mark(pid, STAGE_RENDERED, spool_ids=ids)
+        unit = shard_unit(reports[0].project)
+        with unit_lock:
+            if ok and not any(r.pid in ctx.degraded for r in reports):
+                unit_pids.setdefault(unit, []).extend(r.pid for r in reports)
+                unit_seconds[unit] = unit_seconds.get(unit, 0.0) + time.perf_counter() - t0
+            else:
+                # A failed or cut-down project's time says nothing about its usual cost.
+                unit_failed.add(unit)
+
+    def run_site(groups: List[List[PlannedReport]]) -> None:
+        if ctx.workers > 1:
+            # Workers take groups largest-first, which is LPT list scheduling.
+            with ThreadPoolExecutor(max_workers=ctx.workers, thread_name_prefix="report") as pool:
+                list(pool.map(run_group, groups))
+        else:
+            for group in groups:
+                run_group(group)
+
+    t_reports = time.perf_counter()
+    if len(schedule) > 1 and not ctx.profile_dir:
+        # Sites have separate pools and budgets, so they run side by side (one at a time when profiling).
+        with ThreadPoolExecutor(max_workers=len(schedule), thread_name_prefix="site") as pool:
+            list(pool.map(run_site, schedule.values()))
+    else:
+        for groups in schedule.values():
+            run_site(groups)
+    actual = time.perf_counter() - t_reports
+    ctx.changelog_cache.save()
+    if ctx.deadline is not None:
+        metrics.attach("deadline", {"at": ctx.deadline, "reserve_seconds": DEADLINE_RESERVE_SECONDS,
+                                    "degraded": dict(ctx.degraded)})
+        if ctx.degraded:
+            print(f"Deadline: {len(ctx.degraded)} report(s) degraded to meet it")
+    # Another query group of a failed unit ran, but only part of the unit's work.
+    unit_seconds = {u: sec for u, sec in unit_seconds.items() if u not in unit_failed}
+    _record_history(ctx, unit_seconds, unit_pids)
+    guess = f"predicted makespan {predicted:.1f}s" if predicted is not None else "no run history yet"
+    print(f"Schedule: {ctx.workers} worker(s) per site, {guess}, actual {actual:.1f}s")
+    metrics.attach("schedule", {
+        "workers": ctx.workers,
+        "predicted_makespan_seconds": None if predicted is None else round(predicted, 3),
+        "actual_makespan_seconds": round(actual, 3),
+        "units": {u: {"predicted": None if u not in costs else round(costs[u], 3), "actual": round(sec, 3)}
+                  for u, sec in unit_seconds.items()},
+    })
+
+    batch_size = int(ctx.fanout.get("batch_size", 50))
+    send = ctx.resources.smtp(batch_size) if ctx.resources else smtp_sender(batch_size=batch_size)
+    try:
+        with metrics.stage(RUN, "deliver"):
+            pending = spool.drain(send, deadline=time.time() + SPOOL_DRAIN_SECONDS)
+    finally:
+        if ctx.resources is None:
+            send.close()
+    metrics.set(RUN, "undelivered", pending)
+    for name, jc in ctx.clients.items():
+        print(jc.http_stats.format_summary() if len(ctx.clients) == 1 else f"[{name}] {jc.http_stats.format_summary()}")
+    if len(ctx.clients) == 1:
+        metrics.attach("http", next(iter(ctx.clients.values())).http_stats.summary())
+    elif ctx.clients:
+        metrics.attach("http", {name: jc.http_stats.summary() for name, jc in ctx.clients.items()})
+
+    # The spool only forgets a message once it was sent, so absent ids mean delivered.
+    still_spooled = {m["id"] for m in spool.entries()}
+    for _, _, pid in _reports(ctx, selected):
+        if state.done(pid, STAGE_RENDERED) and not state.done(pid, STAGE_DELIVERED):
+            ids = state.spool_ids(pid)
+            if not any(i in still_spooled or spool.is_dead(i) for i in ids):
+                state.mark(pid, STAGE_DELIVERED)
+    if ctx.shard_results:
+        summary = metrics.summary()
+        path = ctx.shard_results.write(summary["projects"], summary["wall_seconds"],
+                                       None if predicted is None else round(predicted, 3))
+        print(f"Shard results written to {path}")
+
+    problems = []
+    if failures:
+        problems.append(f"{len(failures)} project(s) failed: {', '.join(failures)} (re-run to resume them)")
+    if pending:
+        problems.append(
+            f"{pending} report(s) could not be delivered and remain in {spool.path}; "
+            "retry later with `python spool.py` (no Jira queries needed)"
+        )
+    if problems:
+        raise RuntimeError("; ".join(problems))
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Send the Jira window report for every configured project.")
+    ap.add_argument("--start", help="Override window start (YYYY-MM-DD); requires --end")
+    ap.add_argument("--end", help="Override window end (YYYY-MM-DD, inclusive); requires --start")
+    ap.add_argument("--projects", help="Comma-separated project keys to run (default: all in config)")
+    ap.add_argument("--fresh", action="store_true", help="Ignore saved run state and redo every selected project")
+    ap.add_argument("--profile", metavar="DIR", default=None,
+                    help="Write per-project cProfile (.prof) and tracemalloc reports to DIR")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="Print the deduplicated query plan and expected Jira request count, then exit")
+    ap.add_argument("--engine", choices=("requests", "asyncio"), default=None,
+                    help="Jira HTTP engine (default: JIRA_ENGINE or requests)")
+    ap.add_argument("--shard", metavar="i/N", default=None,
+                    help="Run only shard i of N (1-based; projects are assigned by consistent hashing) and "
+                         "write its results for `python shard.py merge`")
+    ap.add_argument("--shard-strategy", choices=("hash", "lpt"), default=None,
+                    help="Shard assignment: stable hashing (default) or balanced by run history")
+    ap.add_argument("--deadline", metavar="HH:MM", default=None,
+                    help="Finish by this time (timezone_label) or ISO datetime; late projects degrade "
+                         "to cached data or counts (default: RUN_DEADLINE / report.deadline.at)")
+    ap.add_argument("--budget", type=float, metavar="SECONDS", default=None,
+                    help="Run time budget in seconds (default: RUN_BUDGET_SECONDS / report.deadline.budget_seconds)")
+    ap.add_argument("--daemon", action="store_true",
+                    help="Stay running and report on the config's daemon.schedule (timezone_label), keeping "
+                         "connections and caches warm and serving /healthz and /metrics")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Parallel report workers per site, largest projects first (default: RUN_WORKERS or 1)")
+    return ap.parse_args(argv)
+
+
+def _run_daemon(args: argparse.Namespace) -> None:
+    import daemon  # the HTTP server and scheduler are only needed here
+
+    if args.start or args.end or args.dry_run or args.fresh:
+        raise SystemExit("--daemon cannot be combined with --start/--end, --dry-run or --fresh")
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+    scheduled = functools.partial(
+        run,
+        projects=args.projects.split(",") if args.projects else None,
+        profile_dir=args.profile,
+        engine=args.engine,
+        shard=args.shard,
+        workers=args.workers,
+        shard_strategy=args.shard_strategy,
+        deadline=args.deadline,
+        budget=args.budget,
+    )
+    d = daemon.from_config(cfg, scheduled, WarmResources())
+    signal.signal(signal.SIGTERM, lambda *_: d.stop())
+    d.run_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    if args.daemon:
+        _run_daemon(args)
+        return
+    run(
+        start=args.start,
+        end=args.end,
+        projects=args.projects.split(",") if args.projects else None,
+        fresh=args.fresh,
+        profile_dir=args.profile,
+        dry_run=args.dry_run,
+        engine=args.engine,
+        shard=args.shard,
+        workers=args.workers,
+        shard_strategy=args.shard_strategy,
+        deadline=args.deadline,
+        budget=args.budget,
+    )
 
 
 if __name__ == "__main__":
-    run()
+    main()
@@ -0,0 +1,137 @@
+# metrics.py
+"""
+Per-run instrumentation: stage timings, counters and peak memory per project,
+written as JSON (default) or a Prometheus textfile at the end of each run.
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+METRICS_PATH = os.getenv("METRICS_PATH", "run_metrics.json")
+
+RUN = "_run"  # pseudo-project for run-level stages (e.g. SMTP delivery)
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of resident memory for this process (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+
+class RunMetrics:
+    def __init__(self):
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+    def _project(self, project: str) -> Dict[str, Any]:
+        return self.projects.setdefault(project, {"stages": {}, "counters": {}})
+
+    @contextmanager
+    def stage(self, project: str, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                stages = self._project(project)["stages"]
+                stages[name] = stages.get(name, 0.0) + elapsed
+
+    def add(self, project: str, counter: str, value: float = 1) -> None:
+        with self._lock:
+            counters = self._project(project)["counters"]
+            counters[counter] = counters.get(counter, 0) + value
+
+    def set(self, project: str, counter: str, value: float) -> None:
+        with self._lock:
+            self._project(project)["counters"][counter] = value
+
+    def attach(self, name: str, payload: Dict[str, Any]) -> None:
+        """Attach a nested section (e.g. HTTP telemetry) to the run summary."""
+        with self._lock:
+            self.sections[name] = payload
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            projects = {
+                k: {
+                    "wall_seconds": round(sum(v["stages"].values()), 6),
+                    "stages": {s: round(t, 6) for s, t in v["stages"].items()},
+                    "counters": dict(v["counters"]),
+                }
+                for k, v in self.projects.items()
+            }
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self._t0, 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "projects": projects,
+            **self.sections,
+        }
+
+    # ------------------------ export ------------------------
+    @staticmethod
+    def _prom_label(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @classmethod
+    def _numeric_leaves(cls, obj: Any, prefix: str = ""):
+        if isinstance(obj, bool):
+            return
+        if isinstance(obj, (int, float)):
+            yield prefix, obj
+        elif isinstance(obj, dict):
+            for k, v in obj.items():
+                yield from cls._numeric_leaves(v, f"{prefix}.{k}" if prefix else str(k))
+
+    def to_prometheus(self) -> str:
+        s = self.summary()
+        lines = [
+            "# TYPE jira_report_run_wall_seconds gauge",
+            f"jira_report_run_wall_seconds {s['wall_seconds']}",
+            "# TYPE jira_report_run_started_timestamp_seconds gauge",
+            f"jira_report_run_started_timestamp_seconds {s['started_at']}",
+            "# TYPE jira_report_peak_rss_bytes gauge",
+            f"jira_report_peak_rss_bytes {s['peak_rss_bytes']}",
+            "# TYPE jira_report_stage_seconds gauge",
+        ]
+        for proj, v in s["projects"].items():
+            p = self._prom_label(proj)
+            for stage, secs in v["stages"].items():
+                lines.append(f'jira_report_stage_seconds{{project="{p}",stage="{self._prom_label(stage)}"}} {secs}')
+        lines.append("# TYPE jira_report_project_counter gauge")
+        for proj, v in s["projects"].items():
+            p = self._prom_label(proj)
+            for name, val in v["counters"].items():
+                lines.append(f'jira_report_project_counter{{project="{p}",name="{self._prom_label(name)}"}} {val}')
+        for section in self.sections:
+            lines.append(f"# TYPE jira_report_{section} gauge")
+            for path, val in self._numeric_leaves(s[section]):
+                lines.append(f'jira_report_{section}{{key="{self._prom_label(path)}"}} {val}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Optional[str] = None) -> str:
+        """Write the summary; a ``.prom`` suffix selects the Prometheus textfile format."""
+        path = path or METRICS_PATH
+        body = self.to_prometheus() if path.endswith(".prom") else json.dumps(self.summary(), indent=2)
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        return path
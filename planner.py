@@ -0,0 +1,122 @@
+# planner.py
+"""
+Execution plan for one run.
+
+Every configured report (a "consumer": one entry of ``projects``) is mapped to the
+server query it needs. Queries are keyed by a normalized form of their JQL, so the
+same project listed for several recipients, or overlapping configs, is fetched once
+and its tagged result is handed to every consumer. Queries on different Jira sites
+never collapse, even when their JQL is identical.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional
+
+from jira import And, Cmp, FetchPlan, JqlExpr, Or, UnsupportedJql, parse_jql, simplify
+
+
+def _canonical(expr: JqlExpr) -> JqlExpr:
+    """Order-insensitive, quoting- and case-insensitive form used only as a dedupe key."""
+    if isinstance(expr, (And, Or)):
+        parts = sorted((_canonical(p) for p in expr.parts), key=lambda e: e.to_jql())
+        return type(expr)(*parts)
+    if isinstance(expr, Cmp):
+        value = sorted(expr.value) if isinstance(expr.value, (list, tuple)) else expr.value
+        return Cmp(expr.field.lower(), expr.op.lower(), value)
+    return expr
+
+
+def normalize_jql(jql: str) -> str:
+    """Normalized JQL for deduplication; JQL outside the parser subset is only whitespace-normalized."""
+    try:
+        return _canonical(simplify(parse_jql(jql))).to_jql()
+    except UnsupportedJql:
+        return " ".join(jql.split())
+
+
+class PlannedQuery:
+    """One distinct server query and the reports that consume it."""
+
+    def __init__(self, key: str, jql: str, fields: str, count_jqls: Optional[Dict[str, str]] = None,
+                 site: Optional[str] = None, scope: Optional[str] = None):
+        self.key = key
+        self.site = site
+        # Site, project and filters without the window (IssueStore.latest)
+        self.scope = scope
+        self.jql = jql
+        self.fields = fields
+        self.count_jqls = count_jqls
+        self.consumers: List[str] = []
+        self.fetch_plan: Optional[FetchPlan] = None
+        self.expected_requests: Optional[int] = None
+
+    @property
+    def count_only(self) -> bool:
+        return self.count_jqls is not None
+
+
+class PlannedReport:
+    def __init__(self, pid: str, project: dict, query: PlannedQuery, local_filter: Optional[JqlExpr] = None,
+                 window: Optional[tuple] = None):
+        self.pid = pid
+        self.site = query.site
+        self.project = project
+        self.query = query
+        self.local_filter = local_filter
+        self.window = window
+
+
+class ExecutionPlan:
+    def __init__(self):
+        self.queries: Dict[str, PlannedQuery] = {}
+        self.reports: Dict[str, PlannedReport] = {}
+
+    def add(self, pid: str, project: dict, jql: str, fields: str, *,
+            local_filter: Optional[JqlExpr] = None, count_jqls: Optional[Dict[str, str]] = None,
+            window: Optional[tuple] = None, site: Optional[str] = None,
+            scope: Optional[str] = None) -> PlannedReport:
+        if count_jqls is not None:
+            key = "count:" + " | ".join(f"{k}={normalize_jql(v)}" for k, v in sorted(count_jqls.items()))
+        else:
+            key = f"{normalize_jql(jql)} [{','.join(sorted(fields.split(',')))}]"
+        if site is not None:
+            key = f"{site}: {key}"
+        q = self.queries.get(key)
+        if q is None:
+            q = self.queries[key] = PlannedQuery(key, jql, fields, count_jqls, site, scope)
+        q.consumers.append(pid)
+        report = self.reports[pid] = PlannedReport(pid, project, q, local_filter, window)
+        return report
+
+    def expected_total(self) -> Optional[int]:
+        """Sum of per-query expectations, or None if any query has no estimate."""
+        total = 0
+        for q in self.queries.values():
+            if q.expected_requests is None:
+                return None
+            total += q.expected_requests
+        return total
+
+    def format(self) -> str:
+        lines = [f"Execution plan: {len(self.reports)} report(s) from {len(self.queries)} distinct query(ies)"]
+        sites = {q.site for q in self.queries.values()}
+        for i, q in enumerate(self.queries.values(), 1):
+            kind = "counts" if q.count_only else "issues"
+            line = f"  Q{i} [{kind}] consumers={len(q.consumers)}"
+            if len(sites) > 1:
+                line += f" site={q.site}"
+            if q.fetch_plan is not None:
+                line += f" strategy={q.fetch_plan.strategy} estimate={q.fetch_plan.estimate}"
+            if q.expected_requests is not None:
+                line += f" requests≈{q.expected_requests}"
+            lines.append(line)
+            lines.append(f"     {q.jql if not q.count_only else ', '.join(sorted(q.count_jqls))}")
+            for pid in q.consumers:
+                r = self.reports[pid]
+                suffix = f"  (local filter: {r.local_filter})" if r.local_filter is not None else ""
+                if r.window is not None:
+                    suffix = f"  [{r.window[4]}]{suffix}"
+                lines.append(f"     → {r.project['key']} → {r.project.get('lead_email')}{suffix}")
+        total = self.expected_total()
+        if total is not None:
+            lines.append(f"Expected Jira requests: {total}")
+        return "\n".join(lines)
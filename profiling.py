@@ -0,0 +1,87 @@
+# profiling.py
+"""
+Opt-in per-project profiling (``python main.py --profile DIR`` or REPORT_PROFILE_DIR).
+
+Each project's fetch, tag and render runs under cProfile and tracemalloc and leaves
+  <DIR>/<name>.prof        cProfile stats (open with snakeviz / pstats)
+  <DIR>/<name>.alloc.txt   peak traced memory + top allocation sites
+When profiling is off, ``project_profiler`` returns a nullcontext and costs nothing.
+
+tracemalloc and the profiler hook are process-wide, so a profiled run traces memory
+once for the whole run (``profiling_run``) and runs its projects one at a time.
+"""
+from __future__ import annotations
+import cProfile
+import os
+import re
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, Optional
+
+PROFILE_DIR = os.getenv("REPORT_PROFILE_DIR", "")
+TOP_ALLOCATIONS = int(os.getenv("REPORT_PROFILE_TOP", "25"))
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "project"
+
+
+class _ProjectProfiler:
+    def __init__(self, name: str, out_dir: str, top: int = TOP_ALLOCATIONS):
+        self.name = _safe_name(name)
+        self.out_dir = out_dir
+        self.top = top
+        self.prof = cProfile.Profile()
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self.prof.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.prof.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, self.name)
+        self.prof.dump_stats(f"{base}.prof")
+        stats = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        )).statistics("lineno")
+        with open(f"{base}.alloc.txt", "w", encoding="utf-8") as f:
+            f.write(f"project: {self.name}\n")
+            f.write(f"traced memory: current={current} bytes peak={peak} bytes\n")
+            f.write(f"top {self.top} allocation sites (by size):\n")
+            for st in stats[: self.top]:
+                f.write(f"{st}\n")
+        print(f"Profile written: {base}.prof, {base}.alloc.txt")
+        return False
+
+
+def project_profiler(name: str, out_dir: Optional[str] = None) -> ContextManager:
+    out_dir = out_dir if out_dir is not None else PROFILE_DIR
+    if not out_dir:
+        return nullcontext()
+    return _ProjectProfiler(name, out_dir)
+
+
+@contextmanager
+def profiling_run(out_dir: Optional[str] = None) -> Iterator[None]:
+    """Trace memory for a whole profiled run; project profilers then only reset the peak."""
+    out_dir = out_dir if out_dir is not None else PROFILE_DIR
+    if not out_dir or tracemalloc.is_tracing():
+        yield
+        return
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
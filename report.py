@@ -1,6 +1,8 @@
 # report.py
 from __future__ import annotations
-from typing import Dict, List
+import math
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
 
 
 def _day(s: str | None) -> str:
@@ -22,6 +24,11 @@ def _has_resolution(fields: dict) -> bool:
     return bool(fields.get("resolution")) or bool(fields.get("resolutiondate") or fields.get("resolved"))
 
 
+def in_window_union(row: dict) -> bool:
+    """A tagged row belongs to the window's union query (created, resolved or open at end)."""
+    return bool(row["created_in_window"] or row["resolved_in_window"] or row["open_at_end"])
+
+
 def tag_issues(issues: List[dict], start: str, end: str) -> Dict[str, object]:
     """
     Flags per issue:
@@ -79,6 +86,179 @@ def tag_issues(issues: List[dict], start: str, end: str) -> Dict[str, object]:
     }
 
 
+def group_by_assignee(rows: List[dict]) -> Dict[str, dict]:
+    """
+    Single pass over tagged rows -> one bucket per assignee (unassigned issues are skipped).
+    Bucket: {"name", "email", "account_id", "rows", "counts": {"created", "resolved", "open"}}.
+    Only rows with at least one in-window flag are kept, mirroring the project email.
+    """
+    groups: Dict[str, dict] = {}
+    for row in rows:
+        if not in_window_union(row):
+            continue
+        a = row["fields"].get("assignee") or {}
+        ident = a.get("accountId") or a.get("emailAddress") or a.get("displayName")
+        if not ident:
+            continue
+        g = groups.get(ident)
+        if g is None:
+            g = groups[ident] = {
+                "name": a.get("displayName") or ident,
+                "email": a.get("emailAddress") or "",
+                "account_id": a.get("accountId") or "",
+                "rows": [],
+                "counts": {"created": 0, "resolved": 0, "open": 0},
+            }
+        g["rows"].append(row)
+        c = g["counts"]
+        c["created"] += row["created_in_window"]
+        c["resolved"] += row["resolved_in_window"]
+        c["open"] += row["open_at_end"]
+    return groups
+
+
+def _parse_ts(s: Optional[str]) -> Optional[datetime]:
+    if not s:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.strptime(s[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _summary(values: List[float]) -> Dict[str, object]:
+    """n / median / p85 (nearest rank), rounded to 0.1."""
+    if not values:
+        return {"n": 0, "median": None, "p85": None}
+    v = sorted(values)
+
+    def rank(q: float) -> float:
+        return v[max(0, math.ceil(q * len(v)) - 1)]
+
+    return {"n": len(v), "median": round(rank(0.5), 1), "p85": round(rank(0.85), 1)}
+
+
+def flow_metrics(rows: List[dict], changelogs: Dict[str, List[dict]], start: str, end: str,
+                 in_progress_statuses: Iterable[str] = ("In Progress",)) -> Dict[str, object]:
+    """
+    Reopen-aware counts and flow times from status/resolution changelogs, in one pass over the rows.
+
+      - resolved   : resolution set (from empty) during the window, counted per event
+      - reopened   : resolution cleared during the window, counted per event
+      - open_start / open : resolution state replayed from the history at start / after end
+      - closing_calc = open_start + created − resolved + reopened (holds even for reopened issues)
+      - lead / cycle time (days) and average time in each status (hours) for issues whose
+        final resolution falls in the window; cycle time starts at the first move into one
+        of ``in_progress_statuses``.
+
+    Each row gains ``reopens`` (lifetime reopen count).
+    """
+    in_progress = {s.casefold() for s in in_progress_statuses}
+    created_n = resolved_n = reopened_n = o_start = o_end = reopened_issues = 0
+    lead: List[float] = []
+    cycle: List[float] = []
+    status_seconds: Dict[str, float] = {}
+    completed = 0
+
+    for row in rows:
+        f = row["fields"]
+        c_day = _day(f.get("created"))
+        if not c_day:
+            continue
+        res_events = []
+        status_events = []
+        for h in sorted(changelogs.get(row["key"]) or [], key=lambda h: h.get("created") or ""):
+            for item in h.get("items", []):
+                fid = item.get("fieldId") or item.get("field")
+                if fid == "resolution":
+                    res_events.append((h.get("created"), bool(item.get("to") or item.get("toString"))))
+                elif fid == "status":
+                    status_events.append((h.get("created"), item.get("fromString"), item.get("toString")))
+        if not res_events and _has_resolution(f):
+            # No recorded transition (e.g. created resolved): fall back to the resolution field.
+            res_events = [(f.get("resolutiondate") or f.get("resolved") or f.get("created"), True)]
+
+        state = False
+        at_start = at_end = None
+        reopens = 0
+        resolved_at = None
+        for ts, to_resolved in res_events:
+            d = _day(ts)
+            if at_start is None and d >= start:
+                at_start = state
+            if at_end is None and d > end:
+                at_end = state
+            if to_resolved == state:
+                continue
+            if start <= d <= end:
+                if to_resolved:
+                    resolved_n += 1
+                else:
+                    reopened_n += 1
+            if not to_resolved:
+                reopens += 1
+            state = to_resolved
+            resolved_at = ts if to_resolved else None
+        at_start = state if at_start is None else at_start
+        at_end = state if at_end is None else at_end
+        row["reopens"] = reopens
+        reopened_issues += bool(reopens)
+
+        if start <= c_day <= end:
+            created_n += 1
+        if c_day < start and not at_start:
+            o_start += 1
+        if c_day <= end and not at_end:
+            o_end += 1
+
+        if not (resolved_at and start <= _day(resolved_at) <= end):
+            continue
+        t_created, t_res = _parse_ts(f.get("created")), _parse_ts(resolved_at)
+        if not (t_created and t_res):
+            continue
+        completed += 1
+        lead.append((t_res - t_created).total_seconds() / 86400)
+        t_prev = t_created
+        current = status_events[0][1] if status_events else (f.get("status") or {}).get("name")
+        started = None
+        for ts, _, to_status in status_events:
+            t = _parse_ts(ts)
+            if not t or t > t_res:
+                break
+            if current:
+                status_seconds[current] = status_seconds.get(current, 0.0) + (t - t_prev).total_seconds()
+            if started is None and (to_status or "").casefold() in in_progress:
+                started = t
+            t_prev, current = t, to_status
+        if current and t_res > t_prev:
+            status_seconds[current] = status_seconds.get(current, 0.0) + (t_res - t_prev).total_seconds()
+        if started is not None:
+            cycle.append((t_res - started).total_seconds() / 86400)
+
+    return {
+        "counts": {
+            "created": created_n,
+            "resolved": resolved_n,
+            "reopened": reopened_n,
+            "open_start": o_start,
+            "open": o_end,
+            "closing_calc": o_start + created_n - resolved_n + reopened_n,
+        },
+        "reopened_issues": reopened_issues,
+        "lead_time_days": _summary(lead),
+        "cycle_time_days": _summary(cycle),
+        "time_in_status_hours": {
+            k: round(v / completed / 3600, 1)
+            for k, v in sorted(status_seconds.items(), key=lambda kv: -kv[1])
+        },
+    }
+
+
 # ---- Back-compat shim for existing tests ----
 def format_report(issues: List[dict], start: str, end: str) -> Dict[str, List[dict]]:
     """
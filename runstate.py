@@ -0,0 +1,81 @@
+# runstate.py
+"""
+Checkpoint file for resumable runs.
+
+One JSON file per (config hash, window) records which projects finished which stage,
+so re-running after a partial failure only redoes the unfinished work and never
+re-sends reports that were already delivered.
+
+Stages per project:
+  - rendered  : the report (and any fan-out mails) is in the delivery spool
+  - delivered : every spooled message for the project left the spool successfully
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+RUN_STATE_DIR = os.getenv("RUN_STATE_DIR", ".runstate")
+
+STAGE_RENDERED = "rendered"
+STAGE_DELIVERED = "delivered"
+
+
+def config_hash(cfg: dict) -> str:
+    return hashlib.sha256(json.dumps(cfg, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def project_id(p: dict) -> str:
+    """Projects may repeat with different recipients, so the key alone is not unique."""
+    pid = f"{p['key']}|{p.get('lead_email', '')}|{(p.get('jql_extra') or '').strip()}"
+    # The same project key can exist on several Jira sites.
+    return f"{pid}|{p['site']}" if p.get("site") else pid
+
+
+class RunState:
+    def __init__(self, cfg_hash: str, start: Optional[str], end: Optional[str], path: Optional[str] = None):
+        self.dir = path or RUN_STATE_DIR
+        os.makedirs(self.dir, exist_ok=True)
+        self.path = os.path.join(self.dir, f"{cfg_hash[:16]}_{start}_{end}.json")
+        self._lock = threading.Lock()
+        self.data: Dict[str, Any] = {"config_hash": cfg_hash, "window": {"start": start, "end": end}, "projects": {}}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def _save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _project(self, pid: str) -> Dict[str, Any]:
+        return self.data["projects"].setdefault(pid, {"stages": {}, "spool_ids": [], "error": None})
+
+    def done(self, pid: str, stage: str) -> bool:
+        return stage in self.data["projects"].get(pid, {}).get("stages", {})
+
+    def spool_ids(self, pid: str) -> List[str]:
+        return list(self.data["projects"].get(pid, {}).get("spool_ids", []))
+
+    def mark(self, pid: str, stage: str, *, spool_ids: Optional[Iterable[str]] = None) -> None:
+        with self._lock:
+            p = self._project(pid)
+            p["stages"][stage] = time.time()
+            p["error"] = None
+            if spool_ids is not None:
+                p["spool_ids"] = list(spool_ids)
+            self._save()
+
+    def reset(self, pid: str) -> None:
+        with self._lock:
+            self.data["projects"].pop(pid, None)
+            self._save()
+
+    def fail(self, pid: str, error: str) -> None:
+        with self._lock:
+            self._project(pid)["error"] = error[:500]
+            self._save()
@@ -0,0 +1,258 @@
+# shard.py
+"""
+Horizontal sharding of a run across workers, and the merge step that follows.
+
+``python main.py --shard i/N`` keeps only the projects that rendezvous-hash to shard
+``i`` (1-based) of ``N``. Each project key (per site) is owned by the shard with the
+highest sha1(shard, key) score, so adding or removing projects never moves the others
+and changing N only moves about 1/N of them. Filter variants of one key always land
+on the same shard, so they still share one fetch.
+
+``--shard-strategy lpt`` balances shards by predicted runtime from ``run_history.json``
+instead (largest projects first onto the least-loaded shard). It is only stable
+while every worker sees the same history file.
+
+Every shard writes ``shard-<i>-of-<N>.json`` (per-report counts, compact rows, stage
+timings, failures). ``python shard.py merge`` combines them into one run summary and
+an optional Markdown digest:
+
+    python shard.py merge shard_results/ --out run_summary.json --digest digest.md
+"""
+from __future__ import annotations
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from history import RunHistory, lpt_assign
+
+SHARD_RESULTS_DIR = os.getenv("SHARD_RESULTS_DIR", "shard_results")
+SHARD_STRATEGY = os.getenv("SHARD_STRATEGY", "hash")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """``"2/4"`` -> (2, 4); shards are numbered 1..N."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}: expected i/N, e.g. 1/4") from None
+    if n < 1 or not 1 <= i <= n:
+        raise ValueError(f"Invalid shard {spec!r}: need 1 <= i <= N")
+    return i, n
+
+
+def shard_unit(p: dict) -> str:
+    """What gets hashed: the project key on its site, never the recipient or filters."""
+    return f"{p.get('site') or ''}|{p['key'].upper()}"
+
+
+def shard_of(unit: str, n: int) -> int:
+    """Rendezvous (highest random weight) hashing of ``unit`` onto shards 1..n."""
+    def score(i: int) -> int:
+        return int.from_bytes(hashlib.sha1(f"{i}:{unit}".encode("utf-8")).digest()[:8], "big")
+    return max(range(1, n + 1), key=score)
+
+
+def select_shard(projects: Iterable[dict], index: int, count: int,
+                 unit: Callable[[dict], str] = shard_unit) -> List[dict]:
+    return [p for p in projects if shard_of(unit(p), count) == index]
+
+
+def select_shard_lpt(projects: Iterable[dict], index: int, count: int, history: RunHistory,
+                     unit: Callable[[dict], str] = shard_unit) -> List[dict]:
+    """Balance shards by predicted cost: LPT over units, ties broken by unit name."""
+    projects = list(projects)
+    units = sorted({unit(p) for p in projects})
+    bins, _ = lpt_assign(units, history.costs(units), count)
+    mine = set(bins[index - 1])
+    return [p for p in projects if unit(p) in mine]
+
+
+def _compact_row(r: dict) -> Dict[str, Any]:
+    f = r.get("fields") or {}
+    return {
+        "key": r.get("key"),
+        "summary": f.get("summary"),
+        "status": (f.get("status") or {}).get("name"),
+        "assignee": (f.get("assignee") or {}).get("displayName"),
+        "created": f.get("created"),
+        "resolutiondate": f.get("resolutiondate"),
+        "created_in_window": r.get("created_in_window"),
+        "resolved_in_window": r.get("resolved_in_window"),
+        "open_at_end": r.get("open_at_end"),
+    }
+
+
+class ShardResults:
+    """
+    Per-report results of one shard. A resumed shard reloads its previous artifact,
+    so reports finished in an earlier attempt stay in the file.
+    """
+
+    def __init__(self, index: int, count: int, config_hash: str, window: Tuple[Optional[str], Optional[str]],
+                 directory: Optional[str] = None):
+        self.path = os.path.join(directory or SHARD_RESULTS_DIR, f"shard-{index}-of-{count}.json")
+        self._lock = threading.Lock()
+        self.data: Dict[str, Any] = {
+            "shard": {"index": index, "count": count},
+            "config_hash": config_hash,
+            "window": {"start": window[0], "end": window[1]},
+            "assigned": [],
+            "reports": {},
+        }
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                old = json.load(f)
+            if old.get("config_hash") == config_hash and old.get("window") == self.data["window"]:
+                self.data["reports"] = old.get("reports", {})
+
+    def assign(self, report_ids: Iterable[str]) -> None:
+        with self._lock:
+            self.data["assigned"] = sorted(set(self.data["assigned"]) | set(report_ids))
+
+    def record(self, rid: str, p: dict, window_label: str, counts: Dict[str, Any], rows: List[dict],
+               count_only: bool = False, degraded: Optional[str] = None) -> None:
+        entry = {
+            "key": p["key"], "site": p.get("site"), "lead_email": p.get("lead_email"),
+            "window": window_label, "count_only": count_only, "counts": dict(counts),
+            "rows": [_compact_row(r) for r in rows], "degraded": degraded, "error": None,
+        }
+        with self._lock:
+            self.data["reports"][rid] = entry
+
+    def fail(self, rid: str, p: dict, window_label: str, error: str) -> None:
+        with self._lock:
+            self.data["reports"][rid] = {"key": p["key"], "site": p.get("site"), "lead_email": p.get("lead_email"),
+                                         "window": window_label, "error": error}
+
+    def write(self, timings: Dict[str, Any], wall_seconds: float, predicted_seconds: Optional[float] = None) -> str:
+        with self._lock:
+            self.data.update(written_at=time.time(), wall_seconds=round(wall_seconds, 3), timings=timings,
+                             predicted_seconds=predicted_seconds)
+            body = json.dumps(self.data, indent=2, ensure_ascii=False)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, self.path)
+        return self.path
+
+
+def merge_results(paths: List[str]) -> Dict[str, Any]:
+    """Combine shard artifacts into one run summary; raises ValueError on a mismatched set."""
+    if not paths:
+        raise ValueError("No shard results to merge")
+    shards = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            shards.append(json.load(f))
+    first = shards[0]
+    count = first["shard"]["count"]
+    for s in shards:
+        if s["shard"]["count"] != count:
+            raise ValueError(f"Shard counts differ: {s['shard']['count']} vs {count}")
+        if (s["config_hash"], s["window"]) != (first["config_hash"], first["window"]):
+            raise ValueError(f"Shard {s['shard']['index']}/{count} ran a different config or window")
+    seen = [s["shard"]["index"] for s in shards]
+    if len(set(seen)) != len(seen):
+        raise ValueError(f"Duplicate shard results: {sorted(seen)}")
+
+    reports: Dict[str, Any] = {}
+    missing: List[str] = []
+    for s in sorted(shards, key=lambda s: s["shard"]["index"]):
+        for rid, r in s["reports"].items():
+            if rid in reports:
+                raise ValueError(f"Report {rid} appears in more than one shard")
+            reports[rid] = dict(r, shard=s["shard"]["index"])
+        missing.extend(rid for rid in s.get("assigned", []) if rid not in s["reports"])
+    totals = {"created": 0, "resolved": 0, "open": 0}
+    for r in reports.values():
+        for k in totals:
+            totals[k] += (r.get("counts") or {}).get(k, 0)
+    return {
+        "config_hash": first["config_hash"],
+        "window": first["window"],
+        "shards": {"count": count, "merged": sorted(seen),
+                   "missing": sorted(set(range(1, count + 1)) - set(seen))},
+        "makespan_seconds": max(s.get("wall_seconds", 0.0) for s in shards),
+        "predicted_makespan_seconds": max((s.get("predicted_seconds") or 0.0) for s in shards),
+        "shard_seconds": {str(s["shard"]["index"]): s.get("wall_seconds") for s in shards},
+        "totals": totals,
+        "failed": sorted(rid for rid, r in reports.items() if r.get("error")),
+        "unreported": sorted(missing),
+        "reports": reports,
+        "timings": {str(s["shard"]["index"]): s.get("timings", {}) for s in shards},
+    }
+
+
+def format_digest(summary: Dict[str, Any]) -> str:
+    """Markdown digest of a merged run (fits a GitHub job summary)."""
+    w, sh = summary["window"], summary["shards"]
+    lines = [
+        f"# Jira report run {w['start']} to {w['end']}",
+        "",
+        f"Shards merged: {len(sh['merged'])}/{sh['count']}"
+        + (f" (missing: {', '.join(map(str, sh['missing']))})" if sh["missing"] else "")
+        + f" · makespan {summary['makespan_seconds']:.1f}s"
+        + (f" (predicted {summary['predicted_makespan_seconds']:.1f}s)"
+           if summary.get("predicted_makespan_seconds") else ""),
+        "",
+        "| Project | Lead | Window | Created | Resolved | Open | Shard | Status |",
+        "|---|---|---|---:|---:|---:|---:|---|",
+    ]
+    for rid in sorted(summary["reports"], key=lambda r: (summary["reports"][r]["key"], r)):
+        r = summary["reports"][rid]
+        c = r.get("counts") or {}
+        status = (f"failed: {r['error']}" if r.get("error") else "degraded" if r.get("degraded")
+                  else "count-only" if r.get("count_only") else "ok")
+        key = f"{r['key']} ({r['site']})" if r.get("site") else r["key"]
+        lines.append(f"| {key} | {r.get('lead_email') or ''} | {r.get('window') or ''} | {c.get('created', '')} | "
+                     f"{c.get('resolved', '')} | {c.get('open', '')} | {r['shard']} | {status} |")
+    t = summary["totals"]
+    lines += ["", f"Totals: created={t['created']} resolved={t['resolved']} open={t['open']}"]
+    if summary["failed"]:
+        lines.append(f"Failed: {', '.join(summary['failed'])}")
+    if summary["unreported"]:
+        lines.append(f"No result: {', '.join(summary['unreported'])}")
+    return "\n".join(lines) + "\n"
+
+
+def _shard_files(inputs: List[str]) -> List[str]:
+    paths: List[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, "**", "shard-*-of-*.json"), recursive=True)))
+        else:
+            paths.append(item)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Merge per-shard results of a sharded report run.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("merge", help="Combine shard-*-of-*.json files into one run summary")
+    m.add_argument("inputs", nargs="*", default=[SHARD_RESULTS_DIR], help="Shard result files or directories")
+    m.add_argument("--out", default="run_summary.json", help="Merged summary path")
+    m.add_argument("--digest", default=None, help="Also write a Markdown digest to this path")
+    args = ap.parse_args(argv)
+
+    summary = merge_results(_shard_files(args.inputs))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"Merged {len(summary['shards']['merged'])}/{summary['shards']['count']} shard(s), "
+          f"{len(summary['reports'])} report(s) into {args.out}")
+    if args.digest:
+        with open(args.digest, "w", encoding="utf-8") as f:
+            f.write(format_digest(summary))
+        print(f"Digest written to {args.digest}")
+    incomplete = summary["shards"]["missing"] or summary["failed"] or summary["unreported"]
+    return 1 if incomplete else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
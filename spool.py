@@ -0,0 +1,225 @@
+# spool.py
+"""
+Durable outbox for rendered report emails.
+
+Every message is written to disk before any SMTP traffic happens, so a failed
+delivery can be retried later (``python spool.py``) without touching Jira or
+re-rendering the report.
+
+Layout of the spool directory:
+  <id>.eml   the fully rendered RFC 822 message
+  <id>.json  delivery metadata (recipients, attempts, next attempt time, last error)
+  dead/      messages that exhausted ``max_attempts``
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+import time
+import uuid
+from email.message import Message
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SPOOL_DIR = os.getenv("SPOOL_DIR", ".spool")
+SPOOL_MAX_ATTEMPTS = int(os.getenv("SPOOL_MAX_ATTEMPTS", "6"))
+SPOOL_BASE_DELAY = float(os.getenv("SPOOL_BASE_DELAY", "30"))
+SPOOL_MAX_DELAY = float(os.getenv("SPOOL_MAX_DELAY", "3600"))
+# A session idle for longer is probed with NOOP before reuse (servers drop idle clients).
+SMTP_IDLE_CHECK_SECONDS = float(os.getenv("SMTP_IDLE_CHECK_SECONDS", "30"))
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    # Unique per writer: concurrent site threads must never share a temp file.
+    tmp = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def backoff_delay(attempts: int, base: float = SPOOL_BASE_DELAY, cap: float = SPOOL_MAX_DELAY) -> float:
+    """Exponential backoff: base, 2*base, 4*base, ... capped at ``cap`` seconds."""
+    if attempts < 1:
+        return 0.0
+    return min(cap, base * (2 ** (attempts - 1)))
+
+
+class Spool:
+    def __init__(self, path: Optional[str] = None, *, max_attempts: int = SPOOL_MAX_ATTEMPTS,
+                 base_delay: float = SPOOL_BASE_DELAY, max_delay: float = SPOOL_MAX_DELAY):
+        self.path = path or SPOOL_DIR
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        os.makedirs(self.path, exist_ok=True)
+
+    # ------------------------ storage ------------------------
+    def _eml(self, ident: str) -> str:
+        return os.path.join(self.path, f"{ident}.eml")
+
+    def _meta(self, ident: str) -> str:
+        return os.path.join(self.path, f"{ident}.json")
+
+    def _read_meta(self, ident: str) -> Dict[str, Any]:
+        with open(self._meta(ident), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_meta(self, ident: str, meta: Dict[str, Any]) -> None:
+        _atomic_write(self._meta(ident), json.dumps(meta, indent=2).encode("utf-8"))
+
+    def put(self, msg: Message, sender: Optional[str], recipients: List[str], ident: Optional[str] = None) -> str:
+        """
+        Persist a rendered message. Passing a stable ``ident`` makes re-spooling the
+        same report idempotent (the pending entry is replaced, never duplicated).
+        """
+        ident = ident or uuid.uuid4().hex
+        # Body first, metadata last: an entry only becomes visible once both exist.
+        _atomic_write(self._eml(ident), msg.as_bytes())
+        self._write_meta(ident, {
+            "id": ident,
+            "from": sender,
+            "to": list(recipients),
+            "subject": str(msg.get("Subject", "")),
+            "attempts": 0,
+            "next_attempt_at": 0.0,
+            "last_error": None,
+            "spooled_at": time.time(),
+        })
+        return ident
+
+    def entries(self) -> List[Dict[str, Any]]:
+        out = []
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(".json") and os.path.exists(self._eml(name[:-5])):
+                out.append(self._read_meta(name[:-5]))
+        return out
+
+    def due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        return [m for m in self.entries() if m["next_attempt_at"] <= now]
+
+    def is_dead(self, ident: str) -> bool:
+        return os.path.exists(os.path.join(self.path, "dead", f"{ident}.json"))
+
+    def load(self, ident: str) -> bytes:
+        with open(self._eml(ident), "rb") as f:
+            return f.read()
+
+    def mark_sent(self, ident: str) -> None:
+        for p in (self._meta(ident), self._eml(ident)):
+            if os.path.exists(p):
+                os.remove(p)
+
+    def mark_failed(self, ident: str, error: str, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        meta = self._read_meta(ident)
+        meta["attempts"] += 1
+        meta["last_error"] = error[:500]
+        meta["next_attempt_at"] = now + backoff_delay(meta["attempts"], self.base_delay, self.max_delay)
+        self._write_meta(ident, meta)
+        if meta["attempts"] >= self.max_attempts:
+            dead = os.path.join(self.path, "dead")
+            os.makedirs(dead, exist_ok=True)
+            os.replace(self._eml(ident), os.path.join(dead, f"{ident}.eml"))
+            os.replace(self._meta(ident), os.path.join(dead, f"{ident}.json"))
+        return meta
+
+    # ------------------------ delivery ------------------------
+    def deliver(self, send: Callable[[Optional[str], List[str], bytes], None],
+                now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Try every due entry once via ``send(sender, recipients, raw_bytes)``.
+        Returns (sent, failed). Failures are rescheduled with exponential backoff.
+        """
+        sent = failed = 0
+        for meta in self.due(now):
+            ident = meta["id"]
+            try:
+                send(meta["from"], meta["to"], self.load(ident))
+            except Exception as e:
+                failed += 1
+                m = self.mark_failed(ident, f"{type(e).__name__}: {e}", now)
+                print(f"Spool: delivery of {ident} failed (attempt {m['attempts']}): {m['last_error']}")
+            else:
+                sent += 1
+                self.mark_sent(ident)
+        return sent, failed
+
+    def drain(self, send: Callable[[Optional[str], List[str], bytes], None], *, deadline: float,
+              sleep: Callable[[float], None] = time.sleep) -> int:
+        """
+        Retry worker: keep delivering until the spool is empty or ``deadline`` (epoch
+        seconds) is reached, sleeping until the next entry becomes due. Returns the
+        number of entries still pending.
+        """
+        while True:
+            self.deliver(send)
+            pending = self.entries()
+            if not pending:
+                return 0
+            wake = min(m["next_attempt_at"] for m in pending)
+            if wake >= deadline:
+                return len(pending)
+            sleep(max(0.0, wake - time.time()))
+
+
+def smtp_sender(batch_size: int = 0):
+    """
+    Return a ``send`` callable that shares one SMTP session and reconnects on failure.
+    With ``batch_size`` > 0 the session is recycled after that many messages, which
+    keeps large fan-outs under typical per-connection provider limits.
+    """
+    from mailer import smtp_session
+
+    state: Dict[str, Any] = {"cm": None, "server": None, "sent": 0, "used": 0.0}
+
+    def _close():
+        if state["cm"] is not None:
+            try:
+                state["cm"].__exit__(None, None, None)
+            except Exception:
+                pass
+        state["cm"] = state["server"] = None
+        state["sent"] = 0
+
+    def send(sender: Optional[str], recipients: List[str], raw: bytes) -> None:
+        if batch_size and state["sent"] >= batch_size:
+            _close()
+        if state["server"] is not None and time.monotonic() - state["used"] > SMTP_IDLE_CHECK_SECONDS:
+            try:
+                alive = state["server"].noop()[0] == 250
+            except Exception:
+                alive = False
+            if not alive:
+                _close()
+        if state["server"] is None:
+            state["cm"] = smtp_session()
+            state["server"] = state["cm"].__enter__()
+        try:
+            state["server"].sendmail(sender, recipients, raw)
+        except Exception:
+            _close()
+            raise
+        state["sent"] += 1
+        state["used"] = time.monotonic()
+
+    send.close = _close  # type: ignore[attr-defined]
+    return send
+
+
+def main() -> int:
+    """Retry worker entry point: deliver whatever is due now, without any Jira traffic."""
+    spool = Spool()
+    send = smtp_sender()
+    try:
+        sent, failed = spool.deliver(send)
+    finally:
+        send.close()
+    remaining = len(spool.entries())
+    print(f"Spool: sent={sent} failed={failed} pending={remaining}")
+    return 1 if remaining else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
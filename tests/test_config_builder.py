@@ -0,0 +1,142 @@
+# tests/test_config_builder.py
+import threading
+import time
+
+import pytest
+
+import config_builder_tk as cb
+
+
+def _drain(jobs, timeout=5.0):
+    msgs = []
+    deadline = time.time() + timeout
+    while jobs.pending > 0 and time.time() < deadline:
+        msgs.extend(jobs.poll())
+        time.sleep(0.005)
+    return msgs
+
+
+def test_background_jobs_run_concurrently_and_report_results():
+    jobs = cb.BackgroundJobs()
+    barrier = threading.Barrier(2, timeout=2)
+    jobs.submit("a", lambda: (barrier.wait(), "A")[1])
+    jobs.submit("b", lambda: (barrier.wait(), "B")[1])
+    jobs.submit("bad", lambda: 1 / 0)
+    msgs = _drain(jobs)
+    jobs.shutdown()
+    done = {name: payload for name, kind, payload in msgs if kind == "done"}
+    assert done == {"a": "A", "b": "B"}
+    assert [kind for name, kind, _ in msgs if name == "bad"] == ["error"]
+    assert jobs.pending == 0
+
+
+def test_fetch_projects_reports_progress_and_honours_cancel(monkeypatch):
+    def fake_get(base, path, headers, params=None):
+        start = params["startAt"]
+        n = min(50, 120 - start)
+        return {"values": [{"key": f"P{start + i}", "name": "x"} for i in range(n)], "total": 120}
+
+    monkeypatch.setattr(cb, "jira_get", fake_get)
+    seen = []
+    assert len(cb.fetch_projects("u", {}, progress=lambda *a: seen.append(a))) == 120
+    assert len(seen) == 3 and seen[0] == (50, 120) and seen[-1] == (120, 120)
+
+    cancel = threading.Event()
+    with pytest.raises(cb.Cancelled):
+        cb.fetch_projects("u", {}, progress=lambda *a: cancel.set(), cancel=cancel)
+
+
+def test_fetch_projects_fetches_remaining_pages_in_parallel(monkeypatch):
+    starts, barrier = [], threading.Barrier(3, timeout=2)
+
+    def fake_get(base, path, headers, params=None):
+        start = params["startAt"]
+        starts.append(start)
+        if start:
+            barrier.wait()  # deadlocks (times out) unless the three later pages overlap
+        n = min(params["maxResults"], 400 - start)
+        return {"values": [{"key": f"P{start + i:03d}", "name": "x"} for i in range(n)], "total": 400}
+
+    monkeypatch.setattr(cb, "jira_get", fake_get)
+    out = cb.fetch_projects("u", {}, page_size=100, workers=3)
+    assert [p["key"] for p in out] == [f"P{i:03d}" for i in range(400)]
+    assert sorted(starts) == [0, 100, 200, 300]
+
+
+def test_metadata_cache_roundtrip_ttl_and_last_site(tmp_path):
+    path = str(tmp_path / "meta.json")
+    cache = cb.MetadataCache(path, ttl=60)
+    assert cache.get("https://x.atlassian.net", "a@x") is None and cache.last() is None
+    cache.put("https://X.atlassian.net/", "a@x", projects=[{"key": "A", "name": "Alpha"}],
+              issue_types=["Bug"], priorities=["High"])
+
+    reopened = cb.MetadataCache(path, ttl=60)
+    entry = reopened.get("https://x.atlassian.net", "A@x")
+    assert entry["projects"] == [{"key": "A", "name": "Alpha"}] and entry["issue_types"] == ["Bug"]
+    assert reopened.last()["base_url"] == "https://X.atlassian.net"
+    assert "token" not in (tmp_path / "meta.json").read_text().lower()
+
+    assert cb.MetadataCache(path, ttl=-1).get("https://x.atlassian.net", "a@x") is None
+
+
+def test_search_index_ranks_key_and_word_prefixes_first():
+    projects = [{"key": "API", "name": "Public API"}, {"key": "DESK", "name": "Service Desk"},
+                {"key": "OPS", "name": "Desktop ops"}, {"key": "SUP", "name": "Support desk"}]
+    idx = cb.SearchIndex(projects)
+
+    def keys(q):
+        return [projects[i]["key"] for i in idx.search(q)]
+
+    assert keys("") == ["API", "DESK", "OPS", "SUP"]
+    assert keys("desk") == ["DESK", "OPS", "SUP"]          # exact key, then word prefixes by key
+    assert keys("desk sup") == ["SUP"]                       # every term must match
+    assert keys("api") == ["API"]
+    assert keys("esk") == ["DESK", "OPS", "SUP"]             # substring only
+
+
+def test_search_index_incremental_matches_full_scan():
+    projects = [{"key": f"P{i:05d}", "name": f"Team {i % 97} board {i % 13}"} for i in range(10000)]
+    idx = cb.SearchIndex(projects)
+    for q in ["t", "te", "team 1", "team 12", "team 12 board 3", "p0", "p00042"]:
+        got = idx.search(q)
+        assert got == cb.SearchIndex(projects).search(q), q
+
+
+def test_visible_rows_is_bounded_by_viewport():
+    assert cb.visible_rows(0, 160, 20, 10000) == range(0, 9)
+    assert cb.visible_rows(5000, 160, 20, 10000) == range(5000, 5009)
+    assert cb.visible_rows(9999, 160, 20, 10000) == range(9992, 10000)
+    assert cb.visible_rows(0, 160, 20, 3) == range(0, 3)
+
+
+def test_preview_jql_matches_the_run_query():
+    window = {"mode": "custom_range", "start": "2025-11-01", "end": "2025-11-07"}
+    jql = cb.preview_jql("SUP", window, 'AND issuetype in ("Bug")')
+    assert jql == cb.JiraClient.build_jql_union_window(
+        "SUP", start="2025-11-01", end="2025-11-07", extra_filters='AND issuetype in ("Bug")', simplified=True)
+    rolling = cb.preview_jql("SUP", {"mode": "rolling_days", "rolling_days": 14}, "")
+    assert "-14d" in rolling
+
+
+def test_count_preview_fetches_in_background_and_caches_by_jql():
+    calls, release = [], threading.Event()
+
+    def fetch(jql):
+        calls.append(jql)
+        release.wait(2)
+        return len(jql)
+
+    preview = cb.CountPreview(fetch)
+    assert preview.request("project = A") is None
+    assert preview.request("project = A") is None      # in flight: not requested twice
+    assert preview.busy
+    release.set()
+    deadline = time.time() + 5
+    results = []
+    while preview.busy and time.time() < deadline:
+        results.extend(preview.poll())
+        time.sleep(0.005)
+    assert results == [("project = A", 11)]
+    assert preview.request("project = A") == 11        # cached, no new request
+    assert calls == ["project = A"]
+    preview.shutdown()
@@ -0,0 +1,107 @@
+# tests/test_daemon.py
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+import main
+from daemon import ReportDaemon, Schedule
+from tests.test_main import _FakeJira, _setup
+
+
+def _utc(*a):
+    return datetime(*a, tzinfo=timezone.utc)
+
+
+def test_schedule_keeps_local_time_across_dst():
+    s = Schedule([{"days": ["MON"], "at": "10:00"}], "Europe/Berlin")
+    assert s.next_after(_utc(2025, 10, 17, 12)).astimezone(timezone.utc) == _utc(2025, 10, 20, 8)
+    assert s.next_after(_utc(2025, 10, 24, 12)).astimezone(timezone.utc) == _utc(2025, 10, 27, 9)
+    # strictly after: a run that just started is not scheduled again
+    assert s.next_after(_utc(2025, 10, 27, 9)).astimezone(timezone.utc) == _utc(2025, 11, 3, 9)
+
+
+def test_schedule_resolves_skipped_and_repeated_wall_times():
+    spring = Schedule([{"days": ["SUN"], "at": "02:30"}], "Europe/Berlin")
+    t = spring.next_after(_utc(2026, 3, 28, 12))
+    assert (t.hour, t.minute) == (3, 30) and t.astimezone(timezone.utc) == _utc(2026, 3, 29, 1, 30)
+    autumn = Schedule([{"days": ["SUN"], "at": "02:30"}], "Europe/Berlin")
+    first = autumn.next_after(_utc(2025, 10, 25, 12))
+    assert first.astimezone(timezone.utc) == _utc(2025, 10, 26, 0, 30)
+    # the repeated 02:30 an hour later does not trigger a second run
+    assert autumn.next_after(first).astimezone(timezone.utc) == _utc(2025, 11, 2, 1, 30)
+
+
+class _Resources:
+    last_metrics = None
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_health_and_metrics_endpoints_report_the_last_run():
+    outcomes = [None, RuntimeError("Jira 500")]
+
+    def fake_run(resources):
+        err = outcomes.pop(0)
+        if err:
+            raise err
+
+    d = ReportDaemon(Schedule([{"at": "10:00"}], "UTC"), fake_run, _Resources(), host="127.0.0.1", port=0)
+    base = d.start_http()
+    try:
+        assert d.run_once() is True
+        health = json.loads(urllib.request.urlopen(f"{base}/healthz").read())
+        assert health["status"] == "ok" and health["runs"] == 1
+        assert d.run_once() is False
+        try:
+            urllib.request.urlopen(f"{base}/healthz")
+            raise AssertionError("expected 503")
+        except urllib.error.HTTPError as e:
+            assert e.code == 503
+            assert json.loads(e.read())["last_run"]["error"] == "RuntimeError: Jira 500"
+        text = urllib.request.urlopen(f"{base}/metrics").read().decode()
+        assert "jira_report_daemon_runs_total 2" in text and "jira_report_daemon_failures_total 1" in text
+    finally:
+        d.stop_http()
+
+
+def test_run_forever_stops_and_releases_resources():
+    res = _Resources()
+    d = ReportDaemon(Schedule([{"at": "10:00"}], "UTC"), lambda resources: None, res, host="127.0.0.1", port=0)
+    t = threading.Thread(target=d.run_forever)
+    t.start()
+    d.stop()
+    t.join(5)
+    assert not t.is_alive() and res.closed and d.runs == 0
+
+
+def test_warm_resources_are_reused_across_runs(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA"])
+    made = []
+    monkeypatch.setattr(main, "_make_client", lambda engine, site=None: made.append(site) or _FakeJira())
+    senders = []
+    real_sender = main.smtp_sender
+    monkeypatch.setattr(main, "smtp_sender", lambda batch_size=0: senders.append(1) or real_sender(batch_size))
+    res = main.WarmResources()
+    main.run(resources=res)
+    main.run(resources=res, fresh=True)
+    assert len(made) == 1 and len(senders) == 1
+    assert sent == ["aaa@x", "aaa@x"]
+    assert res.last_metrics is not None
+    assert len(res.history.units["|AAA"]) == 2
+
+
+def test_daemon_runs_share_the_warm_issue_store(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA"])
+    res = main.WarmResources()
+    d = ReportDaemon(Schedule([{"at": "10:00"}], "UTC"),
+                     lambda resources: main.run(resources=resources, fresh=True), res, host="127.0.0.1", port=0)
+    assert d.run_once() and d.run_once()
+    assert _FakeJira.calls == ["AAA"]
+    assert (res.store.misses, res.store.hits) == (1, 1)
+    assert sent == ["aaa@x", "aaa@x"]
+    res.store.ttl = -1
+    assert res.store.expire() == 1
@@ -0,0 +1,152 @@
+# tests/test_deadline.py
+import json
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import issuestore
+import main
+from jira import DeadlineExceeded, JiraClient, _TelemetryRetry, deadline_left
+from mailer import build_no_data_message
+from tests.test_main import _FakeJira, _issue, _setup
+
+
+def test_run_deadline_takes_the_earlier_limit_and_ignores_a_passed_clock_time():
+    tz = ZoneInfo("Europe/Berlin")
+    now = datetime(2025, 11, 17, 9, 0, tzinfo=tz)
+    ten = datetime(2025, 11, 17, 10, 0, tzinfo=tz).timestamp()
+    assert main._run_deadline("10:00", None, "Europe/Berlin", now) == ten
+    assert main._run_deadline("10:00", 600, "Europe/Berlin", now) == now.timestamp() + 600
+    assert main._run_deadline("08:30", None, "Europe/Berlin", now) is None
+    assert main._run_deadline("2025-11-17T09:30:00", None, "Europe/Berlin", now) == ten - 1800
+    assert main._run_deadline(None, None, "Europe/Berlin", now) is None
+
+
+def test_client_refuses_requests_and_backoff_past_the_deadline():
+    jc = JiraClient("http://127.0.0.1:9", "e@x", "t")
+    jc.deadline = time.time() - 1
+    with pytest.raises(DeadlineExceeded):
+        jc.approximate_count("project = A")
+
+    class _Resp:
+        headers = {"Retry-After": "30"}
+
+    retry = _TelemetryRetry(total=5)
+    retry.deadline = time.time() + 5
+    with pytest.raises(DeadlineExceeded, match="backoff"):
+        retry.new().sleep(_Resp())
+
+
+def _degraded_run(monkeypatch, tmp_path, keys, history):
+    sent = _setup(monkeypatch, tmp_path, keys)
+    (tmp_path / "run_history.json").write_text(json.dumps(
+        {"units": {f"|{k}": [{"seconds": s}] for k, s in history.items()}}))
+    monkeypatch.setattr(main, "DEADLINE_RESERVE_SECONDS", 0)
+    marks = {}
+    real = main.build_report_message
+
+    def spy(to, key, label, rows, counts, **kw):
+        marks[key] = kw.get("degraded")
+        msg = real(to, key, label, rows, counts, **kw)
+        marks[key, "subject"] = msg["Subject"]
+        return msg
+
+    monkeypatch.setattr(main, "build_report_message", spy)
+    return sent, marks
+
+
+def test_projects_that_no_longer_fit_degrade_to_counts(monkeypatch, tmp_path):
+    sent, marks = _degraded_run(monkeypatch, tmp_path, ["AAA", "BBB"], {"AAA": 1, "BBB": 500})
+    main.run(budget=100)
+    assert _FakeJira.calls == [("counts", ["created", "open", "open_start", "resolved"]), "AAA"]
+    assert sorted(sent) == ["aaa@x", "bbb@x"]
+    assert marks["AAA"] is None
+    assert "headline counts only" in marks["BBB"]
+    assert marks["BBB", "subject"].startswith("[Partial] ")
+    m = json.loads((tmp_path / "run_metrics.json").read_text())
+    assert list(m["deadline"]["degraded"]) == ["BBB|bbb@x|"]
+    # the cut-down run does not pollute the cost history
+    assert len(json.loads((tmp_path / "run_history.json").read_text())["units"]["|BBB"]) == 1
+
+
+def test_full_run_cut_off_by_the_deadline_falls_back_to_counts(monkeypatch, tmp_path):
+    sent, marks = _degraded_run(monkeypatch, tmp_path, ["AAA"], {})
+    real = _FakeJira.get_issues
+
+    def slow(self, jql, fields=None):
+        raise DeadlineExceeded("retry backoff of 30.0s would pass the run deadline")
+
+    monkeypatch.setattr(_FakeJira, "get_issues", slow)
+    main.run(budget=3600)
+    assert sent == ["aaa@x"]
+    assert "did not answer before the run deadline" in marks["AAA"]
+    monkeypatch.setattr(_FakeJira, "get_issues", real)
+
+
+def _deadline_enforcing(monkeypatch):
+    """Make the fake client refuse Jira calls past its deadline, as the real ones do."""
+    counts, issues = _FakeJira.get_counts, _FakeJira.get_issues
+
+    def get_counts(self, jqls):
+        deadline_left(self.deadline, "count query")
+        return counts(self, jqls)
+
+    def get_issues(self, jql, fields=None):
+        deadline_left(self.deadline, "issue search")
+        return issues(self, jql, fields)
+
+    monkeypatch.setattr(_FakeJira, "get_counts", get_counts)
+    monkeypatch.setattr(_FakeJira, "get_issues", get_issues)
+
+
+def test_count_fallback_may_spend_the_reserve(monkeypatch, tmp_path):
+    sent, marks = _degraded_run(monkeypatch, tmp_path, ["AAA"], {})
+    _deadline_enforcing(monkeypatch)
+    # Past deadline - reserve already, but the deadline itself is still 60s away.
+    monkeypatch.setattr(main, "DEADLINE_RESERVE_SECONDS", 120)
+    main.run(budget=60)
+    assert sent == ["aaa@x"]
+    assert "headline counts only" in marks["AAA"]
+    assert _FakeJira.calls == [("counts", ["created", "open", "open_start", "resolved"])]
+
+
+def test_report_past_the_deadline_still_gets_a_no_data_notice(monkeypatch, tmp_path):
+    sent, marks = _degraded_run(monkeypatch, tmp_path, ["AAA"], {})
+    _deadline_enforcing(monkeypatch)
+    monkeypatch.setattr(main, "build_no_data_message", lambda to, key, label, reason: marks.update(
+        {key: reason}) or build_no_data_message(to, key, label, reason))
+    monkeypatch.setattr(main, "_run_deadline", lambda *a, **k: time.time() - 1)
+    main.run(budget=60)
+    assert sent == ["aaa@x"]
+    assert "not even the headline counts" in marks["AAA"]
+    assert build_no_data_message("a@x", "AAA", "W", "late")["Subject"].startswith("[Partial] no data")
+
+
+def test_degraded_report_uses_the_newest_cached_copy_from_an_earlier_window(monkeypatch, tmp_path):
+    sent, marks = _degraded_run(monkeypatch, tmp_path, ["AAA"], {})
+    monkeypatch.setattr(issuestore, "ISSUE_STORE_DIR", str(tmp_path / "store"))
+    _FakeJira.issues = {"AAA": [_issue("AAA-1"), _issue("AAA-9", created="2025-12-01T10:00:00.000+0000")]}
+    main.run()
+    assert marks["AAA"] is None
+
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["report"]["window"] = {"mode": "custom_range", "start": "2025-11-08", "end": "2025-11-14"}
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    (tmp_path / "run_history.json").write_text(json.dumps({"units": {"|AAA": [{"seconds": 500}]}}))
+    _FakeJira.calls = []
+    rows = {}
+    real = main.build_report_message
+
+    def spy(to, key, label, rows_, counts, **kw):
+        rows[key] = [r["key"] for r in rows_]
+        return real(to, key, label, rows_, counts, **kw)
+
+    monkeypatch.setattr(main, "build_report_message", spy)
+    main.run(budget=100)
+    assert _FakeJira.calls == []
+    assert sent == ["aaa@x", "aaa@x"]
+    assert "issue data cached at" in marks["AAA"]
+    # filtered to the new window: AAA-9 was created after it ended
+    assert rows["AAA"] == ["AAA-1"]
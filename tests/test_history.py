@@ -0,0 +1,101 @@
+# tests/test_history.py
+import json
+
+import main
+from history import RunHistory, lpt_assign, lpt_order
+from shard import select_shard_lpt
+from tests.test_main import _FakeJira, _setup
+
+
+def test_predict_is_median_of_kept_runs(tmp_path):
+    h = RunHistory(str(tmp_path / "h.json"), keep=3)
+    for s in (100, 1, 2, 3):
+        h.record("|AAA", s)
+    assert h.predict("|AAA") == 2
+    assert h.predict("|BBB") is None
+    h.save()
+    assert RunHistory(str(tmp_path / "h.json")).units["|AAA"][-1]["seconds"] == 3
+
+
+def test_unknown_units_cost_the_median_of_known_ones(tmp_path):
+    h = RunHistory(str(tmp_path / "h.json"))
+    for unit, s in (("a", 1), ("b", 3), ("c", 10)):
+        h.record(unit, s)
+    assert h.costs(["a", "c", "new"]) == {"a": 1, "c": 10, "new": 5.5}
+    assert RunHistory(str(tmp_path / "none.json")).costs(["x", "y"]) == {"x": 1.0, "y": 1.0}
+
+
+def test_lpt_assign_puts_largest_first_on_least_loaded():
+    costs = {"a": 3, "b": 3, "c": 5, "d": 4, "e": 3}
+    bins, makespan = lpt_assign(list(costs), costs, 2)
+    assert bins == [["c", "b"], ["d", "a", "e"]]
+    assert makespan == 10
+    assert lpt_order(["x", "y", "z"], {"x": 1, "y": 1, "z": 1}) == ["x", "y", "z"]
+
+
+def test_lpt_shards_balance_by_history(tmp_path):
+    h = RunHistory(str(tmp_path / "h.json"))
+    for key, s in (("BIG", 90), ("M1", 40), ("M2", 40), ("S1", 5), ("S2", 5)):
+        h.record(f"|{key}", s)
+    projects = [{"key": k, "lead_email": "x@x"} for k in ("S1", "M1", "BIG", "S2", "M2")]
+    shards = [[p["key"] for p in select_shard_lpt(projects, i, 2, h)] for i in (1, 2)]
+    assert shards == [["BIG"], ["S1", "M1", "S2", "M2"]]
+
+
+def test_run_orders_largest_first_and_records_history(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, ["AAA", "BBB", "CCC"])
+    (tmp_path / "run_history.json").write_text(json.dumps({"units": {
+        "|AAA": [{"seconds": 1}], "|BBB": [{"seconds": 50}], "|CCC": [{"seconds": 5}]}}))
+    main.run()
+    assert _FakeJira.calls == ["BBB", "CCC", "AAA"]
+    units = json.loads((tmp_path / "run_history.json").read_text())["units"]
+    assert [len(units[u]) for u in ("|AAA", "|BBB", "|CCC")] == [2, 2, 2]
+    assert units["|AAA"][-1]["issues"] == 1
+    schedule = json.loads((tmp_path / "run_metrics.json").read_text())["schedule"]
+    assert schedule["predicted_makespan_seconds"] == 56
+    assert schedule["units"]["|BBB"]["predicted"] == 50
+
+
+def test_parallel_workers_run_every_project(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA", "BBB", "CCC", "DDD"])
+    main.run(workers=3)
+    assert sorted(_FakeJira.calls) == ["AAA", "BBB", "CCC", "DDD"]
+    assert sorted(sent) == ["aaa@x", "bbb@x", "ccc@x", "ddd@x"]
+
+
+def test_unit_cost_is_split_across_its_query_groups(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    # Not locally evaluable, so the two AAA variants are two separate queries.
+    cfg["projects"] = [{"key": "AAA", "lead_email": "a@x", "jql_extra": "AND priority > Low"},
+                       {"key": "AAA", "lead_email": "b@x", "jql_extra": "AND priority > Medium"},
+                       {"key": "BBB", "lead_email": "c@x"}]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    (tmp_path / "run_history.json").write_text(json.dumps({"units": {
+        "|AAA": [{"seconds": 40}], "|BBB": [{"seconds": 30}]}}))
+    main.run()
+    assert _FakeJira.calls == ["BBB", "AAA", "AAA"]
+    schedule = json.loads((tmp_path / "run_metrics.json").read_text())["schedule"]
+    assert schedule["predicted_makespan_seconds"] == 70
+
+
+def test_history_reads_stage_timings_per_site(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["sites"] = {"eu": {"base_url": "https://eu.example.net"}, "us": {"base_url": "https://us.example.net"}}
+    cfg["projects"] = [{"key": "AAA", "lead_email": "eu@x", "site": "eu"},
+                       {"key": "AAA", "lead_email": "us@x", "site": "us"}]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    real = _FakeJira.get_issues
+
+    def get_issues(self, jql, fields=None):
+        issues = real(self, jql, fields)
+        return issues * 3 if "us." in self.base_url else issues
+
+    monkeypatch.setattr(_FakeJira, "get_issues", get_issues)
+    main.run()
+    units = json.loads((tmp_path / "run_history.json").read_text())["units"]
+    assert (units["eu|AAA"][-1]["issues"], units["us|AAA"][-1]["issues"]) == (1, 3)
+    assert "fetch" in units["us|AAA"][-1]["stages"]
+    m = json.loads((tmp_path / "run_metrics.json").read_text())
+    assert {"AAA|eu@x||eu", "AAA|us@x||us"} <= set(m["projects"])
@@ -0,0 +1,39 @@
+# tests/test_issuestore.py
+from issuestore import IssueStore
+from jira import local_filter
+
+
+def test_fetch_loads_once_and_serves_narrower_field_sets(tmp_path):
+    calls = []
+
+    def loader(jql, fields):
+        calls.append(fields)
+        return [{"key": "A-1", "fields": {"labels": ["x"]}}, {"key": "A-2", "fields": {"labels": []}}]
+
+    store = IssueStore(str(tmp_path))
+    store.fetch("project = A", "key,labels", loader)
+    store.fetch("project = A", "labels", loader)
+    assert calls == ["key,labels"] and (store.hits, store.misses) == (1, 1)
+    # wider field set is a miss
+    store.fetch("project = A", "labels,status", loader)
+    assert len(calls) == 2
+
+    # persisted supersets survive a new process until the TTL expires
+    again = IssueStore(str(tmp_path))
+    issues = again.fetch("project = A", "labels", loader)
+    assert len(calls) == 2
+    assert [i["key"] for i in IssueStore.filter(issues, local_filter("AND labels = x"))] == ["A-1"]
+    assert IssueStore(str(tmp_path), ttl=-1).get("project = A", "labels") is None
+
+
+def test_latest_ignores_the_ttl_and_the_window(tmp_path):
+    store = IssueStore(str(tmp_path))
+    store.put("project = A AND created >= 2025-11-01", "key,labels", [{"key": "A-1"}], scope="eu: A []")
+    store.put("project = A AND created >= 2025-11-08", "key,labels", [{"key": "A-2"}], scope="eu: A []")
+    store.put("project = A AND created >= 2025-11-08", "key,labels", [{"key": "B-1"}], key="us", scope="us: A []")
+    expired = IssueStore(str(tmp_path), ttl=-1)
+    assert expired.get("project = A AND created >= 2025-11-08", "labels") is None
+    issues, fetched_at = expired.latest("eu: A []", "labels")
+    assert issues == [{"key": "A-2"}] and fetched_at > 0
+    assert expired.latest("eu: A []", "labels,status") is None
+    assert expired.latest("eu: A [labels = x]", "labels") is None
@@ -0,0 +1,115 @@
+# tests/test_jira_async.py
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import main
+from benchmarks.standin import StandinJira
+from jira import JiraClient, STRATEGY_PARALLEL, STRATEGY_SEQUENTIAL
+from jira_async import AsyncBackedJiraClient, AsyncJiraClient
+
+
+@pytest.mark.parametrize("n", [40, 600, 2500])
+def test_facade_returns_the_same_issues_as_the_requests_engine(n):
+    with StandinJira(n_issues=n, latency=0) as base:
+        sync = JiraClient(base, "me@x", "t", fetch_concurrency=4).get_issues("project = SUP")
+        jc = AsyncBackedJiraClient(base, "me@x", "t")
+        try:
+            issues = jc.get_issues("project = SUP")
+        finally:
+            jc.close()
+    assert issues == sync
+    assert jc.plan_log[-1].actual == n
+    if n == 2500:
+        assert jc.plan_log[-1].strategy == STRATEGY_PARALLEL and jc.pages == 26
+    if n == 600:
+        assert jc.plan_log[-1].strategy == STRATEGY_SEQUENTIAL
+
+
+def test_many_requests_in_flight_on_one_loop_share_a_bounded_pool():
+    async def go(base):
+        async with AsyncJiraClient(base, "me@x", "t", fetch_concurrency=16) as jc:
+            counts = await jc.get_counts({f"q{i}": "project = SUP" for i in range(200)})
+            logs = await jc.get_changelogs([{"id": str(10000 + i), "key": f"SUP-{i}"} for i in range(1200)])
+            return jc, counts, logs
+
+    with StandinJira(n_issues=1200, latency=0.01) as base:
+        jc, counts, logs = asyncio.run(go(base))
+        sync_logs = JiraClient(base, "me@x", "t").get_changelogs(
+            [{"id": str(10000 + i), "key": f"SUP-{i}"} for i in range(1200)])
+    assert set(counts.values()) == {1200} and len(counts) == 200
+    assert logs == sync_logs
+    assert jc._pool.opened <= 16
+
+
+class _Flaky(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        type(self).hits += 1
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if type(self).hits <= 2:
+            self.send_response(503 if type(self).hits == 1 else 429)
+            self.send_header("Retry-After", "0")
+            self.send_header("X-RateLimit-Remaining", "2")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"count": 7}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_retry_semantics_match_the_requests_engine():
+    _Flaky.hits = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Flaky)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    try:
+        jc = AsyncBackedJiraClient(base, "me@x", "t")
+        assert jc.approximate_count("project = A") == 7
+        jc.close()
+    finally:
+        srv.shutdown()
+    s = jc.http_stats.summary()
+    assert s["requests"] == 1 and s["retries"] == 2
+    assert s["retry_status_codes"] == {"503": 1, "429": 1}
+    assert s["min_rate_limit_remaining"] == 2
+
+
+def test_non_retryable_errors_raise_http_error():
+    with StandinJira(n_issues=1, latency=0) as base:
+        async def go():
+            async with AsyncJiraClient(base, "me@x", "t") as jc:
+                await jc._request("GET", "nope")
+
+        with pytest.raises(requests.HTTPError, match="404"):
+            asyncio.run(go())
+
+
+def test_engine_selection():
+    with StandinJira(n_issues=1, latency=0) as base:
+        jc = AsyncBackedJiraClient(base, "me@x", "t")
+        assert isinstance(jc, JiraClient)
+        jc.close()
+    with pytest.raises(ValueError, match="engine"):
+        main._make_client("curl")
+
+
+def test_engine_refuses_a_host_behind_a_proxy(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.net:3128")
+    monkeypatch.setenv("NO_PROXY", "")
+    with pytest.raises(RuntimeError, match="PROXY"):
+        AsyncJiraClient("https://jira.example.net", "me@x", "t")
+    monkeypatch.setenv("NO_PROXY", "jira.example.net")
+    AsyncJiraClient("https://jira.example.net", "me@x", "t")
@@ -0,0 +1,38 @@
+# tests/test_jira_changelog.py
+from benchmarks.standin import StandinJira
+from issuestore import ChangelogCache
+from jira import JiraClient
+from report import flow_metrics, tag_issues
+
+
+def test_changelogs_are_batched_paged_and_cached(tmp_path):
+    cache = ChangelogCache(str(tmp_path / "changelogs.json"))
+    with StandinJira(n_issues=1200, latency=0) as base:
+        jc = JiraClient(base, "me@x", "t", planning=False, fetch_concurrency=4)
+        issues = jc.get_issues("project = SUP")
+        pages0 = jc.pages
+        logs = jc.get_changelogs(issues, cache=cache)
+        # 2 batches (1000 + 200 issues); the first pages 4x250, the second once
+        assert jc.pages - pages0 == 5
+        assert set(logs) == {i["key"] for i in issues}
+        assert len(logs["SUP-6"]) == 4 and logs["SUP-1"][0]["items"][0]["toString"] == "In Progress"
+        assert logs["SUP-2"] == []
+
+        cache.save()
+        again = ChangelogCache(str(tmp_path / "changelogs.json"))
+        pages1 = jc.pages
+        assert jc.get_changelogs(issues, cache=again) == logs
+        assert jc.pages == pages1 and again.hits == 1200
+
+
+def test_flow_metrics_over_standin_history():
+    with StandinJira(n_issues=300, latency=0) as base:
+        jc = JiraClient(base, "me@x", "t", planning=False)
+        issues = jc.get_issues("project = SUP")
+        logs = jc.get_changelogs(issues)
+    rows = tag_issues(issues, "2025-11-01", "2025-11-07")["rows"]
+    flow = flow_metrics(rows, logs, "2025-11-01", "2025-11-07")
+    c = flow["counts"]
+    assert c["open"] == c["closing_calc"]
+    assert flow["reopened_issues"] == 50  # every 6th of 300
+    assert flow["cycle_time_days"]["n"] == c["resolved"] > 0
@@ -0,0 +1,73 @@
+# tests/test_jira_http.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jira import JiraClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits += 1
+        if type(self).hits == 1:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("X-RateLimit-Remaining", "3")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"issues": [{"key": "A-1", "fields": {}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-RateLimit-Remaining", "9")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+
+
+def test_http_stats_account_for_retries_and_rate_limits(server):
+    jc = JiraClient(server, "me@x", "token", planning=False)
+    issues = jc.get_issues("project = A")
+    assert [i["key"] for i in issues] == ["A-1"]
+
+    s = jc.http_stats.summary()
+    assert s["requests"] == 1                      # one logical request ...
+    assert s["retries"] == 1                       # ... that needed one retry
+    assert s["retry_status_codes"] == {"429": 1}
+    assert s["status_codes"] == {"200": 1}
+    assert s["response_bytes"] > 0 and s["response_bytes"] == jc.bytes_received
+    assert s["min_rate_limit_remaining"] == 3
+    assert s["rate_limit"]["X-RateLimit-Remaining"] == "9"
+    assert sum(s["latency_histogram"].values()) == 1
+    assert "1 retr" in jc.http_stats.format_summary()
+
+
+def test_rate_limiter_allows_burst_then_paces(monkeypatch):
+    from jira import RateLimiter
+    import jira
+
+    now = [100.0]
+    monkeypatch.setattr(jira.time, "monotonic", lambda: now[0])
+    rl = RateLimiter(rate=2, burst=2)
+    assert [rl.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert rl.reserve() == pytest.approx(0.5)
+    assert rl.reserve() == pytest.approx(1.0)
+    now[0] += 2.0
+    assert rl.reserve() == 0.0
@@ -0,0 +1,48 @@
+# tests/test_jira_paging.py
+import json
+
+import pytest
+
+from benchmarks.standin import StandinJira
+from jira import JiraClient, PageSizer, json_decoder, MAX_PAGE_SIZE, MIN_PAGE_SIZE
+
+
+def test_page_sizer_initial_size_follows_fields():
+    assert PageSizer("key").size == MAX_PAGE_SIZE
+    assert PageSizer("*all").size == 100
+    assert PageSizer("summary,status,created").size == 250
+    assert PageSizer("summary", fixed=100).size == 100
+
+
+def test_page_sizer_learns_server_cap_and_byte_budget():
+    s = PageSizer("summary,status", target_bytes=100_000)
+    s.observe(requested=250, returned=100, nbytes=50_000, has_more=True)  # server capped at 100
+    assert s.server_cap == 100 and s.size == 100
+    s = PageSizer("summary,status", target_bytes=100_000)
+    s.observe(requested=250, returned=250, nbytes=250_000, has_more=True)  # 1000 B/issue -> 100
+    assert s.size == 100
+    s.observe(requested=100, returned=100, nbytes=100, has_more=True)      # tiny issues -> grow <= 4x
+    assert s.size == 400
+    s = PageSizer("summary", target_bytes=1)
+    s.observe(requested=250, returned=250, nbytes=10**7, has_more=True)
+    assert s.size == MIN_PAGE_SIZE
+
+
+def test_json_decoder_fallback_and_validation():
+    assert json_decoder("json") is json.loads
+    assert json_decoder("auto")(b'{"a": 1}') == {"a": 1}
+    with pytest.raises(ValueError):
+        json_decoder("yaml")
+
+
+def test_adaptive_paging_and_gzip_against_standin():
+    with StandinJira(n_issues=2500, latency=0) as base:
+        fixed = JiraClient(base, "me@x", "t", page_size=100, planning=False)
+        adaptive = JiraClient(base, "me@x", "t", planning=False)
+        a = fixed.get_issues("project = SUP")
+        b = adaptive.get_issues("project = SUP")
+    assert [i["key"] for i in a] == [i["key"] for i in b] and len(b) == 2500
+    assert fixed.pages == 25
+    assert adaptive.pages < fixed.pages
+    s = adaptive.http_stats.summary()
+    assert s["wire_bytes"] < s["response_bytes"]  # gzip negotiated
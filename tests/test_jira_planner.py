@@ -0,0 +1,73 @@
+# tests/test_jira_planner.py
+from benchmarks.standin import StandinJira
+from jira import (JiraClient, STRATEGY_COUNT_ONLY, STRATEGY_PARALLEL, STRATEGY_SEQUENTIAL,
+                  STRATEGY_SINGLE_PAGE, WANTED_FIELDS, page_cap)
+
+
+def _fetch(n, **kw):
+    with StandinJira(n_issues=n, latency=0) as base:
+        jc = JiraClient(base, "me@x", "t", **kw)
+        issues = jc.get_issues("project = SUP")
+    return jc, issues
+
+
+def test_small_result_is_a_single_page():
+    jc, issues = _fetch(40)
+    plan = jc.plan_log[-1]
+    assert plan.strategy == STRATEGY_SINGLE_PAGE and plan.estimate == 40 and plan.actual == 40
+    assert jc.pages == 1
+
+
+def test_medium_result_pages_sequentially():
+    jc, issues = _fetch(600)
+    assert jc.plan_log[-1].strategy == STRATEGY_SEQUENTIAL
+    assert len(issues) == 600
+
+
+def test_large_result_uses_parallel_bulk_fetch():
+    jc, issues = _fetch(2500, fetch_concurrency=4)
+    plan = jc.plan_log[-1]
+    assert plan.strategy == STRATEGY_PARALLEL and plan.actual == 2500
+    assert [i["key"] for i in issues] == [f"SUP-{i}" for i in range(2500)]
+    assert issues[0]["fields"]["summary"].startswith("Synthetic issue 0")
+    # 1 id-only page (<= 5000) + 25 bulk fetches of 100
+    assert jc.pages == 26
+
+
+def test_count_only_plan_and_fallback_without_count_endpoint(monkeypatch):
+    with StandinJira(n_issues=10, latency=0) as base:
+        jc = JiraClient(base, "me@x", "t")
+        assert jc.plan_fetch("project = SUP", count_only=True).strategy == STRATEGY_COUNT_ONLY
+
+        def broken(jql):
+            raise RuntimeError("404")
+
+        monkeypatch.setattr(jc, "approximate_count", broken)
+        assert jc.plan_fetch("project = SUP").strategy == STRATEGY_SEQUENTIAL
+        assert len(jc.get_issues("project = SUP")) == 10
+
+
+def test_expected_requests_match_a_server_that_caps_rich_pages_at_100():
+    for n, pages in ((240, 3), (1500, 15)):
+        with StandinJira(n_issues=n, latency=0, rich_cap=100) as base:
+            jc = JiraClient(base, "me@x", "t", fetch_concurrency=1)
+            predicted = jc.expected_requests(jc.plan_fetch("project = SUP"))
+            jc.get_issues("project = SUP")
+        assert predicted == jc.pages == pages
+
+
+def test_single_page_and_first_page_respect_the_rich_page_cap():
+    with StandinJira(n_issues=150, latency=0, rich_cap=100) as base:
+        jc = JiraClient(base, "me@x", "t")
+        jc.get_issues("project = SUP")
+        assert jc.plan_log[-1].strategy == STRATEGY_SEQUENTIAL and jc.pages == 2
+        assert jc.plan_fetch("project = SUP AND labels = x").strategy == STRATEGY_SEQUENTIAL
+    with StandinJira(n_issues=90, latency=0, rich_cap=100) as base:
+        jc = JiraClient(base, "me@x", "t")
+        jc.get_issues("project = SUP")
+        assert jc.plan_log[-1].strategy == STRATEGY_SINGLE_PAGE and jc.pages == 1
+    # Once Jira has returned bigger pages for the field set, the planner trusts them.
+    with StandinJira(n_issues=600, latency=0) as base:
+        jc = JiraClient(base, "me@x", "t")
+        jc.get_issues("project = SUP")
+    assert page_cap(WANTED_FIELDS) == 100 and page_cap(WANTED_FIELDS, jc.page_caps) > 100
@@ -21,3 +21,13 @@ def test_jql_resolved_date_build():
 def test_jql_open_asof_end_build():
     j = JiraClient.build_jql_open_asof_end("SUP", end="2025-11-07")
     assert 'created <= "2025-11-07"' in j and 'resolved > "2025-11-07"' in j
+
+
+def test_count_terms_use_inclusive_end_plus_one():
+    t = JiraClient.build_jql_count_terms("SUP", start="2025-11-01", end="2025-11-07", extra_filters='issuetype = "Bug"')
+    assert set(t) == {"created", "resolved", "open_start", "open"}
+    assert 'created >= "2025-11-01" AND created < "2025-11-08"' in t["created"]
+    assert 'resolved < "2025-11-08" AND resolved IS NOT EMPTY' in t["resolved"]
+    assert 'created < "2025-11-01" AND (resolved IS EMPTY OR resolved >= "2025-11-01")' in t["open_start"]
+    assert 'created < "2025-11-08" AND (resolved IS EMPTY OR resolved >= "2025-11-08")' in t["open"]
+    assert all(j.startswith("project = SUP AND ") and j.endswith(' AND issuetype = "Bug"') for j in t.values())
@@ -0,0 +1,106 @@
+# tests/test_jql_model.py
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from jira import (And, Cmp, IsEmpty, JiraClient, JqlExpr, Or, Raw, UnsupportedJql, jql_fields, local_filter, parse_jql,
+                  simplify)
+from report import tag_issues
+
+START, END = "2025-11-01", "2025-11-07"
+
+
+def _ts(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def _random_issues(n, seed):
+    rng = random.Random(seed)
+    base = datetime(2025, 10, 25)
+    out = []
+    for i in range(n):
+        # Whole days plus a bias towards midnight so the window edges get exercised.
+        created = base + timedelta(days=rng.randint(0, 20), minutes=rng.choice([0, 0, 1, rng.randint(0, 1439)]))
+        f = {"created": _ts(created), "resolutiondate": None}
+        if rng.random() < 0.6:
+            resolved = created + timedelta(days=rng.randint(0, 10), minutes=rng.choice([0, rng.randint(0, 1439)]))
+            f["resolutiondate"] = _ts(resolved)
+        out.append({"key": f"SUP-{i}", "fields": f})
+    return out
+
+
+def test_simplified_union_selects_same_issues_as_three_branch_form():
+    full = JiraClient.union_window_expr("SUP", start=START, end=END)
+    simple = simplify(full)
+    assert len(simple.to_jql()) < len(full.to_jql())
+    for seed in range(5):
+        for issue in _random_issues(300, seed):
+            assert full.matches(issue) == simple.matches(issue), issue
+
+
+def test_simplified_union_matches_tag_issues_flags():
+    simple = simplify(JiraClient.union_window_expr("SUP", start=START, end=END))
+    issues = _random_issues(500, 42)
+    rows = tag_issues(issues, START, END)["rows"]
+    flagged = {r["key"] for r in rows if r["created_in_window"] or r["resolved_in_window"] or r["open_at_end"]}
+    assert {i["key"] for i in issues if simple.matches(i)} == flagged
+
+
+def test_simplify_flattens_and_dedupes():
+    a = Cmp("status", "=", "Done")
+    e = And(a, And(a, IsEmpty("assignee")), Or(Cmp("labels", "=", "x")))
+    assert simplify(e).to_jql() == 'status = "Done" AND assignee IS EMPTY AND labels = "x"'
+
+
+def test_simplify_drops_redundant_is_not_empty():
+    e = And(Cmp("resolved", ">=", START), IsEmpty("resolved", negated=True))
+    assert simplify(e).to_jql() == 'resolved >= "2025-11-01"'
+
+
+def test_simplified_builder_keeps_or_extras_grouped():
+    j = JiraClient.build_jql_union_window("SUP", start=START, end=END,
+                                          extra_filters="AND labels = a OR labels = b", simplified=True)
+    assert j.startswith("(project = SUP AND ") and j.endswith("OR labels = b)")
+    j = JiraClient.build_jql_union_window("SUP", start=START, end=END,
+                                          extra_filters='issuetype in ("Bug", "OR")', simplified=True)
+    assert j.endswith('AND issuetype in ("Bug", "OR")')
+    assert Raw("a = 1 OR b = 2").to_jql() == "(a = 1 OR b = 2)"
+
+
+def _rich(**fields):
+    base = {"created": "2025-11-02T10:00:00.000+0000", "resolutiondate": None}
+    base.update(fields)
+    return {"key": "SUP-1", "fields": base}
+
+
+def test_parse_round_trips_config_builder_output():
+    text = 'issuetype in ("Bug", "Task") AND priority in ("High") AND (labels = x OR component IS EMPTY)'
+    assert parse_jql(text).to_jql() == text
+
+
+def test_local_evaluation_of_builder_subset():
+    expr = local_filter('AND issuetype in ("bug") AND priority != Low AND component = "API" AND assignee IS NOT EMPTY')
+    issue = _rich(issuetype={"name": "Bug"}, priority={"name": "High"}, components=[{"name": "api"}],
+                  assignee={"accountId": "abc", "displayName": "Ann"})
+    assert expr.matches(issue)
+    issue["fields"]["priority"] = {"name": "Low"}
+    assert not expr.matches(issue)
+    assert local_filter('AND assignee = "abc"').matches(issue)
+    assert local_filter("AND resolution = EMPTY AND created < 2025-11-03").matches(issue)
+    assert not local_filter("AND labels in (x, y)").matches(issue)
+
+
+def test_local_filter_rejects_what_it_cannot_evaluate():
+    for extra in ["AND summary ~ foo", "AND assignee = currentUser()", "AND a = 1 OR labels = x",
+                  "OR labels = x", "AND customfield_10010 = 3", "AND NOT labels = x",
+                  "AND priority > High", "AND created in (2025-11-01)", "AND created > someday"]:
+        with pytest.raises(UnsupportedJql):
+            local_filter(extra)
+    assert local_filter("   ") is None
+    assert jql_fields(local_filter("AND component = a AND resolved >= 2025-11-01")) == ["components", "resolutiondate"]
+
+
+def test_jql_expr_is_abstract():
+    with pytest.raises(TypeError):
+        JqlExpr()
@@ -0,0 +1,76 @@
+# tests/test_mailer.py
+import time
+
+from mailer import _table, _esc
+
+
+def _row(key, summary="s", status="Open", assignee="Ann", resolution=None):
+    f = {
+        "summary": summary,
+        "status": {"name": status},
+        "assignee": {"displayName": assignee},
+        "created": "2025-11-01T10:00:00.000+0000",
+    }
+    if resolution:
+        f["resolution"] = {"name": resolution}
+        f["resolutiondate"] = "2025-11-03T10:00:00.000+0000"
+    return {"key": key, "fields": f}
+
+
+def test_esc_covers_html_metacharacters():
+    assert _esc("<a href=\"x\">&'</a>") == "&lt;a href=&quot;x&quot;&gt;&amp;&#x27;&lt;/a&gt;"
+
+
+def test_table_escapes_every_user_field():
+    row = _row("A-1", summary="<b>bold</b>", status="<i>", assignee="O'Neil & Co", resolution="Won't <fix>")
+    html = _table([row], "Top <1>")
+    assert "<b>bold</b>" not in html and "&lt;b&gt;bold&lt;/b&gt;" in html
+    assert "&lt;i&gt;" in html
+    assert "O&#x27;Neil &amp; Co" in html
+    assert "Won&#x27;t &lt;fix&gt;" in html
+    assert "<h3>Top &lt;1&gt;</h3>" in html
+
+
+def test_table_empty_and_missing_fields():
+    assert _table([], "Nothing") == "<h3>Nothing</h3><p>No issues.</p>"
+    html = _table([{"key": "A-2", "fields": {"assignee": None}}], "t")
+    assert html.count("<tr>") == 2  # header + one row
+    assert "<td>—</td>" in html
+
+
+def test_table_renders_10k_rows_within_budget():
+    rows = [_row(f"P-{i}", summary=f"Summary <{i}> & more") for i in range(10_000)]
+    t0 = time.perf_counter()
+    html = _table(rows, "big")
+    elapsed = time.perf_counter() - t0
+    assert html.count("<tr>") == 10_001
+    # Linear single-pass rendering: 10k rows is ~tens of ms; keep a generous ceiling for CI noise.
+    assert elapsed < 1.0
+
+
+def test_assignee_message_headers_and_escaping():
+    from mailer import build_assignee_message
+
+    msg = build_assignee_message("ann@x", "Ann <A>", "SUP", "2025-11-01 to 2025-11-07",
+                                 [_row("A-1")], {"created": 1, "resolved": 0, "open": 1})
+    assert msg["To"] == "ann@x"
+    assert msg["Subject"] == "Your Jira Issues — SUP — 2025-11-01 to 2025-11-07"
+    html = msg.get_payload()[0].get_payload()[0].get_payload(decode=True).decode("utf-8")
+    assert "Ann &lt;A&gt;" in html and "A-1" in html
+
+
+def test_count_only_report_has_no_table_or_csv():
+    from mailer import build_report_message
+
+    msg = build_report_message("a@x", "SUP", "w", [], {"created": 3, "resolved": 1, "open_start": 5, "open": 7},
+                               show_top_n=0, include_csv=False, count_only=True)
+    parts = msg.get_payload()
+    assert len(parts) == 1  # html only, no CSV attachment
+    html = parts[0].get_payload()[0].get_payload(decode=True).decode("utf-8")
+    assert "Headline counts only" in html and "approximate" in html and "<table" not in html
+    assert "7 = 5 + 3 − 1" in html
+
+
+def test_table_links_point_at_the_given_site():
+    html = _table([_row("SUP-1")], "Issues", base_url="https://eu.example.net")
+    assert "href='https://eu.example.net/browse/SUP-1'" in html
@@ -0,0 +1,301 @@
+# tests/test_main.py
+import json
+
+import pytest
+
+import main
+from jira import JiraClient, JiraHttpStats
+
+
+def _issue(key, created="2025-11-02T10:00:00.000+0000"):
+    return {"key": key, "fields": {"created": created, "summary": key}}
+
+
+class _FakeJira(JiraClient):
+    calls = []
+    fail_keys = set()
+    issues = {}
+    deadline = None
+
+    def __init__(self, *a, **k):
+        self.base_url = a[0] if a else None
+        self.http_stats = JiraHttpStats()
+        self.plan_log = []
+        self.page_caps = {}
+        self.pages = 0
+        self.bytes_received = 0
+        self.page_size = None
+        self.fetch_concurrency = 8
+
+    def close(self):
+        pass
+
+    def get_counts(self, jqls):
+        _FakeJira.calls.append(("counts", sorted(jqls)))
+        return {"created": 3, "resolved": 1, "open_start": 5, "open": 7}
+
+    def get_issues(self, jql, fields=None):
+        key = jql.split()[2]
+        _FakeJira.calls.append(key)
+        if key in _FakeJira.fail_keys:
+            raise RuntimeError("Jira 500")
+        self.pages += 1
+        self.bytes_received += 100
+        return _FakeJira.issues.get(key) or [_issue(f"{key}-1")]
+
+
+def _setup(monkeypatch, tmp_path, keys, **report):
+    cfg = {
+        "report": {"window": {"mode": "custom_range", "start": "2025-11-01", "end": "2025-11-07"}, **report},
+        "projects": [{"key": k, "lead_email": f"{k.lower()}@x"} for k in keys],
+    }
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "CONFIG_PATH", str(tmp_path / "config.json"))
+    monkeypatch.setattr(main, "JiraClient", _FakeJira)
+    _FakeJira.calls = []
+    _FakeJira.fail_keys = set()
+    _FakeJira.issues = {}
+    sent = []
+
+    def fake_sender(batch_size=0):
+        def send(frm, to, raw):
+            sent.extend(to)
+        send.close = lambda: None
+        return send
+
+    monkeypatch.setattr(main, "smtp_sender", fake_sender)
+    return sent
+
+
+def test_resume_only_redoes_failed_projects(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA", "BBB", "CCC"])
+    _FakeJira.fail_keys = {"BBB"}
+    with pytest.raises(RuntimeError, match="BBB"):
+        main.run()
+    assert sorted(sent) == ["aaa@x", "ccc@x"]
+
+    _FakeJira.calls = []
+    _FakeJira.fail_keys = set()
+    main.run()
+    assert _FakeJira.calls == ["BBB"]
+    assert sorted(sent) == ["aaa@x", "bbb@x", "ccc@x"]
+
+
+def test_cli_overrides_window_and_projects(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA", "BBB"])
+    main.main(["--start", "2025-10-01", "--end", "2025-10-07", "--projects", "bbb"])
+    assert _FakeJira.calls == ["BBB"] and sent == ["bbb@x"]
+    state_files = list((tmp_path / ".runstate").iterdir())
+    assert len(state_files) == 1 and "2025-10-01_2025-10-07" in state_files[0].name
+
+
+def test_start_without_end_is_rejected(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, ["AAA"])
+    with pytest.raises(ValueError):
+        main.main(["--start", "2025-10-01"])
+
+
+def test_run_writes_stage_metrics(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, ["AAA"])
+    main.run()
+    m = json.loads((tmp_path / "run_metrics.json").read_text())
+    proj = m["projects"]["AAA|aaa@x|"]
+    assert set(proj["stages"]) >= {"fetch", "tag", "render", "spool"}
+    assert proj["counters"]["pages"] == 1 and proj["counters"]["bytes_received"] == 100
+    assert proj["counters"]["issues"] == 1
+    assert "deliver" in m["projects"]["_run"]["stages"]
+
+
+def test_count_only_mode_skips_issue_download(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA"], show_top_n=0, include_csv_attachment=False)
+    main.run()
+    assert _FakeJira.calls == [("counts", ["created", "open", "open_start", "resolved"])]
+    assert sent == ["aaa@x"]
+
+
+def test_filter_variants_share_one_superset_fetch(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["projects"] = [
+        {"key": "AAA", "lead_email": "bugs@x", "jql_extra": 'AND issuetype in ("Bug")'},
+        {"key": "AAA", "lead_email": "ui@x", "jql_extra": "AND labels = ui"},
+    ]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    bug, ui = _issue("AAA-1"), _issue("AAA-2")
+    bug["fields"].update(issuetype={"name": "Bug"}, labels=[])
+    ui["fields"].update(issuetype={"name": "Task"}, labels=["UI"])
+    _FakeJira.issues = {"AAA": [bug, ui]}
+    main.run()
+    assert _FakeJira.calls == ["AAA"]
+    assert sorted(sent) == ["bugs@x", "ui@x"]
+    m = json.loads((tmp_path / "run_metrics.json").read_text())
+    # One fetch, but each recipient's report keeps its own metrics.
+    bugs, ui = m["projects"]['AAA|bugs@x|AND issuetype in ("Bug")'], m["projects"]["AAA|ui@x|AND labels = ui"]
+    assert (bugs["counters"]["pages"], ui["counters"]["pages"]) == (1, 0)
+    assert bugs["counters"]["issues"] == ui["counters"]["issues"] == 1
+    run = json.loads((tmp_path / "run_history.json").read_text())["units"]["|AAA"][-1]
+    assert run["issues"] == 2 and "fetch" in run["stages"]
+
+
+def test_variant_with_operator_the_local_filter_cannot_evaluate_queries_separately(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["projects"] = [
+        {"key": "AAA", "lead_email": "bugs@x", "jql_extra": 'AND issuetype in ("Bug")'},
+        {"key": "AAA", "lead_email": "urgent@x", "jql_extra": "AND priority > Medium"},
+    ]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    main.run()
+    assert _FakeJira.calls == ["AAA", "AAA"]
+    assert sorted(sent) == ["bugs@x", "urgent@x"]
+
+
+def test_filter_variants_for_one_lead_each_send_their_email(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["projects"] = [
+        {"key": "AAA", "lead_email": "lead@x", "jql_extra": 'AND issuetype in ("Bug")'},
+        {"key": "AAA", "lead_email": "lead@x", "jql_extra": "AND labels = ui"},
+    ]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    main.run()
+    assert sent == ["lead@x", "lead@x"]
+    state = json.loads(next((tmp_path / ".runstate").glob("*.json")).read_text())
+    ids = [i for p in state["projects"].values() for i in p["spool_ids"]]
+    assert len(ids) == 2 and len(set(ids)) == 2
+
+
+def test_duplicate_queries_are_fetched_once(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["projects"] = [
+        {"key": "AAA", "lead_email": "a@x"},
+        {"key": "AAA", "lead_email": "b@x"},
+        {"key": "BBB", "lead_email": "c@x"},
+    ]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    main.run()
+    assert _FakeJira.calls == ["AAA", "BBB"]
+    assert sorted(sent) == ["a@x", "b@x", "c@x"]
+
+
+def test_dry_run_prints_plan_without_side_effects(monkeypatch, tmp_path, capsys):
+    sent = _setup(monkeypatch, tmp_path, ["AAA", "BBB"])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["projects"].append({"key": "AAA", "lead_email": "other@x"})
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    monkeypatch.setattr(_FakeJira, "approximate_count", lambda self, jql: 12000, raising=False)
+    main.main(["--dry-run"])
+    out = capsys.readouterr().out
+    assert "3 report(s) from 2 distinct query(ies)" in out
+    # per query: 1 count + 3 id pages (5000) + 120 bulk fetches (100)
+    assert "Expected Jira requests: 248" in out
+    assert _FakeJira.calls == [] and sent == []
+    assert not (tmp_path / ".spool").exists()
+
+
+def test_window_list_fetches_widest_union_once(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, ["AAA"])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["report"]["window"] = [
+        {"mode": "custom_range", "start": "2025-11-01", "end": "2025-11-07"},
+        {"mode": "custom_range", "start": "2025-11-01", "end": "2025-11-30"},
+    ]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    _FakeJira.issues = {"AAA": [_issue("AAA-1"), _issue("AAA-2", created="2025-11-20T10:00:00.000+0000")]}
+    rendered = {}
+    real = main.build_report_message
+
+    def spy(to, key, label, rows, counts, **kw):
+        rendered[label] = ([r["key"] for r in rows], counts["created"])
+        return real(to, key, label, rows, counts, **kw)
+
+    monkeypatch.setattr(main, "build_report_message", spy)
+    main.run()
+    assert _FakeJira.calls == ["AAA"]
+    assert sent == ["aaa@x", "aaa@x"]
+    assert rendered == {
+        "2025-11-01 to 2025-11-07": (["AAA-1"], 1),
+        "2025-11-01 to 2025-11-30": (["AAA-1", "AAA-2"], 2),
+    }
+    # per-window checkpoints: a re-run has nothing left to do
+    _FakeJira.calls = []
+    main.run()
+    assert _FakeJira.calls == []
+
+
+def test_same_key_on_two_sites_is_fetched_per_site(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["sites"] = {"eu": {"base_url": "https://eu.example.net", "concurrency": 2},
+                    "us": {"base_url": "https://us.example.net", "email_env": "US_EMAIL", "rate_limit": 5}}
+    cfg["projects"] = [{"key": "SUP", "lead_email": "eu@x", "site": "eu"},
+                       {"key": "SUP", "lead_email": "us@x", "site": "us"}]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    links = {}
+    real = main.build_report_message
+
+    def spy(to, key, label, rows, counts, **kw):
+        links[to] = kw["base_url"]
+        return real(to, key, label, rows, counts, **kw)
+
+    monkeypatch.setattr(main, "build_report_message", spy)
+    main.run()
+    assert _FakeJira.calls == ["SUP", "SUP"]
+    assert sorted(sent) == ["eu@x", "us@x"]
+    assert links == {"eu@x": "https://eu.example.net", "us@x": "https://us.example.net"}
+    http = json.loads((tmp_path / "run_metrics.json").read_text())["http"]
+    assert sorted(http) == ["eu", "us"]
+
+
+def test_same_key_on_two_sites_for_one_lead_sends_two_emails(monkeypatch, tmp_path):
+    sent = _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["sites"] = {"eu": {"base_url": "https://eu.example.net"}, "us": {"base_url": "https://us.example.net"}}
+    cfg["default_site"] = "eu"
+    cfg["projects"] = [{"key": "SUP", "lead_email": "lead@x"}, {"key": "SUP", "lead_email": "lead@x", "site": "us"}]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    main.run()
+    assert sent == ["lead@x", "lead@x"]
+    assert not list((tmp_path / ".spool").glob("*.tmp"))
+
+
+def test_superset_cache_is_per_site(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["sites"] = {"eu": {"base_url": "https://eu.example.net"}, "us": {"base_url": "https://us.example.net"}}
+    cfg["projects"] = [{"key": "AAA", "lead_email": f"{site}-{v}@x", "site": site, "jql_extra": f"AND labels = {v}"}
+                       for site in ("eu", "us") for v in ("a", "b")]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+
+    def get_issues(self, jql, fields=None):
+        _FakeJira.calls.append(self.base_url)
+        site = "eu" if "eu." in self.base_url else "us"
+        issues = [_issue(f"AAA-{site}-{v}") for v in ("a", "b")]
+        for i, v in zip(issues, ("a", "b")):
+            i["fields"]["labels"] = [v]
+        return issues
+
+    monkeypatch.setattr(_FakeJira, "get_issues", get_issues)
+    seen = {}
+    real = main.build_report_message
+
+    def spy(to, key, label, rows, counts, **kw):
+        seen[to] = [r["key"] for r in rows]
+        return real(to, key, label, rows, counts, **kw)
+
+    monkeypatch.setattr(main, "build_report_message", spy)
+    main.run()
+    assert sorted(_FakeJira.calls) == ["https://eu.example.net", "https://us.example.net"]
+    assert seen == {f"{site}-{v}@x": [f"AAA-{site}-{v}"] for site in ("eu", "us") for v in ("a", "b")}
+
+
+def test_unknown_site_is_rejected(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["sites"] = {"eu": {"base_url": "https://eu.example.net"}, "us": {"base_url": "https://us.example.net"}}
+    cfg["projects"] = [{"key": "SUP", "lead_email": "eu@x"}]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    with pytest.raises(ValueError, match="unknown site"):
+        main.run()
@@ -0,0 +1,30 @@
+# tests/test_metrics.py
+import json
+
+from metrics import RunMetrics
+
+
+def test_stage_and_counters_accumulate():
+    m = RunMetrics()
+    with m.stage("SUP", "fetch"):
+        pass
+    with m.stage("SUP", "fetch"):
+        pass
+    m.add("SUP", "pages", 2)
+    m.add("SUP", "pages", 3)
+    s = m.summary()["projects"]["SUP"]
+    assert s["counters"]["pages"] == 5
+    assert s["stages"]["fetch"] >= 0 and s["wall_seconds"] == s["stages"]["fetch"]
+
+
+def test_write_json_and_prometheus(tmp_path):
+    m = RunMetrics()
+    with m.stage('A"B', "render"):
+        pass
+    m.set('A"B', "issues", 7)
+    j = json.loads(open(m.write(str(tmp_path / "out.json"))).read())
+    assert j["projects"]['A"B']["counters"]["issues"] == 7
+    prom = open(m.write(str(tmp_path / "out.prom"))).read()
+    assert 'jira_report_project_counter{project="A\\"B",name="issues"} 7' in prom
+    assert 'jira_report_stage_seconds{project="A\\"B",stage="render"}' in prom
+    assert "jira_report_peak_rss_bytes" in prom
@@ -0,0 +1,21 @@
+# tests/test_planner.py
+from planner import ExecutionPlan, normalize_jql
+
+
+def test_normalize_ignores_order_quoting_and_case():
+    a = 'project = SUP AND issuetype in ("Bug", "Task") AND created < "2025-11-08"'
+    b = 'created < 2025-11-08 and Issuetype IN (Task, Bug) AND project = "SUP"'
+    assert normalize_jql(a) == normalize_jql(b)
+    assert normalize_jql("text ~  'x'   AND project = A") == "text ~ 'x' AND project = A"
+
+
+def test_plan_groups_consumers_by_query_and_fields():
+    plan = ExecutionPlan()
+    plan.add("A|a@x|", {"key": "A", "lead_email": "a@x"}, "project = A", "key,summary")
+    plan.add("A|b@x|", {"key": "A", "lead_email": "b@x"}, 'project = "A"', "summary,key")
+    plan.add("A|c@x|", {"key": "A", "lead_email": "c@x"}, "project = A", "key,labels")
+    assert [len(q.consumers) for q in plan.queries.values()] == [2, 1]
+    assert plan.expected_total() is None
+    for q in plan.queries.values():
+        q.expected_requests = 2
+    assert plan.expected_total() == 4 and "Expected Jira requests: 4" in plan.format()
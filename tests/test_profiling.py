@@ -0,0 +1,56 @@
+# tests/test_profiling.py
+import contextlib
+import json
+import pstats
+import threading
+import tracemalloc
+
+import main
+from profiling import profiling_run, project_profiler
+from tests.test_main import _FakeJira, _setup
+
+
+def test_profiler_is_noop_when_disabled():
+    assert isinstance(project_profiler("SUP", ""), contextlib.nullcontext)
+
+
+def test_profiler_writes_prof_and_allocation_report(tmp_path):
+    with project_profiler("SUP / main", str(tmp_path)):
+        data = [str(i) * 10 for i in range(20_000)]
+    assert data
+    prof = tmp_path / "SUP_main.prof"
+    alloc = tmp_path / "SUP_main.alloc.txt"
+    assert prof.exists() and alloc.exists()
+    pstats.Stats(str(prof))  # loadable
+    text = alloc.read_text()
+    assert "peak=" in text and "test_profiling.py" in text
+
+
+def test_profiling_run_traces_once_across_project_profilers(tmp_path):
+    with profiling_run(str(tmp_path)):
+        for name in ("AAA", "BBB"):
+            with project_profiler(name, str(tmp_path)):
+                [str(i) for i in range(1000)]
+            assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert (tmp_path / "AAA.alloc.txt").exists() and (tmp_path / "BBB.alloc.txt").exists()
+
+
+def test_profiled_run_is_single_threaded(monkeypatch, tmp_path):
+    _setup(monkeypatch, tmp_path, [])
+    cfg = json.loads((tmp_path / "config.json").read_text())
+    cfg["sites"] = {"eu": {"base_url": "https://eu.example.net"}, "us": {"base_url": "https://us.example.net"}}
+    cfg["projects"] = [{"key": k, "lead_email": f"{k.lower()}@x", "site": s}
+                       for k, s in (("AAA", "eu"), ("BBB", "eu"), ("CCC", "us"))]
+    (tmp_path / "config.json").write_text(json.dumps(cfg))
+    threads = []
+    real = _FakeJira.get_issues
+
+    def get_issues(self, jql, fields=None):
+        threads.append(threading.current_thread().name)
+        return real(self, jql, fields)
+
+    monkeypatch.setattr(_FakeJira, "get_issues", get_issues)
+    main.run(workers=4, profile_dir=str(tmp_path / "prof"))
+    assert threads == [threading.main_thread().name] * 3
+    assert len(list((tmp_path / "prof").glob("*.alloc.txt"))) == 3
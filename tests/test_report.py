@@ -26,3 +26,59 @@ def test_format_report_inclusive_edges():
     assert {i["key"] for i in b["created"]} == {"B-1", "B-2", "B-3"}
     assert {i["key"] for i in b["resolved"]} == {"B-3"}
     assert {i["key"] for i in b["open"]} == {"B-1", "B-2"}
+
+
+def test_group_by_assignee_single_pass_counts():
+    from report import tag_issues, group_by_assignee
+
+    def _a(key, created, resolved, who):
+        f = {"created": created, "resolved": resolved}
+        if who:
+            f["assignee"] = {"accountId": who, "displayName": who.upper(), "emailAddress": f"{who}@x"}
+        return {"key": key, "fields": f}
+
+    issues = [
+        _a("A-1", "2025-11-02T10:00:00.000+0000", None, "ann"),
+        _a("A-2", "2025-10-01T10:00:00.000+0000", "2025-11-03T10:00:00.000+0000", "ann"),
+        _a("A-3", "2025-11-04T10:00:00.000+0000", None, "bob"),
+        _a("A-4", "2025-11-04T10:00:00.000+0000", None, None),                        # unassigned
+        _a("A-5", "2025-09-01T10:00:00.000+0000", "2025-09-03T10:00:00.000+0000", "bob"),  # outside window
+    ]
+    rows = tag_issues(issues, "2025-11-01", "2025-11-07")["rows"]
+    g = group_by_assignee(rows)
+    assert set(g) == {"ann", "bob"}
+    assert g["ann"]["counts"] == {"created": 1, "resolved": 1, "open": 1}
+    assert g["ann"]["email"] == "ann@x" and g["ann"]["name"] == "ANN"
+    assert [r["key"] for r in g["bob"]["rows"]] == ["A-3"]
+
+
+def test_flow_metrics_keeps_identity_for_reopened_issues():
+    from report import flow_metrics, tag_issues
+
+    def ch(ts, field, frm, to):
+        return {"created": ts, "items": [{"fieldId": field, "fromString": frm, "toString": to, "to": to}]}
+
+    issues = [
+        # resolved before the window, reopened and re-resolved inside it
+        {"key": "R-1", "fields": {"created": "2025-10-20T09:00:00.000+0000",
+                                  "resolutiondate": "2025-11-05T09:00:00.000+0000", "resolution": {"name": "Done"}}},
+        # created in window, started, resolved, reopened -> open at end
+        {"key": "R-2", "fields": {"created": "2025-11-02T09:00:00.000+0000", "resolutiondate": None}},
+    ]
+    logs = {
+        "R-1": [ch("2025-10-25T09:00:00.000+0000", "resolution", None, "Done"),
+                ch("2025-11-03T09:00:00.000+0000", "resolution", "Done", None),
+                ch("2025-11-04T09:00:00.000+0000", "status", "To Do", "In Progress"),
+                ch("2025-11-05T09:00:00.000+0000", "resolution", None, "Done")],
+        "R-2": [ch("2025-11-02T10:00:00.000+0000", "status", "To Do", "In Progress"),
+                ch("2025-11-03T09:00:00.000+0000", "resolution", None, "Done"),
+                ch("2025-11-04T09:00:00.000+0000", "resolution", "Done", None)],
+    }
+    rows = tag_issues(issues, "2025-11-01", "2025-11-07")["rows"]
+    flow = flow_metrics(rows, logs, "2025-11-01", "2025-11-07")
+    assert flow["counts"] == {"created": 1, "resolved": 2, "reopened": 2, "open_start": 0, "open": 1,
+                              "closing_calc": 1}
+    assert [r["reopens"] for r in rows] == [1, 1]
+    assert flow["cycle_time_days"] == {"n": 1, "median": 1.0, "p85": 1.0}
+    assert flow["lead_time_days"]["median"] == 16.0
+    assert flow["time_in_status_hours"] == {"To Do": 360.0, "In Progress": 24.0}
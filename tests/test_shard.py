@@ -0,0 +1,73 @@
+# tests/test_shard.py
+import json
+
+import pytest
+
+import main
+from shard import ShardResults, format_digest, merge_results, parse_shard, select_shard, shard_of
+from tests.test_main import _FakeJira, _setup
+
+
+def _projects(n):
+    return [{"key": f"P{i}", "lead_email": f"p{i}@x"} for i in range(n)]
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "x", "1/0"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_shards_partition_projects_and_adding_projects_moves_none():
+    before = _projects(200)
+    owner = {p["key"]: shard_of(p["key"], 4) for p in before}
+    parts = [select_shard(before, i, 4, unit=lambda p: p["key"]) for i in range(1, 5)]
+    assert sorted(p["key"] for part in parts for p in part) == sorted(owner)
+    assert all(20 < len(part) < 80 for part in parts)
+    after = before + [{"key": f"NEW{i}", "lead_email": "n@x"} for i in range(50)]
+    assert all(shard_of(p["key"], 4) == owner[p["key"]] for p in after if p["key"] in owner)
+    # growing to 5 shards moves roughly a fifth of the keys, all of them onto the new shard
+    moved = [k for k in owner if shard_of(k, 5) != owner[k]]
+    assert all(shard_of(k, 5) == 5 for k in moved) and len(moved) < 70
+
+
+def test_variants_of_one_key_share_a_shard():
+    variants = [{"key": "SUP", "lead_email": f"{i}@x", "jql_extra": f"labels = l{i}"} for i in range(10)]
+    assert len({i for i in range(1, 9) if select_shard(variants, i, 8)}) == 1
+
+
+def test_merge_combines_shards_and_reports_gaps(tmp_path):
+    rows = [{"key": "A-1", "fields": {"summary": "s", "status": {"name": "Open"}}, "created_in_window": True}]
+    for i, key in ((1, "AAA"), (2, "BBB")):
+        r = ShardResults(i, 3, "h", ("2025-11-01", "2025-11-07"), directory=str(tmp_path))
+        r.assign([key])
+        r.record(key, {"key": key, "lead_email": "x@x"}, "w", {"created": 2, "resolved": 1, "open": 4}, rows)
+        r.write({key: {"wall_seconds": i}}, wall_seconds=float(i))
+    summary = merge_results(sorted(str(p) for p in tmp_path.glob("shard-*.json")))
+    assert summary["shards"] == {"count": 3, "merged": [1, 2], "missing": [3]}
+    assert summary["totals"] == {"created": 4, "resolved": 2, "open": 8}
+    assert summary["makespan_seconds"] == 2.0
+    assert summary["reports"]["AAA"]["rows"][0]["status"] == "Open"
+    digest = format_digest(summary)
+    assert "missing: 3" in digest and "| BBB | x@x | w | 2 | 1 | 4 | 2 | ok |" in digest
+
+
+def test_merge_rejects_mixed_shard_counts(tmp_path):
+    ShardResults(1, 2, "h", ("a", "b"), directory=str(tmp_path)).write({}, 0)
+    ShardResults(1, 3, "h", ("a", "b"), directory=str(tmp_path)).write({}, 0)
+    with pytest.raises(ValueError, match="Shard counts differ"):
+        merge_results(sorted(str(p) for p in tmp_path.glob("shard-*.json")))
+
+
+def test_sharded_run_writes_only_its_projects(monkeypatch, tmp_path):
+    keys = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+    sent = _setup(monkeypatch, tmp_path, keys)
+    monkeypatch.setattr("shard.SHARD_RESULTS_DIR", str(tmp_path / "out"))
+    mine = {k for k in keys if shard_of(f"|{k}", 2) == 1}
+    main.run(shard="1/2")
+    assert set(_FakeJira.calls) == mine
+    assert sorted(sent) == sorted(f"{k.lower()}@x" for k in mine)
+    data = json.loads((tmp_path / "out" / "shard-1-of-2.json").read_text())
+    assert {r["key"] for r in data["reports"].values()} == mine
+    assert set(data["timings"]) >= {f"{k}|{k.lower()}@x|" for k in mine}
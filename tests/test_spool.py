@@ -0,0 +1,90 @@
+# tests/test_spool.py
+from email.mime.text import MIMEText
+
+from spool import Spool, backoff_delay
+
+
+def _msg(subject="Report"):
+    m = MIMEText("<p>hi</p>", "html")
+    m["Subject"] = subject
+    return m
+
+
+def test_backoff_is_exponential_and_capped():
+    assert [backoff_delay(n, 10, 100) for n in range(0, 6)] == [0.0, 10, 20, 40, 80, 100]
+
+
+def test_put_is_idempotent_for_stable_ident(tmp_path):
+    sp = Spool(str(tmp_path))
+    sp.put(_msg(), "from@x", ["a@x"], ident="SUP-1")
+    sp.put(_msg(), "from@x", ["a@x"], ident="SUP-1")
+    assert [m["id"] for m in sp.entries()] == ["SUP-1"]
+
+
+def test_deliver_success_removes_entry(tmp_path):
+    sp = Spool(str(tmp_path))
+    sp.put(_msg(), "from@x", ["a@x"], ident="A")
+    sent = []
+    assert sp.deliver(lambda f, to, raw: sent.append((f, to, raw))) == (1, 0)
+    assert sent[0][1] == ["a@x"] and b"Subject: Report" in sent[0][2]
+    assert sp.entries() == []
+
+
+def test_failure_reschedules_with_backoff_then_dead_letters(tmp_path):
+    sp = Spool(str(tmp_path), max_attempts=2, base_delay=10, max_delay=100)
+    sp.put(_msg(), "from@x", ["a@x"], ident="A")
+
+    def boom(*_):
+        raise OSError("smtp down")
+
+    assert sp.deliver(boom, now=1000.0) == (0, 1)
+    meta = sp.entries()[0]
+    assert meta["attempts"] == 1 and meta["next_attempt_at"] == 1010.0
+    assert "smtp down" in meta["last_error"]
+    # not due yet -> untouched
+    assert sp.deliver(boom, now=1005.0) == (0, 0)
+    assert sp.deliver(boom, now=1010.0) == (0, 1)
+    assert sp.entries() == []
+    assert (tmp_path / "dead" / "A.eml").exists()
+
+
+def test_drain_retries_until_delivered(tmp_path):
+    sp = Spool(str(tmp_path), base_delay=0.0)
+    sp.put(_msg(), "from@x", ["a@x"], ident="A")
+    calls = []
+
+    def flaky(*_):
+        calls.append(1)
+        if len(calls) < 3:
+            raise OSError("temporary")
+
+    assert sp.drain(flaky, deadline=float("inf"), sleep=lambda s: None) == 0
+    assert len(calls) == 3
+
+
+def test_smtp_sender_shares_session_in_batches(monkeypatch):
+    import contextlib
+    import mailer
+    from spool import smtp_sender
+
+    sessions = []
+
+    class _Server:
+        def __init__(self):
+            self.sent = []
+
+        def sendmail(self, f, to, raw):
+            self.sent.append(to)
+
+    @contextlib.contextmanager
+    def fake_session():
+        s = _Server()
+        sessions.append(s)
+        yield s
+
+    monkeypatch.setattr(mailer, "smtp_session", fake_session)
+    send = smtp_sender(batch_size=2)
+    for i in range(5):
+        send("from@x", [f"u{i}@x"], b"raw")
+    send.close()
+    assert [len(s.sent) for s in sessions] == [2, 2, 1]
@@ -0,0 +1,21 @@
+# tests/test_windows.py
+from datetime import date
+
+import pytest
+
+import windows
+
+
+def test_to_date_windows_end_yesterday(monkeypatch):
+    monkeypatch.setattr(windows, "_today_in_tz", lambda tz: date(2025, 11, 17))
+    cfg = {"report": {"window": [{"mode": "month_to_date"}, {"mode": "quarter_to_date"}]}}
+    assert [w[1:3] for w in windows.windows_from_config(cfg)] == [
+        ("2025-11-01", "2025-11-16"), ("2025-10-01", "2025-11-16")]
+
+
+def test_window_from_spec_custom_range_and_unknown_mode():
+    assert windows.window_from_spec({"mode": "custom_range", "start": "2025-11-01", "end": "2025-11-07"},
+                                    "Europe/Berlin") == ("custom_range", "2025-11-01", "2025-11-07", None,
+                                                         "2025-11-01 to 2025-11-07")
+    with pytest.raises(ValueError, match="Unsupported window mode"):
+        windows.window_from_spec({"mode": "fortnight"}, "Europe/Berlin")
@@ -0,0 +1,119 @@
+# windows.py
+"""
+Report windows: turns a ``report.window`` spec (one object or a list) into
+(mode, start, end, interval, label) tuples, shared by main.py and the config builder.
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+
+def _today_in_tz(tz_label: str) -> date:
+    try:
+        tz = ZoneInfo(tz_label)
+        return datetime.now(tz).date()
+    except Exception:
+        return date.today()
+
+
+def _prev_calendar_week_window(tz_label: str) -> Tuple[str, str, str]:
+    """
+    Previous ISO calendar week (Mon..Sun) in tz_label.
+    Returns (start, end, label).
+    """
+    today = _today_in_tz(tz_label)
+    this_monday = today - timedelta(days=today.weekday())  # Monday of this week
+    last_monday = this_monday - timedelta(days=7)
+    last_sunday = last_monday + timedelta(days=6)
+    return last_monday.isoformat(), last_sunday.isoformat(), f"{last_monday} to {last_sunday} (last_week)"
+
+
+def _last_7_days_up_to_yesterday(tz_label: str) -> Tuple[str, str, str]:
+    """
+    A 7-day window ending yesterday in tz_label.
+    If today is Monday, this becomes Mon-1..Sun-1 (the previous full week by days, not ISO).
+    """
+    today = _today_in_tz(tz_label)
+    end = today - timedelta(days=1)       # yesterday
+    start = end - timedelta(days=6)       # 7 days inclusive
+    return start.isoformat(), end.isoformat(), f"{start} to {end} (last_7_days)"
+
+
+def _rolling_days_window(tz_label: str, days: int) -> Tuple[str, str, str, str]:
+    if days < 1:
+        days = 1
+    today = _today_in_tz(tz_label)
+    start = (today - timedelta(days=days)).isoformat()
+    end = (today - timedelta(days=1)).isoformat()
+    label = f"Last {days} days ({start} to {end})"
+    interval = f"{days}d"
+    return start, end, label, interval
+
+
+def _to_date_window(tz_label: str, mode: str) -> Tuple[str, str, str]:
+    """Month/quarter to date, ending yesterday (so Monday runs include the full weekend)."""
+    end = _today_in_tz(tz_label) - timedelta(days=1)
+    if mode == "month_to_date":
+        start = end.replace(day=1)
+    else:
+        start = date(end.year, 3 * ((end.month - 1) // 3) + 1, 1)
+    return start.isoformat(), end.isoformat(), f"{start} to {end} ({mode})"
+
+
+def window_from_config(cfg: dict) -> Tuple[str, Optional[str], Optional[str], Optional[str], str]:
+    """Single-window configs; see window_from_spec."""
+    w = cfg["report"]["window"]
+    if isinstance(w, list):
+        raise ValueError("report.window is a list; use windows_from_config")
+    return window_from_spec(w, cfg["report"].get("timezone_label", "Europe/Berlin"))
+
+
+def windows_from_config(cfg: dict) -> List[Tuple[str, Optional[str], Optional[str], Optional[str], str]]:
+    """``report.window`` may be one window object or a list of them."""
+    w = cfg["report"]["window"]
+    tz_label = cfg["report"].get("timezone_label", "Europe/Berlin")
+    specs = w if isinstance(w, list) else [w]
+    if not specs:
+        raise ValueError("report.window must not be an empty list")
+    return [window_from_spec(spec, tz_label) for spec in specs]
+
+
+def window_from_spec(w: dict, tz_label: str) -> Tuple[str, Optional[str], Optional[str], Optional[str], str]:
+    """
+    Returns (mode, start, end, interval, label).
+
+    Modes:
+      - custom_range: uses explicit start/end
+      - last_week:
+          * If today is Monday in tz -> last 7 days (Mon-1 .. Sun-1)
+          * Else -> previous calendar week (Mon..Sun)
+      - rolling_days: uses interval like '7d' and computes start/end for display
+      - month_to_date / quarter_to_date: first day of the month/quarter .. yesterday
+    """
+    mode = w.get("mode", "custom_range")
+
+    if mode == "custom_range":
+        start = w["start"]
+        end = w["end"]
+        return mode, start, end, None, f"{start} to {end}"
+
+    if mode == "last_week":
+        today = _today_in_tz(tz_label)
+        if today.weekday() == 0:  # Monday
+            start, end, label = _last_7_days_up_to_yesterday(tz_label)
+            # Clarify in label that Monday logic used
+            label = f"{start} to {end} (last_week via last_7_days)"
+        else:
+            start, end, label = _prev_calendar_week_window(tz_label)
+        return mode, start, end, None, label
+
+    if mode == "rolling_days":
+        days = int(w.get("rolling_days", 7))
+        start, end, label, interval = _rolling_days_window(tz_label, days)
+        return mode, start, end, interval, label
+
+    if mode in ("month_to_date", "quarter_to_date"):
+        start, end, label = _to_date_window(tz_label, mode)
+        return mode, start, end, None, label
+
+    raise ValueError(f"Unsupported window mode: {mode}")